@@ -50,3 +50,22 @@ resp = memories.get(
     memory_type="episodic_memory",
 )
 pprint(resp)
+
+# --- 5. 遍历全部页（自动翻页，处理当前页时预取后续页）---
+from everos_kit import iter_memories
+
+print("\n=== all episodic_memory pages ===")
+count = 0
+for episode in iter_memories(
+    memories.get,
+    filters={"user_id": USER_ID},
+    memory_type="episodic_memory",
+    page_size=100,
+    prefetch=2,
+    rank_by="timestamp",
+    rank_order="asc",
+):
+    count += 1
+    if count <= 5:
+        print(f"  {episode.timestamp}  {episode.summary or episode.subject}")
+print(f"total episodes: {count}")
@@ -5,8 +5,11 @@
 #   - 个人记忆搜索（user_id）：先运行 01_add_sync.py 写入数据，等待 ~10s 异步提取完成后再搜索
 #   - 群组记忆搜索（group_id）：先运行 08_group_memories.py 写入数据，等待 ~10s 后再搜索
 #   - 若搜索返回空列表，通常是数据未写入或提取尚未完成
+#   - 写入后立即搜索的流程（测试 / read-after-write）不要固定 sleep，用 everos_kit.wait_until_searchable()
+#     等 task 完成并探测到记忆后再搜索，见 v1/cookbook/quickstart_sdk_async.py
 #
 # NOTE: 服务端实际支持的 method: agentic, hybrid, keyword, vector
+# 多个 method 并发发出并融合结果见 17_fanout_search.py（everos_kit.fanout_search）
 from pprint import pprint
 from everos import EverOS
 
@@ -0,0 +1,60 @@
+# pip install everos
+# AIMD 自适应并发：把 memories.add / group.add / agent.add 包进 AdaptiveLimiter，
+# 健康时并发窗口加性增长，遇到 429 / Retry-After / 超时 / 5xx 乘性下降，自动找到可持续的最大速率
+import asyncio
+import time
+from everos import AsyncEverOS, RateLimitError
+from everos_kit import AdaptiveLimiter
+
+# 关闭 SDK 内置重试：429 / 5xx 直接反馈给控制器，由下面的循环自行重试
+client = AsyncEverOS(max_retries=0)
+limiter = AdaptiveLimiter(initial=2, max_limit=32)
+
+add = limiter.wrap(client.v1.memories.add)
+group_add = limiter.wrap(client.v1.memories.group.add)
+agent_add = limiter.wrap(client.v1.memories.agent.add)
+
+TOTAL = 60
+
+
+async def write_one(i: int) -> None:
+    now_ms = int(time.time() * 1000)
+    message = {"role": "user", "timestamp": now_ms, "content": f"Limiter demo message #{i}"}
+    for attempt in range(5):
+        try:
+            if i % 3 == 0:
+                await add(user_id="user_010", messages=[message])
+            elif i % 3 == 1:
+                await group_add(group_id="group_demo_001", messages=[{**message, "sender_id": "user_alice"}])
+            else:
+                await agent_add(user_id="user_010", session_id="agent_session_001", messages=[message])
+            return
+        except RateLimitError:
+            await asyncio.sleep(0.5 * (attempt + 1))  # 窗口已下调；Retry-After 期间控制器会暂停放行
+        except Exception as e:
+            print(f"  #{i} failed: {e}")
+            return
+
+
+async def report(done: asyncio.Event) -> None:
+    while not done.is_set():
+        m = limiter.metrics()
+        print(
+            f"  window={m.limit:<6} in_flight={m.in_flight:<3} ok={m.succeeded:<4} "
+            f"429={m.throttled} 5xx/timeout={m.errors} throughput={m.throughput:.1f} req/s"
+        )
+        await asyncio.sleep(1)
+
+
+async def main() -> None:
+    print(f"=== {TOTAL} writes through AdaptiveLimiter ===")
+    done = asyncio.Event()
+    reporter = asyncio.create_task(report(done))
+    await asyncio.gather(*(write_one(i) for i in range(TOTAL)))
+    done.set()
+    await reporter
+    print("final:", limiter.metrics())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,46 @@
+# pip install everos
+# 多路复用任务监视：一次提交大量 async_mode=True 写入，所有 task_id 交给同一个 TaskWatcher 轮询，
+# 每个任务按带抖动的指数退避查询，全局 tasks.retrieve() 速率受 max_polls_per_sec 限制（对比 02_add_async.py 的逐个轮询）
+import asyncio
+import time
+from everos import AsyncEverOS
+from everos_kit import TaskWatcher
+
+client = AsyncEverOS()
+memories = client.v1.memories
+
+TOTAL = 50
+
+watcher = TaskWatcher(client.v1.tasks, max_polls_per_sec=10, initial_delay=1.0, max_delay=15.0, timeout=300)
+
+
+async def submit(i: int) -> None:
+    now_ms = int(time.time() * 1000)
+    response = await memories.add(
+        user_id="user_010",
+        async_mode=True,
+        messages=[{"role": "user", "timestamp": now_ms, "content": f"Task watcher demo message #{i}"}],
+    )
+    task_id = response.data.task_id if response.data else None
+    if task_id:
+        watcher.watch(task_id)
+
+
+async def main() -> None:
+    print(f"=== submit {TOTAL} async writes ===")
+    await asyncio.gather(*(submit(i) for i in range(TOTAL)))
+    print(f"watching {watcher.pending} tasks")
+
+    # 按完成顺序取结果；也可以 await watcher.watch(task_id) 等待单个任务
+    counts: dict[str, int] = {}
+    async for outcome in watcher.completions():
+        counts[outcome.status] = counts.get(outcome.status, 0) + 1
+        print(f"  {outcome.task_id}: {outcome.status} (polls={outcome.polls}, {outcome.elapsed:.1f}s)")
+    print(f"done: {counts}, total tasks.retrieve calls: {watcher.polls}")
+    if watcher.dropped:
+        print(f"  {watcher.dropped} outcomes finished before iteration and were dropped (completed_buffer is full)")
+    await watcher.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+# pip install everos
+# 可等待的写入句柄：TrackedMemories 包装 memories.add / group.add / agent.add，
+# 返回的 AddHandle 既是受理响应（task_id），也可以 await 得到任务最终状态，状态查询由共享的 TaskWatcher 统一调度
+import asyncio
+import time
+from everos import AsyncEverOS
+from everos_kit import TrackedMemories
+
+client = AsyncEverOS()
+memories = TrackedMemories(client, max_polls_per_sec=10)
+
+
+async def main() -> None:
+    now_ms = int(time.time() * 1000)
+
+    # 流水线提交：每次 add 只等受理（202），不等处理完成
+    personal = await memories.add(
+        user_id="user_010",
+        messages=[{"role": "user", "timestamp": now_ms, "content": "I started learning the cello this month."}],
+    )
+    group = await memories.group.add(
+        group_id="group_demo_001",
+        messages=[
+            {"role": "user", "sender_id": "user_alice", "timestamp": now_ms, "content": "Standup moved to 10am."},
+            {"role": "user", "sender_id": "user_bob", "timestamp": now_ms + 1000, "content": "Works for me."},
+        ],
+    )
+    agent = await memories.agent.add(
+        user_id="user_010",
+        session_id="agent_session_001",
+        messages=[{"role": "user", "timestamp": now_ms, "content": "Book a table for two at 7pm."}],
+    )
+    for name, handle in (("personal", personal), ("group", group), ("agent", agent)):
+        print(f"{name:<8} accepted: {handle}")
+
+    # 只在需要的地方等待处理完成
+    outcome = await group
+    print(f"group task finished: status={outcome.status!r} polls={outcome.polls} elapsed={outcome.elapsed:.1f}s")
+
+    unfinished = await memories.wait_all(timeout=120)
+    for name, handle in (("personal", personal), ("agent", agent)):
+        print(f"{name:<8} -> {handle}")
+    if unfinished:
+        print(f"still running after 120s: {unfinished}")
+    await memories.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
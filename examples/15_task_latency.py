@@ -0,0 +1,42 @@
+# pip install everos
+# 任务生命周期延迟：async_mode 写入受理后，记录每个任务 queued → processing → success 的观察时间，
+# 按 personal / group / agent 输出直方图，并把逐任务明细写入 JSONL trace，用于查看负载下真实的提取延迟分布
+import asyncio
+import json
+import time
+from everos import AsyncEverOS
+from everos_kit import TaskLifecycleRecorder, TrackedMemories
+
+TRACE_PATH = "task_latency.trace.jsonl"
+PER_ENDPOINT = 10
+
+client = AsyncEverOS()
+recorder = TaskLifecycleRecorder(trace_path=TRACE_PATH)
+# 轮询间隔越短，观察到的完成时间越接近真实值（trace 中 lag_lower_bound ~ extraction_lag 为真实延迟区间）
+memories = TrackedMemories(client, recorder=recorder, initial_delay=0.5, max_delay=5.0, max_polls_per_sec=10)
+
+
+async def write(i: int) -> None:
+    now_ms = int(time.time() * 1000)
+    message = {"role": "user", "timestamp": now_ms, "content": f"Latency probe #{i}: I went cycling along the river today."}
+    await memories.add(user_id="user_010", messages=[message])
+    await memories.group.add(group_id="group_demo_001", messages=[{**message, "sender_id": "user_alice"}])
+    await memories.agent.add(user_id="user_010", session_id="agent_session_001", messages=[message])
+
+
+async def main() -> None:
+    print(f"=== {PER_ENDPOINT} async writes per endpoint ===")
+    await asyncio.gather(*(write(i) for i in range(PER_ENDPOINT)))
+    unfinished = await memories.wait_all(timeout=300)
+    await memories.close()
+    recorder.close()
+
+    print(recorder.report())
+    if unfinished:
+        print(f"unfinished after 300s: {len(unfinished)}")
+    print(f"\nhistograms (cumulative buckets, seconds):\n{json.dumps(recorder.to_dict(), indent=2)}")
+    print(f"trace: {TRACE_PATH}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
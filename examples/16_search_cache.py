@@ -0,0 +1,55 @@
+# pip install everos
+# 搜索结果缓存：CachedMemories 对 search / get 做 LRU + TTL 缓存（按规范化请求体），
+# 经同一对象的 add / flush / delete 按 user_id / group_id / session_id 使重叠的缓存失效
+import asyncio
+import time
+from everos import AsyncEverOS
+from everos_kit import CachedMemories
+
+USER_ID = "user_010"
+
+client = AsyncEverOS()
+memories = CachedMemories(client, ttl=120, max_entries=512, max_bytes=8 * 1024 * 1024)
+
+QUERY = dict(
+    filters={"user_id": USER_ID},
+    query="outdoor activities the user enjoys",
+    method="agentic",
+    memory_types=["episodic_memory", "profile"],
+    top_k=5,
+)
+
+
+async def timed_search(label: str) -> None:
+    started = time.perf_counter()
+    resp = await memories.search(**QUERY)
+    episodes = resp.data.episodes if resp.data else []
+    print(f"  {label:<28} {len(episodes)} episodes in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+async def main() -> None:
+    print("=== repeated agentic search ===")
+    await timed_search("first call (miss)")
+    await timed_search("same request (hit)")
+    await timed_search("same request again (hit)")
+
+    print("\n=== write to the same user_id invalidates ===")
+    await memories.add(
+        user_id=USER_ID,
+        messages=[{"role": "user", "timestamp": int(time.time() * 1000), "content": "I went kayaking last weekend."}],
+    )
+    await timed_search("after add (miss)")
+    await timed_search("again (hit)")
+
+    print("\n=== write to another group keeps the entry ===")
+    await memories.group.add(
+        group_id="group_demo_001",
+        messages=[{"role": "user", "sender_id": "user_bob", "timestamp": int(time.time() * 1000), "content": "Lunch at noon?"}],
+    )
+    await timed_search("after unrelated group add (hit)")
+
+    print("\nmetrics:", memories.metrics())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
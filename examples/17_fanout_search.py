@@ -0,0 +1,42 @@
+# pip install everos
+# 多 method 并发搜索 + RRF 融合：vector / keyword / agentic 同时发出，按 reciprocal-rank fusion 合并并按 id 去重，
+# 每个 method 独立超时，慢的 agentic 被丢弃也不拖住响应（对比 04_search_sync.py 的逐个调用）
+import asyncio
+from everos import AsyncEverOS
+from everos_kit import fanout_search
+
+client = AsyncEverOS()
+
+USER_ID = "user_010"
+
+
+async def main() -> None:
+    fused = await fanout_search(
+        client.v1.memories.search,
+        methods=("vector", "keyword", "agentic"),
+        timeouts={"vector": 5.0, "keyword": 5.0, "agentic": 3.0},
+        grace=1.0,                                   # 第一个 method 返回后，其余最多再等 1s
+        method_kwargs={"vector": {"radius": 0.3}},   # 只对 vector 生效的参数
+        filters={"user_id": USER_ID},
+        query="outdoor activities the user enjoys",
+        memory_types=["episodic_memory", "profile"],
+        top_k=10,
+        limit=10,
+    )
+
+    print("succeeded:", ", ".join(f"{m} ({fused.latencies[m] * 1000:.0f}ms)" for m in fused.succeeded))
+    if fused.failed:
+        print("failed:   ", fused.failed)
+
+    print("\n=== fused episodes ===")
+    for hit in fused.episodes:
+        ranks = " ".join(f"{m}#{r}" for m, r in hit.ranks.items())
+        print(f"  {hit.score:.4f}  [{ranks}]  {getattr(hit.item, 'summary', None) or getattr(hit.item, 'episode', '')}")
+
+    print("\n=== fused profiles ===")
+    for hit in fused.profiles:
+        print(f"  {hit.score:.4f}  {hit.id}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+# pip install everos
+# 批量独立搜索：search_many() 在一个 AsyncEverOS 连接池上以有界并发执行大量 search，
+# 按完成顺序产出带输入下标的结果，单条失败不影响其他请求（对比 04_search_sync.py 的逐个调用）
+#
+# 用法: python 18_search_many.py [questions.jsonl] [并发数]
+#   questions.jsonl 每行一个 search 参数对象，如 {"filters": {"user_id": "u1"}, "query": "...", "method": "vector"}
+import asyncio
+import json
+import sys
+import time
+from everos import AsyncEverOS
+from everos_kit import RetryPolicy, search_many
+
+# 关闭 SDK 内置重试：重试由 RetryPolicy 负责，两层叠加时每次调用最多发出 3 × 3 个请求
+client = AsyncEverOS(max_retries=0)
+
+DEMO_QUERIES = [
+    "outdoor activities the user enjoys",
+    "food preferences",
+    "upcoming travel plans",
+    "fear or anxiety experiences",
+    "work schedule",
+]
+
+
+def load_requests(path: str):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def demo_requests(repeat: int = 20):
+    for i in range(repeat):
+        for query in DEMO_QUERIES:
+            yield {"filters": {"user_id": "user_010"}, "query": query, "method": "vector", "top_k": 5}
+
+
+async def main() -> None:
+    requests = load_requests(sys.argv[1]) if len(sys.argv) > 1 else demo_requests()
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    started = time.monotonic()
+    ok = failed = 0
+    latencies = []
+    async for result in search_many(client.v1.memories.search, requests, concurrency=concurrency, retry=RetryPolicy(max_attempts=3)):
+        latencies.append(result.latency)
+        if result.ok:
+            ok += 1
+            episodes = result.response.data.episodes if result.response.data else []
+            print(f"  #{result.index:<5} {len(episodes)} episodes  {result.latency * 1000:.0f}ms  {result.request['query'][:40]}")
+        else:
+            failed += 1
+            print(f"  #{result.index:<5} FAILED {type(result.error).__name__}: {result.error}")
+
+    elapsed = time.monotonic() - started
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] if latencies else 0.0
+    print(f"\n{ok} ok, {failed} failed in {elapsed:.1f}s ({(ok + failed) / elapsed:.1f} req/s, concurrency {concurrency}, p50 {p50 * 1000:.0f}ms)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,36 @@
+# pip install everos
+# 按时间分片并行扫描：把时间范围切成多个 [gte, lt) 窗口并发翻页，过密的窗口自动细分，
+# 按 timestamp 升序输出全部记忆（对比 03_get_sync.py 第 5 节的顺序翻页）
+#
+# 用法: python 19_time_sharded_scan.py [user_id|group:<group_id>] [并发数]
+import asyncio
+import sys
+from everos import AsyncEverOS
+from everos_kit import TimeShardedScanner
+
+client = AsyncEverOS()
+
+
+async def main() -> None:
+    target = sys.argv[1] if len(sys.argv) > 1 else "user_010"
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    filters = {"group_id": target[len("group:"):]} if target.startswith("group:") else {"user_id": target}
+
+    scanner = TimeShardedScanner(client.v1.memories.get, shards=concurrency, concurrency=concurrency, split_threshold=1000)
+    count = 0
+    first = last = None
+    async for episode in scanner.scan(filters=filters, memory_type="episodic_memory"):
+        count += 1
+        first = first or episode.timestamp
+        last = episode.timestamp
+        if count <= 5:
+            print(f"  {episode.timestamp}  {episode.summary or episode.subject}")
+
+    s = scanner.stats
+    print(f"\n{count} episodes ({first} → {last})")
+    print(f"windows={s.windows} splits={s.splits} requests={s.requests} elapsed={s.elapsed:.1f}s "
+          f"({count / s.elapsed if s.elapsed else 0:.0f} items/s, concurrency {concurrency})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
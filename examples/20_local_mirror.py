@@ -0,0 +1,52 @@
+# pip install everos
+# 本地 SQLite 镜像：首次同步拉取全部记忆，之后按 timestamp 水位线只拉取增量；
+# get 风格的过滤 / 排序 / 分页在本地执行，按 staleness 决定是否先同步或回退到 API
+#
+# 用法: python 20_local_mirror.py [user_id|group:<group_id>] [数据库文件]
+import asyncio
+import sys
+import time
+from everos import AsyncEverOS
+from everos_kit import MemoryMirror
+
+client = AsyncEverOS()
+MAX_STALENESS = 300  # 秒
+
+
+async def main() -> None:
+    target = sys.argv[1] if len(sys.argv) > 1 else "user_010"
+    path = sys.argv[2] if len(sys.argv) > 2 else ":memory:"
+    scope = {"group_id": target[len("group:"):]} if target.startswith("group:") else {"user_id": target}
+
+    mirror = MemoryMirror(client.v1.memories.get, scope, path=path)
+    staleness = mirror.staleness()
+    print(f"镜像 {scope} → {path}，" + ("从未同步" if staleness == float("inf") else f"上次同步于 {staleness:.0f} 秒前"))
+
+    # ── 1. 同步（首次全量，之后增量）─────────────────────
+    for result in await mirror.sync():
+        mode = "全量" if result.full else "增量"
+        print(f"  {result.memory_type:16s} {mode} 拉取 {result.fetched:5d} 条，镜像共 {result.total} 条 ({result.elapsed:.2f}s)")
+
+    # ── 2. 本地查询（参数与 memories.get 相同）────────────
+    started = time.perf_counter()
+    page = mirror.get(memory_type="episodic_memory", page_size=5, rank_order="desc")
+    local_ms = (time.perf_counter() - started) * 1000
+    print(f"\n最近 5 条 episode（共 {page.total_count} 条，本地 {local_ms:.2f} ms）:")
+    for episode in page.items:
+        print(f"  {episode.get('timestamp')}  {episode.get('summary') or episode.get('subject')}")
+
+    week_ago = int(time.time() * 1000) - 7 * 24 * 3600 * 1000
+    recent = mirror.get(memory_type="episodic_memory", filters={"timestamp": {"gte": week_ago}}, page_size=1)
+    print(f"最近 7 天: {recent.total_count} 条")
+
+    # ── 3. 按 staleness 决定是否先同步 ─────────────────────
+    if page.staleness > MAX_STALENESS:
+        await mirror.sync(["episodic_memory"])
+    started = time.perf_counter()
+    remote = await client.v1.memories.get(filters=scope, memory_type="episodic_memory", page_size=5)
+    print(f"\n对比 API: total_count={remote.data.total_count}，往返 {(time.perf_counter() - started) * 1000:.0f} ms")
+    mirror.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
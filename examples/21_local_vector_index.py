@@ -0,0 +1,86 @@
+# pip install everos numpy
+# 离线向量检索：把一个用户的 episode 用本地 embedder 编码进 memmap 矩阵，
+# 之后的 vector 检索不再访问网络；对比远程 memories.search(method="vector") 的延迟与结果重合度
+#
+# 用法: python 21_local_vector_index.py [user_id] [索引目录] [导出 JSONL glob（可选，默认在线扫描）] [--local]
+#
+# embedder：安装了 sentence-transformers 时使用多语言小模型，否则退化为字符 n-gram 哈希向量（仅演示用，
+# 检索质量远低于真实模型）。
+import asyncio
+import sys
+import time
+import zlib
+
+import numpy as np
+from everos import AsyncEverOS
+from everos_kit import LocalVectorIndex, TimeShardedScanner, build_vector_index
+from everos_kit.vector_index import read_jsonl
+
+client = AsyncEverOS()
+QUERIES = ["最近在忙什么项目", "喜欢的运动", "旅行计划", "工作上遇到的问题"]
+
+
+def load_embedder():
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return hashing_embed
+    model = SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
+    return lambda texts: model.encode(texts, batch_size=64, normalize_embeddings=True)
+
+
+def hashing_embed(texts: list[str], dim: int = 512) -> np.ndarray:
+    """字符 bigram 哈希到固定维度（演示用的零依赖 embedder）"""
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for a, b in zip(text, text[1:]):
+            out[i, zlib.crc32((a + b).encode("utf-8")) % dim] += 1.0
+    return out
+
+
+async def scan_episodes(user_id: str) -> list:
+    scanner = TimeShardedScanner(client.v1.memories.get, shards=8, concurrency=8)
+    return [episode async for episode in scanner.scan(filters={"user_id": user_id}, memory_type="episodic_memory")]
+
+
+async def main() -> None:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    user_id = args[0] if len(args) > 0 else "user_010"
+    directory = args[1] if len(args) > 1 else f".vector-index-{user_id}"
+    embed = load_embedder()
+
+    # ── 1. 建索引（导出文件或在线扫描）──────────────────
+    started = time.perf_counter()
+    episodes = read_jsonl(args[2]) if len(args) > 2 else await scan_episodes(user_id)
+    count = build_vector_index(directory, episodes, embed, batch_size=256)
+    print(f"索引 {count} 条 episode → {directory}（{time.perf_counter() - started:.1f}s）")
+    if not count:
+        return
+    index = LocalVectorIndex(directory, embed)
+
+    # ── 2. 批量本地检索：一次编码、分块矩阵乘法 ───────────
+    started = time.perf_counter()
+    local = index.query_batch(QUERIES, top_k=5, filters={"user_id": user_id})
+    print(f"本地 {len(QUERIES)} 个查询共 {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    # ── 3. 与远程 vector 检索对比（调用方式相同）─────────
+    for query, hits in zip(QUERIES, local):
+        started = time.perf_counter()
+        remote = await client.v1.memories.search(
+            filters={"user_id": user_id}, query=query, method="vector", memory_types=["episodic_memory"], top_k=5,
+        )
+        remote_ms = (time.perf_counter() - started) * 1000
+        remote_ids = {e.id for e in remote.data.episodes}
+        overlap = sum(1 for h in hits if h["id"] in remote_ids)
+        print(f"\n[{query}] 远程 {remote_ms:.0f} ms，前 5 条重合 {overlap}")
+        for hit in hits[:3]:
+            print(f"  {hit['score']:.3f}  {hit.get('summary') or hit.get('subject')}")
+
+    # 评测脚本可以把 search 函数整体替换：两者签名与返回结构相同（--local 使用本地索引）
+    search = index.search if "--local" in sys.argv else client.v1.memories.search
+    resp = await search(filters={"user_id": user_id}, query=QUERIES[0], method="vector", top_k=3)
+    print(f"\n{search.__qualname__}: {[e.id for e in resp.data.episodes]}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
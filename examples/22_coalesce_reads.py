@@ -0,0 +1,54 @@
+# pip install everos
+# 相同在途读请求的合并：模拟热门群组页面加载时几十个并发处理函数发出相同的 memories.get / search，
+# CoalescedClient 让它们共享一个 HTTP 请求（对比未包装的客户端）
+import asyncio
+import time
+from everos import AsyncEverOS
+from everos_kit import CachedMemories, CoalescedClient
+
+GROUP_ID = "group_demo_001"
+HANDLERS = 40
+
+GET = dict(filters={"group_id": GROUP_ID}, memory_type="episodic_memory", page_size=20)
+SEARCH = dict(filters={"group_id": GROUP_ID}, query="最近讨论了什么", method="hybrid", top_k=10)
+
+
+async def page_load(client) -> None:
+    """一个处理函数：读群组信息、最近的 episode 与搜索结果"""
+    await asyncio.gather(
+        client.v1.groups.retrieve(GROUP_ID),
+        client.v1.memories.get(**GET),
+        client.v1.memories.search(**SEARCH),
+    )
+
+
+async def burst(label: str, client) -> None:
+    started = time.perf_counter()
+    results = await asyncio.gather(*(page_load(client) for _ in range(HANDLERS)), return_exceptions=True)
+    errors = sum(1 for r in results if isinstance(r, Exception))
+    print(f"  {label:<22} {HANDLERS} 个处理函数，{(time.perf_counter() - started) * 1000:.0f} ms，失败 {errors}")
+
+
+async def main() -> None:
+    raw = AsyncEverOS()
+    coalesced = CoalescedClient(raw)
+
+    print("=== 并发页面加载 ===")
+    await burst("未合并", raw)                      # 3 × HANDLERS 个请求
+    await burst("CoalescedClient", coalesced)       # 每种读请求只发一次
+    m = coalesced.metrics()
+    print(f"  调用 {m.calls} 次，实际请求 {m.requests} 次，合并 {m.coalesced} 次")
+    for endpoint, counters in m.by_endpoint.items():
+        print(f"    {endpoint:<18} {counters}")
+
+    # 叠加缓存：缓存未命中时同时到达的请求也只发一次
+    print("\n=== CachedMemories(CoalescedClient(...)) ===")
+    memories = CachedMemories(coalesced, ttl=30)
+    before = coalesced.metrics().requests
+    await asyncio.gather(*(memories.get(**GET) for _ in range(HANDLERS)))
+    await asyncio.gather(*(memories.get(**GET) for _ in range(HANDLERS)))
+    print(f"  {2 * HANDLERS} 次 get → {coalesced.metrics().requests - before} 个请求，缓存 {memories.metrics()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,50 @@
+# pip install everos
+# 对冲请求：search 超过最近延迟的 p95 仍未返回时再发一个相同请求，取先返回的一个；
+# 对冲比例受预算限制。对比未对冲时的 p50 / p99
+#
+# 用法: python 23_hedged_search.py [请求数] [method]
+import asyncio
+import sys
+import time
+from everos import AsyncEverOS
+from everos_kit import HedgedClient
+
+USER_ID = "user_010"
+QUERIES = ["outdoor activities", "favorite food", "recent travel", "work projects", "family events"]
+
+
+async def run(client, n: int, method: str) -> list[float]:
+    latencies = []
+    for i in range(n):
+        started = time.perf_counter()
+        await client.v1.memories.search(
+            filters={"user_id": USER_ID}, query=QUERIES[i % len(QUERIES)], method=method, top_k=10,
+        )
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def summary(label: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    print(f"  {label:<10} p50={p(0.5):.0f}ms p95={p(0.95):.0f}ms p99={p(0.99):.0f}ms max={ordered[-1] * 1000:.0f}ms")
+
+
+async def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    method = sys.argv[2] if len(sys.argv) > 2 else "hybrid"
+    raw = AsyncEverOS()
+    hedged = HedgedClient(raw, percentile=95, budget=0.05, min_samples=20, endpoints={"memories.search"})
+
+    print(f"=== {n} 次 search(method={method}) ===")
+    summary("未对冲", await run(raw, n, method))
+    summary("对冲", await run(hedged, n, method))
+
+    m = hedged.metrics()
+    print(f"\n对冲 {m.hedged} 次（{m.hedge_rate:.1%}），对冲请求先返回 {m.hedge_wins} 次，预算不足 {m.budget_denied} 次")
+    for key, stats in m.latency.items():
+        print(f"  {key}: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+# pip install everos
+# 惰性响应：search 返回 LazyObject 视图，只解析 JSON，读 id / score 时不构造 SearchEpisodeItem；
+# 对比默认路径与惰性路径的耗时，可把原始响应体保存下来供 v1/cases/bench_lazy_response.py 离线对比
+#
+# 用法: python 24_lazy_responses.py [重复次数] [--record 文件]
+import asyncio
+import sys
+import time
+from everos import AsyncEverOS
+from everos_kit import LazyMemories
+
+USER_ID = "user_010"
+SEARCH = dict(
+    filters={"user_id": USER_ID}, query="recent activities", method="hybrid", top_k=100, include_original_data=True,
+)
+
+
+async def main() -> None:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    record = sys.argv[sys.argv.index("--record") + 1] if "--record" in sys.argv else None
+    if record in args:
+        args.remove(record)
+    repeat = int(args[0]) if args else 5
+
+    client = AsyncEverOS()
+    memories = LazyMemories(client)
+
+    # 默认路径：完整构造 SearchMemoriesResponse
+    started = time.perf_counter()
+    for _ in range(repeat):
+        resp = await client.v1.memories.search(**SEARCH)
+        scores = {e.id: e.score for e in resp.data.episodes}
+    print(f"默认: {repeat} 次 {(time.perf_counter() - started) / repeat * 1000:.0f}ms/次，{len(scores)} 条 episode")
+
+    # 惰性路径：只解析 JSON，读到的字段才取值
+    started = time.perf_counter()
+    for _ in range(repeat):
+        lazy = await memories.search(**SEARCH)
+        scores = {e.id: e.score for e in lazy.data.episodes}
+    print(f"惰性: {repeat} 次 {(time.perf_counter() - started) / repeat * 1000:.0f}ms/次，{len(scores)} 条 episode")
+
+    if lazy.data.episodes:
+        first = lazy.data.episodes[0]
+        print(f"\n第 1 条: id={first.id} score={first.score} timestamp={first.timestamp!r}")
+        print(f"  完整模型: {type(first.model()).__name__}")
+
+    if record:
+        raw = await client.v1.memories.with_raw_response.search(**SEARCH)
+        with open(record, "wb") as f:
+            f.write(raw.http_response.content)
+        print(f"\n原始响应体已保存到 {record}（python v1/cases/bench_lazy_response.py search {record}）")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""
+everos_kit - AsyncEverOS 客户端侧的可复用组件
+
+示例脚本通过把 examples/ 加入 sys.path 后 import：
+    from everos_kit import AdaptiveLimiter
+"""
+
+from everos_kit.batch import SearchResult, search_many
+from everos_kit.cache import CachedMemories, CacheMetrics, SearchCache
+from everos_kit.coalesce import CoalescedClient, CoalesceMetrics, Singleflight, ThreadSingleflight
+from everos_kit.dedup import ContentIds, DedupIndex, content_message_id
+from everos_kit.fusion import FusedHit, FusedSearch, fanout_search, reciprocal_rank_fusion
+from everos_kit.handles import AddHandle, TrackedMemories
+from everos_kit.hedge import HedgedClient, HedgeMetrics, HedgePolicy, hedged_call
+from everos_kit.lazy import LazyList, LazyMemories, LazyObject, lazy_response
+from everos_kit.lifecycle import LatencyHistogram, TaskLifecycleRecorder
+from everos_kit.limiter import AdaptiveLimiter, LimiterMetrics
+from everos_kit.mirror import MemoryMirror, MirrorPage, SyncResult
+from everos_kit.pagination import aiter_memories, aiter_pages, iter_memories, iter_pages
+from everos_kit.readiness import Readiness, wait_until_searchable
+from everos_kit.retry import FATAL, PERMANENT, TRANSIENT, RetryPolicy, classify_error, describe_error
+from everos_kit.scan import ScanStats, TimeShardedScanner
+from everos_kit.tasks import TaskOutcome, TaskWatcher
+from everos_kit.vector_index import LocalVectorIndex, build_vector_index
+
+__all__ = [
+    "SearchResult",
+    "search_many",
+    "CachedMemories",
+    "CacheMetrics",
+    "SearchCache",
+    "CoalescedClient",
+    "CoalesceMetrics",
+    "Singleflight",
+    "ThreadSingleflight",
+    "ContentIds",
+    "DedupIndex",
+    "content_message_id",
+    "FusedHit",
+    "FusedSearch",
+    "fanout_search",
+    "reciprocal_rank_fusion",
+    "AddHandle",
+    "TrackedMemories",
+    "HedgedClient",
+    "HedgeMetrics",
+    "HedgePolicy",
+    "hedged_call",
+    "LazyList",
+    "LazyMemories",
+    "LazyObject",
+    "lazy_response",
+    "LatencyHistogram",
+    "TaskLifecycleRecorder",
+    "AdaptiveLimiter",
+    "LimiterMetrics",
+    "MemoryMirror",
+    "MirrorPage",
+    "SyncResult",
+    "aiter_memories",
+    "aiter_pages",
+    "iter_memories",
+    "iter_pages",
+    "Readiness",
+    "wait_until_searchable",
+    "RetryPolicy",
+    "classify_error",
+    "describe_error",
+    "TRANSIENT",
+    "PERMANENT",
+    "FATAL",
+    "ScanStats",
+    "TimeShardedScanner",
+    "TaskWatcher",
+    "TaskOutcome",
+    "LocalVectorIndex",
+    "build_vector_index",
+]
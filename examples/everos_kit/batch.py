@@ -0,0 +1,93 @@
+"""
+大批量独立 search 的并发执行
+
+评测 / 重排任务会发出成千上万个互不相关的 memories.search（每个测试问题或每个用户一个），
+逐个 await 时耗时是单次往返之和。search_many() 在同一个 AsyncEverOS（同一个 HTTP 连接池）上以
+有界并发执行全部请求：输入按需读取（不会一次性展开上万个请求），结果按完成顺序产出并带上输入下标，
+单个请求失败记录在该条结果中，不影响其他请求。
+
+用法：
+    client = AsyncEverOS()                  # 整个任务共用一个客户端，不要每个请求新建
+    requests = ({"filters": {"user_id": u}, "query": q, "method": "vector"} for u, q in questions)
+    async for result in search_many(client.v1.memories.search, requests, concurrency=32):
+        if result.ok:
+            scores[result.index] = result.response
+        else:
+            print(result.index, result.error)
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+from everos_kit.limiter import AdaptiveLimiter
+from everos_kit.retry import RetryPolicy
+
+
+@dataclass
+class SearchResult:
+    """一个输入请求的结果"""
+    index: int                               # 在输入中的下标
+    request: dict
+    response: Any = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0                     # 秒，含重试
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def search_many(
+    search: Callable[..., Awaitable[Any]],
+    requests: Iterable[dict],
+    concurrency: int = 16,
+    limiter: Optional[AdaptiveLimiter] = None,
+    retry: Optional[RetryPolicy] = None,
+) -> AsyncIterator[SearchResult]:
+    """
+    Run many independent searches with bounded concurrency, yielding results as they complete
+
+    Args:
+        search: client.v1.memories.search（或 CachedMemories.search 等同签名的协程函数）
+        requests: search 参数字典的可迭代对象，按需读取
+        concurrency: 同时在途的请求数上限；传入 limiter 时为其窗口之外的硬上限
+        limiter: 可选的 AdaptiveLimiter，按 429 / 超时 / 5xx 自动调节实际并发
+        retry: 可选的 RetryPolicy，对 transient 错误重试
+
+    提前结束迭代（break / 异常）时取消剩余的在途请求。
+    """
+    call = limiter.wrap(search) if limiter is not None else search
+
+    async def run(index: int, request: dict) -> SearchResult:
+        started = time.monotonic()
+        try:
+            if retry is not None:
+                response = await retry.call(call, **request)
+            else:
+                response = await call(**request)
+        except Exception as e:
+            return SearchResult(index, request, error=e, latency=time.monotonic() - started)
+        return SearchResult(index, request, response=response, latency=time.monotonic() - started)
+
+    source = enumerate(requests)
+    in_flight: set[asyncio.Task] = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(in_flight) < max(1, concurrency):
+                item = next(source, None)
+                if item is None:
+                    exhausted = True
+                    break
+                in_flight.add(asyncio.create_task(run(*item)))
+            if not in_flight:
+                return
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
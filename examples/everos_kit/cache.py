@@ -0,0 +1,304 @@
+"""
+memories.search / memories.get 的客户端结果缓存
+
+同一会话里前端常用完全相同的 filters / query / method / memory_types / top_k / radius 反复调用 search，
+每次都是一次完整的往返（agentic 搜索尤其慢）。CachedMemories 包装 client.v1.memories：
+search / get 的结果按规范化后的请求体做 LRU + TTL 缓存，条目数与字节数双重上限；
+经同一个包装对象执行的 add / flush / delete（含 group / agent）会按 user_id / group_id / session_id
+使范围重叠的缓存条目失效。
+
+注意：async_mode=True 的写入在受理时就会触发失效，但服务端提取完成（之后记忆才真正变化）发生在稍后，
+这段时间内重新缓存的结果可能不含新记忆；ttl 决定了最长的陈旧时间。
+
+用法：
+    memories = CachedMemories(AsyncEverOS(), ttl=60, max_entries=1024, max_bytes=16 * 1024 * 1024)
+    resp = await memories.search(filters={"user_id": "u1"}, query="...", method="agentic")
+    await memories.add(user_id="u1", messages=[...])        # 使 user_id=u1 的缓存失效
+    print(memories.metrics())
+"""
+
+import collections
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+# 参与失效判断的范围字段
+SCOPE_KEYS = ("user_id", "group_id", "session_id")
+
+
+@dataclass
+class CacheMetrics:
+    """缓存状态快照"""
+    hits: int
+    misses: int
+    hit_rate: float          # hits / (hits + misses)
+    entries: int
+    bytes: int               # 缓存结果的估算大小（JSON 序列化后的字节数）
+    evictions: int           # 因条目数 / 字节数上限淘汰
+    expirations: int         # 因 TTL 过期淘汰
+    invalidations: int       # 因写入失效
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float
+    scopes: frozenset        # {(key, value)}；空集表示范围未知，任何写入都会使其失效
+
+
+def request_key(operation: str, kwargs: dict) -> str:
+    """规范化的请求体：字段排序后的 JSON，参数顺序与字典顺序不同但内容相同的请求命中同一条目"""
+    return json.dumps({"op": operation, **kwargs}, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def filter_scopes(filters: Any) -> set:
+    """从 filters DSL 中收集 (user_id / group_id / session_id, 值)；支持隐式 eq、in 以及 AND / OR 嵌套"""
+    scopes = set()
+    if isinstance(filters, dict):
+        for key, value in filters.items():
+            if key in SCOPE_KEYS:
+                if isinstance(value, dict):
+                    values = value.get("in") or [value.get("eq")]
+                elif isinstance(value, (list, tuple)):
+                    values = value
+                else:
+                    values = [value]
+                scopes.update((key, v) for v in values if v is not None)
+            else:
+                scopes |= filter_scopes(value)
+    elif isinstance(filters, (list, tuple)):
+        for item in filters:
+            scopes |= filter_scopes(item)
+    return scopes
+
+
+def write_scopes(kwargs: dict, messages: Iterable[dict] = ()) -> set:
+    """写入请求影响的范围；群组消息的 sender_id 也视为 user_id（群聊会更新发言人的 profile）"""
+    scopes = {(key, kwargs[key]) for key in SCOPE_KEYS if kwargs.get(key)}
+    if kwargs.get("sender_id"):
+        scopes.add(("user_id", kwargs["sender_id"]))
+    for message in messages:
+        if isinstance(message, dict) and message.get("sender_id"):
+            scopes.add(("user_id", message["sender_id"]))
+    return scopes
+
+
+def _size_of(value: Any) -> int:
+    to_dict = getattr(value, "to_dict", None)
+    data = to_dict() if callable(to_dict) else value
+    return len(json.dumps(data, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+class SearchCache:
+    """
+    LRU + TTL cache bounded by entry count and bytes, indexed by scope for invalidation
+
+    Args:
+        ttl: 条目存活秒数
+        max_entries: 条目数上限
+        max_bytes: 结果总字节数上限；单个结果超过上限的 1/4 时不缓存
+        max_scopes: 记录写入 generation 的范围数上限；清理后仍超过时退化为一次全量失效标记
+    """
+
+    def __init__(
+        self, ttl: float = 60.0, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024, max_scopes: int = 65536
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_scopes = max_scopes
+        self._entries: collections.OrderedDict[str, _Entry] = collections.OrderedDict()
+        self._by_scope: dict[tuple, set] = {}
+        self._unscoped: set = set()
+        self._bytes = 0
+        self._generation = 0
+        self._written: dict[tuple, int] = {}      # 范围 → 最近一次写入时的 generation
+        self._written_all = 0                     # 最近一次全量失效时的 generation
+        self._reading: collections.Counter = collections.Counter()   # 在途读请求开始时的 generation → 个数
+        self._prune_at = 64                       # _written 超过该大小时清理
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def begin_read(self) -> int:
+        """登记一个在途读请求，返回当前写入计数；put() 据此判断请求期间是否有范围重叠的写入，结束后须调用 end_read()"""
+        self._reading[self._generation] += 1
+        return self._generation
+
+    def end_read(self, generation: int) -> None:
+        self._reading[generation] -= 1
+        if self._reading[generation] <= 0:
+            del self._reading[generation]
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self._expirations += 1
+            entry = None
+        if entry is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry.value
+
+    def put(self, key: str, value: Any, scopes: set, generation: int) -> None:
+        """缓存结果；generation 为读请求开始时的 self.generation，期间有重叠范围的写入时不缓存（结果可能已陈旧）"""
+        if self._written_all > generation:
+            return
+        if not scopes and self._generation > generation:
+            return
+        if any(self._written.get(scope, 0) > generation for scope in scopes):
+            return
+        size = _size_of(value)
+        if size > self.max_bytes // 4:
+            return
+        if key in self._entries:
+            self._remove(key)
+        entry = _Entry(value=value, size=size, expires_at=time.monotonic() + self.ttl, scopes=frozenset(scopes))
+        self._entries[key] = entry
+        self._bytes += size
+        if entry.scopes:
+            for scope in entry.scopes:
+                self._by_scope.setdefault(scope, set()).add(key)
+        else:
+            self._unscoped.add(key)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def invalidate(self, scopes: set) -> int:
+        """使与 scopes 重叠的条目（以及范围未知的条目）失效；scopes 为空表示全部失效。返回失效条数"""
+        self._generation += 1
+        if not scopes:
+            self._written_all = self._generation
+            keys = set(self._entries)
+        else:
+            for scope in scopes:
+                self._written[scope] = self._generation
+            if len(self._written) > self._prune_at:
+                self._prune_written()
+            keys = set(self._unscoped)
+            for scope in scopes:
+                keys |= self._by_scope.get(scope, set())
+        for key in keys:
+            self._remove(key)
+        self._invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self.invalidate(set())
+
+    def _prune_written(self) -> None:
+        # put() 只对 generation 更早的读请求检查 _written；不晚于最早在途读请求的记录已无人需要
+        oldest = min(self._reading) if self._reading else self._generation
+        self._written = {scope: gen for scope, gen in self._written.items() if gen > oldest}
+        if len(self._written) > self.max_scopes:
+            # 长时间未结束的读请求拖住了清理：记为一次全量失效，在途读请求都不再写回缓存
+            self._written_all = self._generation
+            self._written.clear()
+        self._prune_at = max(64, 2 * len(self._written))
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        if not entry.scopes:
+            self._unscoped.discard(key)
+        for scope in entry.scopes:
+            keys = self._by_scope.get(scope)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_scope[scope]
+
+    def metrics(self) -> CacheMetrics:
+        lookups = self._hits + self._misses
+        return CacheMetrics(
+            hits=self._hits,
+            misses=self._misses,
+            hit_rate=round(self._hits / lookups, 4) if lookups else 0.0,
+            entries=len(self._entries),
+            bytes=self._bytes,
+            evictions=self._evictions,
+            expirations=self._expirations,
+            invalidations=self._invalidations,
+        )
+
+
+class _InvalidatingResource:
+    """group / agent 子资源：add / flush 透传并使对应范围失效"""
+
+    def __init__(self, resource: Any, cache: SearchCache):
+        self._resource = resource
+        self._cache = cache
+
+    async def add(self, **kwargs: Any) -> Any:
+        return await _write(self._cache, self._resource.add, kwargs, kwargs.get("messages") or ())
+
+    async def flush(self, **kwargs: Any) -> Any:
+        return await _write(self._cache, self._resource.flush, kwargs)
+
+
+async def _write(cache: SearchCache, fn: Any, kwargs: dict, messages: Iterable[dict] = ()) -> Any:
+    scopes = write_scopes(kwargs, messages)
+    # 写入开始前后各失效一次：开始时的失效让在途的读请求不再写回缓存，结束时的失效清掉期间新缓存的结果
+    cache.invalidate(scopes)
+    try:
+        return await fn(**kwargs)
+    finally:
+        cache.invalidate(scopes)
+
+
+class CachedMemories:
+    """
+    Opt-in wrapper of client.v1.memories with cached search / get and write invalidation
+
+    Args:
+        client: AsyncEverOS 实例
+        cache: 共享的 SearchCache；None 时用 cache_kwargs 新建（ttl / max_entries / max_bytes）
+
+    只有经本对象发出的写入会触发失效；其他客户端或进程的写入只能等 TTL 过期。
+    """
+
+    def __init__(self, client: Any, cache: Optional[SearchCache] = None, **cache_kwargs: Any):
+        self._memories = client.v1.memories
+        self.cache = cache if cache is not None else SearchCache(**cache_kwargs)
+        self.group = _InvalidatingResource(self._memories.group, self.cache)
+        self.agent = _InvalidatingResource(self._memories.agent, self.cache)
+
+    async def search(self, **kwargs: Any) -> Any:
+        return await self._cached("search", self._memories.search, kwargs)
+
+    async def get(self, **kwargs: Any) -> Any:
+        return await self._cached("get", self._memories.get, kwargs)
+
+    async def add(self, **kwargs: Any) -> Any:
+        return await _write(self.cache, self._memories.add, kwargs, kwargs.get("messages") or ())
+
+    async def flush(self, **kwargs: Any) -> Any:
+        return await _write(self.cache, self._memories.flush, kwargs)
+
+    async def delete(self, **kwargs: Any) -> Any:
+        # 只按 memory_id 删除时无法得知范围，write_scopes 为空，全部缓存失效
+        return await _write(self.cache, self._memories.delete, kwargs)
+
+    async def _cached(self, operation: str, fn: Any, kwargs: dict) -> Any:
+        key = request_key(operation, kwargs)
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+        generation = self.cache.begin_read()
+        try:
+            value = await fn(**kwargs)
+            self.cache.put(key, value, filter_scopes(kwargs.get("filters")), generation)
+        finally:
+            self.cache.end_read(generation)
+        return value
+
+    def metrics(self) -> CacheMetrics:
+        return self.cache.metrics()
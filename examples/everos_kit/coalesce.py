@@ -0,0 +1,203 @@
+"""
+相同在途读请求的合并（singleflight）
+
+热门群组页面加载时，几十个并发的处理函数会发出完全相同的 memories.get / memories.search，
+每个都是一次独立的 HTTP 请求。CoalescedClient 包装 AsyncEverOS / EverOS：对读接口
+（memories.get、memories.search、groups.retrieve、senders.retrieve、settings.retrieve），
+规范化请求体相同的并发调用共享同一个在途请求，结果（或异常）分发给全部调用方；请求结束即移出，
+不缓存结果（需要跨时间复用时叠加 CachedMemories，缓存未命中的并发请求也会被合并）。
+其余属性原样透传，写接口不受影响。
+
+所有调用方拿到的是同一个响应对象，应视为只读。AsyncEverOS 下某个调用方被取消不影响其他调用方；
+全部调用方都取消时在途请求才被取消。
+
+用法：
+    client = CoalescedClient(AsyncEverOS())
+    resp = await client.v1.memories.get(filters={"group_id": "g1"}, memory_type="episodic_memory")
+    print(client.metrics())                  # CoalesceMetrics(calls=..., requests=..., coalesced=..., ...)
+    memories = CachedMemories(client)        # 缓存未命中时的并发请求同样被合并
+"""
+
+import asyncio
+import inspect
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from everos_kit.cache import request_key
+
+
+@dataclass
+class CoalesceMetrics:
+    """合并统计"""
+    calls: int                 # 读接口调用次数
+    requests: int              # 实际发出的请求数
+    coalesced: int             # 共享了在途请求的调用数（calls - requests）
+    in_flight: int             # 当前在途的请求数
+    by_endpoint: dict = field(default_factory=dict)   # 接口 → {"calls": ..., "coalesced": ...}
+
+
+class _Counters:
+    def __init__(self):
+        self.by_endpoint: dict[str, dict[str, int]] = {}
+
+    def record(self, endpoint: str, coalesced: bool) -> None:
+        counters = self.by_endpoint.setdefault(endpoint, {"calls": 0, "coalesced": 0})
+        counters["calls"] += 1
+        counters["coalesced"] += coalesced
+
+    def metrics(self, in_flight: int) -> CoalesceMetrics:
+        calls = sum(c["calls"] for c in self.by_endpoint.values())
+        coalesced = sum(c["coalesced"] for c in self.by_endpoint.values())
+        return CoalesceMetrics(
+            calls=calls,
+            requests=calls - coalesced,
+            coalesced=coalesced,
+            in_flight=in_flight,
+            by_endpoint={k: dict(v) for k, v in self.by_endpoint.items()},
+        )
+
+
+class Singleflight:
+    """
+    Share one in-flight coroutine among concurrent callers with the same key (asyncio)
+
+    第一个调用方把 fn 作为独立 task 启动，之后同 key 的调用方等待同一个 task；
+    等待方被取消时只退出自己的等待，最后一个等待方退出时才取消 task。
+    """
+
+    def __init__(self):
+        self._flights: dict[str, tuple[asyncio.Task, list]] = {}
+        self._counters = _Counters()
+
+    async def do(self, key: str, fn: Callable[..., Awaitable[Any]], *args: Any, endpoint: str = "", **kwargs: Any) -> Any:
+        flight = self._flights.get(key)
+        self._counters.record(endpoint, flight is not None)
+        if flight is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            flight = self._flights[key] = (task, [0])
+            task.add_done_callback(lambda _: self._flights.pop(key, None) if self._flights.get(key) is flight else None)
+        task, waiters = flight
+        waiters[0] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and waiters[0] == 1:
+                # 立即注销：task 的 done 回调要到下一轮事件循环才执行，期间的新调用方应发起新请求而不是等待被取消的 task
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                task.cancel()
+            raise
+        finally:
+            waiters[0] -= 1
+
+    def metrics(self) -> CoalesceMetrics:
+        return self._counters.metrics(len(self._flights))
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ThreadSingleflight:
+    """Share one in-flight call among concurrent threads with the same key (EverOS)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Call] = {}
+        self._counters = _Counters()
+
+    def do(self, key: str, fn: Callable[..., Any], *args: Any, endpoint: str = "", **kwargs: Any) -> Any:
+        with self._lock:
+            call = self._flights.get(key)
+            leader = call is None
+            if leader:
+                call = self._flights[key] = _Call()
+            self._counters.record(endpoint, not leader)
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            call.event.set()
+
+    def metrics(self) -> CoalesceMetrics:
+        with self._lock:
+            return self._counters.metrics(len(self._flights))
+
+
+class _Resource:
+    """包装一个 SDK 资源：列出的读方法经 singleflight 调用，其余属性透传"""
+
+    def __init__(self, resource: Any, name: str, methods: tuple, flight: Any):
+        self._resource = resource
+        self._name = name
+        self._methods = methods
+        self._flight = flight
+
+    def __getattr__(self, attr: str) -> Any:
+        fn = getattr(self._resource, attr)
+        if attr not in self._methods:
+            return fn
+        endpoint = f"{self._name}.{attr}"
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            key = request_key(endpoint, {"args": list(args), **kwargs})
+            return self._flight.do(key, fn, *args, endpoint=endpoint, **kwargs)
+
+        return call
+
+
+class _V1:
+    # 资源名 → 合并的读方法
+    READS = {
+        "memories": ("get", "search"),
+        "groups": ("retrieve",),
+        "senders": ("retrieve",),
+        "settings": ("retrieve",),
+    }
+
+    def __init__(self, v1: Any, flight: Any):
+        self._v1 = v1
+        for name, methods in self.READS.items():
+            setattr(self, name, _Resource(getattr(v1, name), name, methods, flight))
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._v1, attr)
+
+
+class CoalescedClient:
+    """
+    Wrap AsyncEverOS / EverOS so identical concurrent reads share one in-flight request
+
+    Args:
+        client: AsyncEverOS 或 EverOS 实例；按 memories.get 是否为协程函数选择 asyncio / 线程实现
+
+    接口与原客户端相同（client.v1.memories.get(...) 等），未包装的属性透传给原客户端。
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+        if inspect.iscoroutinefunction(client.v1.memories.get):
+            self._flight = Singleflight()
+        else:
+            self._flight = ThreadSingleflight()
+        self.v1 = _V1(client.v1, self._flight)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._client, attr)
+
+    def metrics(self) -> CoalesceMetrics:
+        return self._flight.metrics()
@@ -0,0 +1,122 @@
+"""
+内容哈希 message_id 与本地持久化去重索引
+
+content_message_id() 由 (group_id, 内容的 SHA-256, k) 派生确定性的 message_id，k 为同一内容此前出现的次数：
+id 与块号、文件名无关，文件中插入 / 删除块或改名后重新导入，其余块的 id 不变；
+同一文件中重复出现的相同内容（模板段落、重复行）各自得到不同的 id，ContentIds 按出现顺序分配 k；
+DedupIndex 记录服务端已受理的 message_id，重新导入时无需任何网络请求即可跳过这些块。
+
+索引文件为定长记录的追加日志：每条 17 字节 = 16 字节摘要 + 1 字节操作（1 加入 / 0 移除），
+启动时顺序回放到内存集合中（约 100 万条记录 17MB）；写入后 flush + fsync，进程崩溃时不完整的末条记录被忽略。
+"""
+
+import hashlib
+import os
+from typing import Iterable
+
+MESSAGE_ID_PREFIX = "c_"
+DIGEST_SIZE = 16
+_ADD = b"\x01"
+_REMOVE = b"\x00"
+
+
+def content_message_id(group_id: str, content: str, occurrence: int = 0) -> str:
+    """
+    确定性 message_id
+
+    Args:
+        group_id: 群组 ID
+        content: 消息内容
+        occurrence: 同一内容此前已出现的次数（首次为 0），使重复出现的相同内容各自得到不同的 id
+    """
+    return _message_id(group_id, hashlib.sha256(content.encode("utf-8")).digest(), occurrence)
+
+
+def _message_id(group_id: str, content_digest: bytes, occurrence: int) -> str:
+    key = f"{group_id}\0{content_digest.hex()}\0{occurrence}"
+    digest = hashlib.sha256(key.encode("utf-8")).digest()[:DIGEST_SIZE]
+    return MESSAGE_ID_PREFIX + digest.hex()
+
+
+class ContentIds:
+    """
+    Content-hash message ids for one ordered stream of chunks
+
+    按顺序对每个块调用 next()，相同内容第 k 次出现（k 从 0 起）得到 content_message_id(group_id, content, k)。
+    跳过的块（已提交、起始块号之前）也须调用 next()，后续块的 k 才与完整导入时一致。
+    内存占用与不同内容的块数成正比（每种内容一个 32 字节摘要）。
+    """
+
+    def __init__(self, group_id: str):
+        self.group_id = group_id
+        self._seen: dict[bytes, int] = {}
+
+    def next(self, content: str) -> str:
+        digest = hashlib.sha256(content.encode("utf-8")).digest()
+        occurrence = self._seen.get(digest, 0)
+        self._seen[digest] = occurrence + 1
+        return _message_id(self.group_id, digest, occurrence)
+
+
+def _digest(message_id: str) -> bytes:
+    if not message_id.startswith(MESSAGE_ID_PREFIX):
+        raise ValueError(f"不是内容哈希 message_id: {message_id!r}")
+    return bytes.fromhex(message_id[len(MESSAGE_ID_PREFIX):])
+
+
+class DedupIndex:
+    """
+    Persistent set of accepted content-hash message ids
+
+    message_id 已包含 group_id，因此一个索引文件可以被多个群组 / 多个文件共享。
+    """
+
+    RECORD_SIZE = DIGEST_SIZE + 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self._seen: set[bytes] = set()
+        valid = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+            valid = len(data) - len(data) % self.RECORD_SIZE
+            for i in range(0, valid, self.RECORD_SIZE):
+                digest, op = data[i:i + DIGEST_SIZE], data[i + DIGEST_SIZE:i + self.RECORD_SIZE]
+                if op == _ADD:
+                    self._seen.add(digest)
+                else:
+                    self._seen.discard(digest)
+        self._file = open(path, "ab")
+        if self._file.tell() != valid:
+            self._file.truncate(valid)
+
+    def __contains__(self, message_id: str) -> bool:
+        return _digest(message_id) in self._seen
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, message_ids: Iterable[str]) -> None:
+        self._write(message_ids, _ADD)
+
+    def discard(self, message_ids: Iterable[str]) -> None:
+        """移除（如 async_mode 任务最终 failed），下次导入时重新发送"""
+        self._write(message_ids, _REMOVE)
+
+    def _write(self, message_ids: Iterable[str], op: bytes) -> None:
+        records = []
+        for message_id in message_ids:
+            digest = _digest(message_id)
+            if op == _ADD:
+                self._seen.add(digest)
+            else:
+                self._seen.discard(digest)
+            records.append(digest + op)
+        if records:
+            self._file.write(b"".join(records))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
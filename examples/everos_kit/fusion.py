@@ -0,0 +1,190 @@
+"""
+多 method 并发搜索 + 客户端 RRF 融合
+
+04_search_sync.py 依次调用 vector / keyword / agentic，耗时是各 method 之和。fanout_search() 在
+AsyncEverOS 上并发发出多个 method 的 search，按 reciprocal-rank fusion（score = Σ weight / (k + rank)）
+合并各 method 的结果，并按记忆 id 去重；每个 method 有独立超时，慢的 agentic 可以被丢弃而不拖住整体响应。
+设置 grace 后，第一个 method 成功返回后其余 method 最多再等 grace 秒。
+
+用法：
+    fused = await fanout_search(
+        client.v1.memories.search,
+        methods=("vector", "keyword", "agentic"),
+        timeouts={"agentic": 3.0},
+        filters={"user_id": "u1"}, query="...", top_k=10,
+    )
+    for hit in fused.episodes:
+        print(hit.score, hit.ranks, hit.item.summary)
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+DEFAULT_METHODS = ("vector", "keyword", "agentic")
+
+# 参与融合的结果列表：(种类, 从 response.data 取列表的路径)
+RESULT_LISTS = (
+    ("episodes", ("episodes",)),
+    ("profiles", ("profiles",)),
+    ("raw_messages", ("raw_messages",)),
+    ("agent_cases", ("agent_memory", "cases")),
+    ("agent_skills", ("agent_memory", "skills")),
+)
+
+
+@dataclass
+class FusedHit:
+    """融合后的一条结果"""
+    id: str
+    score: float                                       # RRF 分数
+    item: Any                                          # 排名最靠前的 method 返回的原始条目
+    ranks: dict[str, int] = field(default_factory=dict)  # method → 该 method 中的名次（从 1 开始）
+
+
+@dataclass
+class FusedSearch:
+    """fanout_search() 的结果"""
+    results: dict[str, list[FusedHit]]                 # 种类 → 按 RRF 分数降序的结果
+    succeeded: list[str]                               # 按返回顺序
+    failed: dict[str, str]                             # method → 原因（timeout / dropped / 异常描述）
+    latencies: dict[str, float]                        # method → 耗时（秒），只含成功的 method
+
+    @property
+    def episodes(self) -> list[FusedHit]:
+        return self.results.get("episodes", [])
+
+    @property
+    def profiles(self) -> list[FusedHit]:
+        return self.results.get("profiles", [])
+
+
+def _result_list(data: Any, path: tuple) -> list:
+    for name in path:
+        data = data.get(name) if isinstance(data, dict) else getattr(data, name, None)
+        if data is None:
+            return []
+    return list(data)
+
+
+def _item_id(item: Any) -> Optional[str]:
+    return item.get("id") if isinstance(item, dict) else getattr(item, "id", None)
+
+
+def reciprocal_rank_fusion(
+    responses: dict[str, Any],
+    k: int = 60,
+    weights: Optional[dict[str, float]] = None,
+    limit: Optional[int] = None,
+) -> dict[str, list[FusedHit]]:
+    """
+    Fuse ranked search responses with reciprocal-rank fusion
+
+    Args:
+        responses: method → search 响应
+        k: RRF 平滑常数，越大越削弱头部名次的优势
+        weights: method → 权重（默认 1）
+        limit: 每种结果最多保留条数；None 表示不截断
+
+    Returns:
+        种类 → 按分数降序的 FusedHit；同一 id 只出现一次
+    """
+    weights = weights or {}
+    fused: dict[str, list[FusedHit]] = {}
+    for kind, path in RESULT_LISTS:
+        hits: dict[str, FusedHit] = {}
+        for method, response in responses.items():
+            weight = weights.get(method, 1.0)
+            for rank, item in enumerate(_result_list(getattr(response, "data", None), path), start=1):
+                item_id = _item_id(item)
+                if item_id is None:
+                    continue
+                hit = hits.get(item_id)
+                if hit is None:
+                    hit = hits[item_id] = FusedHit(id=item_id, score=0.0, item=item)
+                elif rank < min(hit.ranks.values()):
+                    hit.item = item
+                hit.score += weight / (k + rank)
+                hit.ranks[method] = rank
+        if hits:
+            ordered = sorted(hits.values(), key=lambda h: h.score, reverse=True)
+            fused[kind] = ordered[:limit] if limit is not None else ordered
+    return fused
+
+
+async def fanout_search(
+    search: Callable[..., Awaitable[Any]],
+    *,
+    methods: Iterable[str] = DEFAULT_METHODS,
+    timeouts: Optional[dict[str, float]] = None,
+    default_timeout: float = 10.0,
+    grace: Optional[float] = None,
+    k: int = 60,
+    weights: Optional[dict[str, float]] = None,
+    limit: Optional[int] = None,
+    method_kwargs: Optional[dict[str, dict]] = None,
+    **kwargs: Any,
+) -> FusedSearch:
+    """
+    Run several search methods concurrently and fuse their results
+
+    Args:
+        search: client.v1.memories.search（或 CachedMemories.search 等同签名的协程函数）
+        methods: 并发发出的 method
+        timeouts / default_timeout: 每个 method 的超时（秒）
+        grace: 第一个 method 成功后，其余 method 最多再等的秒数；None 表示等到各自超时
+        k / weights / limit: 见 reciprocal_rank_fusion()
+        method_kwargs: method → 仅该 method 使用的额外参数（如 {"vector": {"radius": 0.3}}）
+        kwargs: 所有 method 共用的 search 参数（filters / query / memory_types / top_k ...）
+
+    全部 method 都失败时返回空结果，failed 中记录原因。
+    """
+    timeouts = timeouts or {}
+    method_kwargs = method_kwargs or {}
+    started = time.monotonic()
+
+    async def run(method: str) -> Any:
+        return await asyncio.wait_for(
+            search(method=method, **kwargs, **method_kwargs.get(method, {})),
+            timeouts.get(method, default_timeout),
+        )
+
+    pending = {asyncio.create_task(run(method)): method for method in dict.fromkeys(methods)}
+    responses: dict[str, Any] = {}
+    succeeded: list[str] = []
+    failed: dict[str, str] = {}
+    latencies: dict[str, float] = {}
+    deadline: Optional[float] = None
+    try:
+        while pending:
+            wait_for = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, _ = await asyncio.wait(pending, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                method = pending.pop(task)
+                try:
+                    responses[method] = task.result()
+                except asyncio.TimeoutError:
+                    failed[method] = "timeout"
+                    continue
+                except Exception as e:
+                    failed[method] = f"{type(e).__name__}: {e}"
+                    continue
+                succeeded.append(method)
+                latencies[method] = time.monotonic() - started
+                if grace is not None and deadline is None:
+                    deadline = time.monotonic() + grace
+    finally:
+        for task, method in pending.items():
+            task.cancel()
+            failed[method] = "dropped"
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    return FusedSearch(
+        results=reciprocal_rank_fusion(responses, k=k, weights=weights, limit=limit),
+        succeeded=succeeded,
+        failed=failed,
+        latencies=latencies,
+    )
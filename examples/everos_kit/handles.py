@@ -0,0 +1,131 @@
+"""
+async_mode 写入的可等待句柄
+
+memories.add / memories.group.add / memories.agent.add 以 async_mode=True 提交时只返回受理结果
+（202 + task_id），调用方通常要自己写轮询。TrackedMemories 包装这三个写入接口：返回的 AddHandle
+既是受理响应（handle.response / handle.task_id），也可以 await 得到最终的 TaskOutcome；
+全部句柄共享同一个 TaskWatcher，状态查询统一调度、统一限速（OpenAPI 没有批量查询任务的接口）。
+
+用法：
+    memories = TrackedMemories(AsyncEverOS())
+    handles = [await memories.group.add(group_id=..., messages=[...]) for ... in ...]   # 流水线提交
+    outcome = await handles[-1]                                                         # 只在需要时等待
+    print(outcome.status)
+    await memories.close()
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Generator, Optional
+
+from everos_kit.lifecycle import TaskLifecycleRecorder
+from everos_kit.tasks import SUCCESS, TaskOutcome, TaskWatcher
+
+
+class AddHandle:
+    """
+    Accept response of an async_mode add that can be awaited for the final task status
+
+    await handle 返回 TaskOutcome；没有 task_id 的响应（如 async_mode=False 或消息仍在累积）
+    立即以 status="success" 完成，data 为响应的 data。
+    """
+
+    def __init__(self, response: Any, future: Optional[asyncio.Future] = None):
+        self.response = response
+        data = getattr(response, "data", None)
+        self.task_id: Optional[str] = getattr(data, "task_id", None) or None
+        self.accept_status: Optional[str] = getattr(data, "status", None)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(TaskOutcome(task_id=self.task_id or "", status=SUCCESS, polls=0, elapsed=0.0, data=data))
+        self.future = future
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self) -> TaskOutcome:
+        """已完成时返回 TaskOutcome，否则抛出 asyncio.InvalidStateError"""
+        return self.future.result()
+
+    def __await__(self) -> Generator[Any, None, TaskOutcome]:
+        return self.future.__await__()
+
+    def __repr__(self) -> str:
+        state = self.future.result().status if self.future.done() and not self.future.cancelled() else "pending"
+        return f"AddHandle(task_id={self.task_id!r}, accept_status={self.accept_status!r}, outcome={state!r})"
+
+
+class _TrackedAdd:
+    def __init__(
+        self,
+        add: Callable[..., Awaitable[Any]],
+        watcher: TaskWatcher,
+        endpoint: str,
+        recorder: Optional[TaskLifecycleRecorder] = None,
+    ):
+        self._add = add
+        self._watcher = watcher
+        self._endpoint = endpoint
+        self._recorder = recorder
+
+    async def add(self, **kwargs: Any) -> AddHandle:
+        """与原 add() 参数相同，async_mode 默认为 True；返回 AddHandle"""
+        kwargs.setdefault("async_mode", True)
+        submitted = time.monotonic()
+        response = await self._add(**kwargs)
+        handle = AddHandle(response)
+        if handle.task_id:
+            if self._recorder is not None:
+                self._recorder.accepted(handle.task_id, self._endpoint, submitted)
+            handle.future = self._watcher.watch(handle.task_id)
+        return handle
+
+
+class TrackedMemories:
+    """
+    Opt-in wrapper of client.v1.memories whose adds return awaitable AddHandle objects
+
+    Args:
+        client: AsyncEverOS 实例
+        watcher: 共享的 TaskWatcher；None 时用 watcher_kwargs 新建（如 max_polls_per_sec=10）
+        recorder: 记录每个任务受理与状态变迁时间的 TaskLifecycleRecorder（按 personal / group / agent 分别统计）
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        watcher: Optional[TaskWatcher] = None,
+        recorder: Optional[TaskLifecycleRecorder] = None,
+        **watcher_kwargs: Any,
+    ):
+        self.watcher = watcher if watcher is not None else TaskWatcher(client.v1.tasks, **watcher_kwargs)
+        if recorder is not None and self.watcher.on_status is None:
+            self.watcher.on_status = recorder.observe
+        self.recorder = recorder
+        memories = client.v1.memories
+        self._personal = _TrackedAdd(memories.add, self.watcher, "personal", recorder)
+        self.group = _TrackedAdd(memories.group.add, self.watcher, "group", recorder)
+        self.agent = _TrackedAdd(memories.agent.add, self.watcher, "agent", recorder)
+
+    async def add(self, **kwargs: Any) -> AddHandle:
+        """memories.add 的句柄版本"""
+        return await self._personal.add(**kwargs)
+
+    @property
+    def pending(self) -> int:
+        return self.watcher.pending
+
+    async def wait_all(self, timeout: Optional[float] = None) -> list[str]:
+        """等待全部句柄完成，返回超时仍未完成的 task_id（句柄仍可继续等待）"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while self.watcher.pending:
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                break
+            futures = [self.watcher.watch(task_id) for task_id in self.watcher.pending_ids()]
+            await asyncio.wait(futures, timeout=remaining)
+        return self.watcher.pending_ids()
+
+    async def close(self) -> list[str]:
+        """停止后台查询，返回未完成的 task_id（对应句柄被取消）"""
+        return await self.watcher.close()
@@ -0,0 +1,245 @@
+"""
+幂等读请求的对冲（hedged requests）
+
+memories.search 的 p99 往往是 p50 的数倍（hybrid / agentic 尤其明显），少数慢请求决定了交互检索的尾延迟。
+HedgedClient 包装 AsyncEverOS 的读接口：请求在「最近延迟的某个分位数」（按接口 + method 分别统计）
+之内没有返回时，再发一个相同的请求，取先成功返回的一个并取消另一个。
+对冲次数受预算限制：每个请求积累 budget 个令牌，每次对冲消耗 1 个，额外负载因此不超过流量的 budget 比例。
+样本数不足 min_samples 时不对冲。
+
+只用于幂等的读接口；与 CoalescedClient 一起使用时把合并放在外层：CoalescedClient(HedgedClient(client))，
+否则对冲请求会被合并进原请求。
+
+用法：
+    client = HedgedClient(AsyncEverOS(), percentile=95, budget=0.05)
+    resp = await client.v1.memories.search(filters={"user_id": "u1"}, query="...", method="hybrid")
+    print(client.metrics())                  # HedgeMetrics(requests=..., hedged=..., hedge_wins=..., ...)
+"""
+
+import asyncio
+import collections
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+
+@dataclass
+class HedgeMetrics:
+    """对冲统计"""
+    requests: int
+    hedged: int                # 发出了对冲请求的次数
+    hedge_wins: int            # 对冲请求先返回的次数
+    budget_denied: int         # 到达对冲时间点但预算不足的次数
+    hedge_rate: float          # hedged / requests
+    latency: dict = field(default_factory=dict)   # 接口 → {"samples", "p50", "p95", "p99"}（秒）
+
+
+class LatencyWindow:
+    """最近 size 个样本的延迟分位数"""
+
+    def __init__(self, size: int = 500):
+        self._samples: collections.deque = collections.deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+class HedgePolicy:
+    """
+    Decide when to hedge from recent per-endpoint latency, within a token-bucket budget
+
+    Args:
+        percentile: 等待到最近延迟的该分位数（0 ~ 100）仍未返回时对冲
+        budget: 对冲请求占总请求的比例上限
+        min_samples: 样本数少于该值时不对冲
+        min_delay / max_delay: 对冲等待时间的下限 / 上限（秒）
+        window: 每个接口保留的延迟样本数
+        burst: 令牌桶容量，允许短时间内集中对冲的次数
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        min_delay: float = 0.005,
+        max_delay: float = 10.0,
+        window: int = 500,
+        burst: float = 10.0,
+    ):
+        self.quantile = percentile / 100.0
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.window = window
+        self.burst = burst
+        self._latency: dict[str, LatencyWindow] = {}
+        self._tokens = burst
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+
+    def observe(self, key: str, seconds: float) -> None:
+        window = self._latency.get(key)
+        if window is None:
+            window = self._latency[key] = LatencyWindow(self.window)
+        window.add(seconds)
+
+    def delay(self, key: str) -> Optional[float]:
+        """本次请求的对冲等待时间；None 表示不对冲（样本不足）。同时为预算积累令牌"""
+        self.requests += 1
+        self._tokens = min(self.burst, self._tokens + self.budget)
+        window = self._latency.get(key)
+        if window is None or len(window) < self.min_samples:
+            return None
+        return min(self.max_delay, max(self.min_delay, window.quantile(self.quantile)))
+
+    def try_spend(self) -> bool:
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            self.hedged += 1
+            return True
+        self.budget_denied += 1
+        return False
+
+    def metrics(self) -> HedgeMetrics:
+        return HedgeMetrics(
+            requests=self.requests,
+            hedged=self.hedged,
+            hedge_wins=self.hedge_wins,
+            budget_denied=self.budget_denied,
+            hedge_rate=round(self.hedged / self.requests, 4) if self.requests else 0.0,
+            latency={
+                key: {
+                    "samples": len(window),
+                    **{f"p{int(q * 100)}": round(window.quantile(q), 4) for q in (0.5, 0.95, 0.99)},
+                }
+                for key, window in self._latency.items()
+            },
+        )
+
+
+async def hedged_call(policy: HedgePolicy, key: str, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+    """
+    调用 fn；超过 policy.delay(key) 仍未返回且预算允许时再发一次，返回先成功的结果
+
+    两个请求都失败时抛出最后一个异常；只有一个请求时原样抛出其异常。
+    """
+    delay = policy.delay(key)
+    started: dict[asyncio.Future, float] = {}
+
+    async def attempt() -> Any:
+        begin = time.monotonic()
+        result = await fn(*args, **kwargs)
+        policy.observe(key, time.monotonic() - begin)
+        return result
+
+    def launch() -> asyncio.Future:
+        task = asyncio.ensure_future(attempt())
+        started[task] = time.monotonic()
+        return task
+
+    primary = launch()
+    tasks = [primary]
+    try:
+        if delay is not None:
+            done, _ = await asyncio.wait([primary], timeout=delay)
+            if not done and policy.try_spend():
+                tasks.append(launch())
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not primary:
+                        policy.hedge_wins += 1
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                # 被取消的慢请求按已等待时长记一个样本（真实延迟的下界），避免分位数只反映赢家而持续偏低
+                policy.observe(key, time.monotonic() - started[task])
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class _Resource:
+    """包装一个 SDK 资源：列出的读方法经对冲调用，其余属性透传"""
+
+    def __init__(self, resource: Any, name: str, methods: tuple, policy: HedgePolicy):
+        self._resource = resource
+        self._name = name
+        self._methods = methods
+        self._policy = policy
+
+    def __getattr__(self, attr: str) -> Any:
+        fn = getattr(self._resource, attr)
+        if attr not in self._methods:
+            return fn
+        endpoint = f"{self._name}.{attr}"
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            # search 的延迟按 method 分别统计（agentic 比 keyword 慢一个数量级）
+            key = f"{endpoint}:{kwargs['method']}" if kwargs.get("method") else endpoint
+            return await hedged_call(self._policy, key, fn, *args, **kwargs)
+
+        return call
+
+
+class _V1:
+    # 资源名 → 对冲的幂等读方法
+    READS = {
+        "memories": ("get", "search"),
+        "groups": ("retrieve",),
+        "senders": ("retrieve",),
+        "settings": ("retrieve",),
+    }
+
+    def __init__(self, v1: Any, policy: HedgePolicy, endpoints: Optional[set]):
+        self._v1 = v1
+        for name, methods in self.READS.items():
+            if endpoints is not None:
+                methods = tuple(m for m in methods if f"{name}.{m}" in endpoints)
+            setattr(self, name, _Resource(getattr(v1, name), name, methods, policy))
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._v1, attr)
+
+
+class HedgedClient:
+    """
+    Opt-in wrapper of AsyncEverOS that hedges slow idempotent reads
+
+    Args:
+        client: AsyncEverOS 实例
+        policy: 共享的 HedgePolicy；None 时用 policy_kwargs 新建（percentile / budget / min_samples ...）
+        endpoints: 只对这些接口对冲，如 {"memories.search"}；None 表示全部读接口
+
+    接口与原客户端相同，未包装的属性（写接口等）透传给原客户端。
+    """
+
+    def __init__(self, client: Any, policy: Optional[HedgePolicy] = None, endpoints: Optional[set] = None, **policy_kwargs: Any):
+        self._client = client
+        self.policy = policy if policy is not None else HedgePolicy(**policy_kwargs)
+        self.v1 = _V1(client.v1, self.policy, endpoints)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._client, attr)
+
+    def metrics(self) -> HedgeMetrics:
+        return self.policy.metrics()
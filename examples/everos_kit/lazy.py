@@ -0,0 +1,286 @@
+"""
+memories.search / memories.get 的惰性响应视图
+
+SDK 把每个响应完整构造为类型化模型：top_k=100 且 include_original_data=True 的 SearchMemoriesResponse、
+或每页 100 条的 GetMemResponse，即使调用方只读 id 和 score，也要为每条记忆、每个嵌套字段构造对象
+（timestamp 还要解析为 datetime）。LazyMemories 通过 with_raw_response 取得同一个 HTTP 响应，
+只做 json 解析，返回 LazyObject 视图：
+  - 字符串 / 数字 / 布尔字段直接从解析后的 dict 读取，不构造任何模型
+  - 嵌套对象与对象列表按访问逐层包装为视图，列表元素在下标访问时才包装
+  - 需要类型转换的字段（datetime、dict 等）在首次访问时只对该字段调用 SDK 的 construct_type，结果缓存
+  - .model() 构造该层的完整类型化模型（与默认路径相同），.to_dict() 返回原始 dict
+
+字段类型取自 SDK 方法的返回类型注解与模型的 pydantic 字段表，属性访问的结果与默认路径一致；
+解析不到返回类型时 LazyMemories 构造即报错，而不是退化为 dict 访问。
+
+用法：
+    memories = LazyMemories(AsyncEverOS())
+    resp = await memories.search(filters={"user_id": "u1"}, query="...", top_k=100, include_original_data=True)
+    scores = {e.id: e.score for e in resp.data.episodes}       # 不构造 SearchEpisodeItem
+    first = resp.data.episodes[0].timestamp                      # 只为该字段构造 datetime
+"""
+
+import functools
+import inspect
+import json
+import sys
+import types
+import typing
+from typing import Any, Callable, Optional
+
+# 原样返回 JSON 值即与模型构造结果一致的注解
+_SIMPLE = (str, int, float, bool)
+_UNION_TYPES = (typing.Union, types.UnionType)
+
+
+def _strip_optional(annotation: Any) -> Any:
+    if typing.get_origin(annotation) in _UNION_TYPES:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _is_model(annotation: Any) -> bool:
+    return inspect.isclass(annotation) and callable(getattr(annotation, "construct", None)) and (
+        hasattr(annotation, "model_fields") or hasattr(annotation, "__fields__")
+    )
+
+
+class _Field(typing.NamedTuple):
+    kind: str                          # simple / float / model / list / other
+    key: str                           # JSON 中的键（字段 alias）
+    sub: Optional[type]                # model / list 的子模型
+    convert: Callable[[Any], Any]      # other：单个字段的转换
+    default: Callable[[], Any]         # 缺失或为 null 时的值（与 construct() 一致取字段默认值）
+
+
+def _fields(model_cls: type) -> dict:
+    """
+    字段名 → pydantic 字段对象（v2 model_fields / v1 __fields__）
+
+    不用 typing.get_type_hints：SDK 模型基类的注解引用了模型模块未导入的名字（如 ClassVar），求值会失败。
+    """
+    fields = getattr(model_cls, "model_fields", None)
+    if fields is None:
+        fields = getattr(model_cls, "__fields__", None)
+    if fields is None:
+        raise TypeError(f"{model_cls!r} 不是 pydantic 模型，无法确定字段类型")
+    return fields
+
+
+def _construct_type(model_cls: type) -> Optional[Callable[..., Any]]:
+    # SDK 的 construct() 对每个字段调用 <包>._models.construct_type
+    return getattr(sys.modules.get(model_cls.__module__.partition(".")[0] + "._models"), "construct_type", None)
+
+
+def _converter(model_cls: type, name: str, key: str, annotation: Any, field: Any) -> Callable[[Any], Any]:
+    # 取得到 construct_type 时直接对单个值调用，否则构造只含该字段的模型
+    construct_type = _construct_type(model_cls)
+    if construct_type is not None:
+        metadata = getattr(field, "metadata", None)
+        return lambda value: construct_type(value=value, type_=annotation, metadata=metadata)
+    return lambda value: getattr(model_cls.construct(**{key: value}), name)
+
+
+def _field_default(field: Any) -> Any:
+    # 与 SDK 的 field_get_default 一致：pydantic v2 必填字段没有默认值时为 None
+    value = field.get_default()
+    return None if type(value).__name__ == "PydanticUndefinedType" else value
+
+
+@functools.lru_cache(maxsize=None)
+def field_kinds(model_cls: type) -> dict:
+    """
+    模型字段 → _Field
+
+    种类：simple（JSON 值原样可用）/ float（整数转为 float）/ model（嵌套模型）/ list（模型列表）/
+    other（需要 construct 转换）
+    """
+    v2 = hasattr(model_cls, "model_fields")
+    kinds = {}
+    for name, field in _fields(model_cls).items():
+        annotation = field.annotation if v2 else field.outer_type_
+        t = _strip_optional(annotation)
+        origin = typing.get_origin(t)
+        kind, sub = "other", None
+        if t is float:
+            kind = "float"
+        elif t in _SIMPLE or origin is typing.Literal:
+            kind = "simple"
+        elif _is_model(t):
+            kind, sub = "model", t
+        elif origin in (list, typing.List):
+            args = typing.get_args(t)
+            item = _strip_optional(args[0]) if args else Any
+            if _is_model(item):
+                kind, sub = "list", item
+            elif item in _SIMPLE:
+                kind = "simple"
+        key = getattr(field, "alias", None) or name
+        default = functools.partial(_field_default, field) if v2 else field.get_default
+        kinds[name] = _Field(kind, key, sub, _converter(model_cls, name, key, annotation, field), default)
+    return kinds
+
+
+def response_model(method: Any) -> Optional[type]:
+    """SDK 方法的返回类型（如 SearchMemoriesResponse）；无法解析时返回 None"""
+    annotation = getattr(method, "__annotations__", {}).get("return")
+    if isinstance(annotation, str):
+        # 只求值返回注解：参数注解可能引用仅在 TYPE_CHECKING 下导入的名字
+        try:
+            annotation = eval(annotation, getattr(inspect.unwrap(getattr(method, "__func__", method)), "__globals__", {}))
+        except Exception:
+            return None
+    annotation = _strip_optional(annotation)
+    return annotation if _is_model(annotation) else None
+
+
+class LazyObject:
+    """
+    Read-only attribute view over a parsed JSON object that builds typed values on demand
+
+    Args:
+        raw: json 解析后的 dict
+        model_cls: 对应的 SDK 模型类；None 时只做 dict 访问
+    """
+
+    __slots__ = ("_raw", "_model_cls", "_cache", "_model")
+
+    def __init__(self, raw: dict, model_cls: Optional[type] = None):
+        self._raw = raw
+        self._model_cls = model_cls
+        self._cache: dict = {}
+        self._model: Any = None
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        cache = self._cache
+        if name in cache:
+            return cache[name]
+        field = field_kinds(self._model_cls).get(name) if self._model_cls is not None else None
+        if field is None:
+            if name not in self._raw:
+                raise AttributeError(name)
+            value = self._raw[name]
+        else:
+            value = self._raw.get(field.key)
+            kind = field.kind
+            if value is None:
+                value = field.default()
+            elif kind == "simple":
+                pass
+            elif kind == "float":
+                if type(value) is int:
+                    value = float(value)
+            elif kind == "model" and isinstance(value, dict):
+                value = LazyObject(value, field.sub)
+            elif kind == "list" and isinstance(value, list):
+                value = LazyList(value, field.sub)
+            else:
+                value = field.convert(value)
+        cache[name] = value
+        return value
+
+    def model(self) -> Any:
+        """构造完整的类型化模型（与 SDK 默认路径相同）；没有模型类时返回原始 dict"""
+        if self._model_cls is None:
+            return self._raw
+        if self._model is None:
+            # 默认路径中嵌套模型是 Optional[...] 字段，construct_type 对其整体校验而不是逐字段 construct
+            construct_type = _construct_type(self._model_cls)
+            if construct_type is not None:
+                self._model = construct_type(value=self._raw, type_=Optional[self._model_cls])
+            else:
+                self._model = self._model_cls.construct(**self._raw)
+        return self._model
+
+    def to_dict(self) -> dict:
+        return self._raw
+
+    def __repr__(self) -> str:
+        name = self._model_cls.__name__ if self._model_cls is not None else "LazyObject"
+        return f"<lazy {name} {sorted(self._raw)}>"
+
+
+class LazyList:
+    """对象列表的视图：下标访问 / 迭代时才把元素包装为 LazyObject"""
+
+    __slots__ = ("_raw", "_item_cls", "_views")
+
+    def __init__(self, raw: list, item_cls: Optional[type] = None):
+        self._raw = raw
+        self._item_cls = item_cls
+        self._views: dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __bool__(self) -> bool:
+        return bool(self._raw)
+
+    def _view(self, index: int) -> Any:
+        view = self._views.get(index)
+        if view is None:
+            item = self._raw[index]
+            view = LazyObject(item, self._item_cls) if isinstance(item, dict) else item
+            self._views[index] = view
+        return view
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self._view(i) for i in range(*index.indices(len(self._raw)))]
+        return self._view(index if index >= 0 else index + len(self._raw))
+
+    def __iter__(self) -> typing.Iterator[Any]:
+        for i in range(len(self._raw)):
+            yield self._view(i)
+
+    def to_list(self) -> list:
+        return self._raw
+
+    def __repr__(self) -> str:
+        return f"<lazy list[{len(self._raw)}]>"
+
+
+def lazy_response(content: Any, model_cls: Optional[type] = None) -> LazyObject:
+    """把响应体（bytes / str / 已解析的 dict）包装为 LazyObject"""
+    data = content if isinstance(content, dict) else json.loads(content)
+    return LazyObject(data, model_cls)
+
+
+class LazyMemories:
+    """
+    Opt-in raw/lazy mode for client.v1.memories.search / get
+
+    Args:
+        client: AsyncEverOS 或 EverOS 实例；AsyncEverOS 时 search / get 为协程
+
+    参数与 memories.search / get 相同；错误状态码与默认路径一样抛出 APIStatusError 等异常。
+    """
+
+    def __init__(self, client: Any):
+        self._memories = client.v1.memories
+        self._raw = client.v1.memories.with_raw_response
+        self._async = inspect.iscoroutinefunction(self._memories.search)
+        self._models = {name: response_model(getattr(self._memories, name)) for name in ("search", "get")}
+        for name, model_cls in self._models.items():
+            if model_cls is None:
+                raise TypeError(f"无法从 SDK 解析 memories.{name} 的返回类型，惰性视图无法确定字段类型")
+
+    def search(self, **kwargs: Any) -> Any:
+        return self._call("search", kwargs)
+
+    def get(self, **kwargs: Any) -> Any:
+        return self._call("get", kwargs)
+
+    def _call(self, name: str, kwargs: dict) -> Any:
+        fn = getattr(self._raw, name)
+        model_cls = self._models[name]
+        if self._async:
+            async def run() -> LazyObject:
+                raw = await fn(**kwargs)
+                return lazy_response(raw.http_response.content, model_cls)
+            return run()
+        return lazy_response(fn(**kwargs).http_response.content, model_cls)
@@ -0,0 +1,208 @@
+"""
+异步任务生命周期的延迟统计
+
+async_mode=True 的写入被受理（202 queued）后，提取在服务端异步进行；TaskLifecycleRecorder 记录每个任务的
+提交时间、受理时间、每次观察到的状态变迁（queued → processing → success / failed / expired）与完成时间，
+按写入接口（personal / group / agent）汇总为直方图，并可逐任务写出 JSONL trace，用于容量规划时查看
+真实负载下的提取延迟分布。
+
+完成时间由轮询观察得到，是真实完成时间的上界；trace 中同时记录最后一次仍未完成的观察时间
+（lag_lower_bound），真实延迟落在两者之间，缩短轮询间隔可收窄该区间。
+
+用法：
+    recorder = TaskLifecycleRecorder(trace_path="tasks.trace.jsonl")
+    memories = TrackedMemories(client, recorder=recorder)      # 自动记录受理与状态变迁
+    ...
+    print(recorder.report())
+    recorder.close()
+"""
+
+import bisect
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+# 直方图桶上界（秒）；最后一个桶收纳超出部分
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+TERMINAL = ("success", "failed", "expired", "timeout", "error")
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram
+
+    分位数按桶估计（返回所在桶的上界），与 Prometheus 的 histogram_quantile 一样是近似值；
+    max 为精确值。
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """q 分位数（0-1）所在桶的上界（不超过 max）；落在溢出桶时返回 max"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        """累计桶计数（le → count），便于导出到 Prometheus / 绘图"""
+        cumulative = {}
+        seen = 0
+        for bound, n in zip(list(self.bounds) + ["+Inf"], self.counts):
+            seen += n
+            cumulative[str(bound)] = seen
+        return {"count": self.count, "sum": round(self.total, 6), "max": round(self.max, 6), "buckets": cumulative}
+
+
+@dataclass
+class _Lifecycle:
+    task_id: str
+    endpoint: str
+    submitted: float                                  # monotonic，发出写入请求的时间
+    accepted: float                                   # monotonic，收到 202 的时间
+    accepted_wall: float                              # time.time()，写入 trace
+    status: str = "queued"
+    last_pending: float = 0.0                         # 最后一次观察到未完成的时间
+    polls: int = 0
+    transitions: list = field(default_factory=list)   # [(status, 距受理的秒数)]
+
+
+class TaskLifecycleRecorder:
+    """
+    Per-task lifecycle timing with per-endpoint histograms and an optional JSONL trace
+
+    Args:
+        trace_path: 每个任务完成时追加一行 JSON 的文件；None 表示不写 trace
+        buckets: 直方图桶上界（秒）
+
+    直方图按 (endpoint, phase) 统计，phase：
+        accept      提交请求 → 收到 202（含客户端重试）
+        extraction  受理 → 观察到终态（提取延迟，上界）
+        end_to_end  提交请求 → 观察到终态
+    """
+
+    PHASES = ("accept", "extraction", "end_to_end")
+
+    def __init__(self, trace_path: Optional[str] = None, buckets: tuple = DEFAULT_BUCKETS):
+        self.trace_path = trace_path
+        self.buckets = buckets
+        self.histograms: dict[str, dict[str, LatencyHistogram]] = {}
+        self.statuses: dict[str, dict[str, int]] = {}
+        self._tasks: dict[str, _Lifecycle] = {}
+        self._trace = None
+
+    def accepted(self, task_id: str, endpoint: str, submitted: Optional[float] = None) -> None:
+        """记录一次受理；submitted 为发出请求时的 time.monotonic()，None 表示与受理同时"""
+        now = time.monotonic()
+        lifecycle = _Lifecycle(
+            task_id=task_id,
+            endpoint=endpoint,
+            submitted=submitted if submitted is not None else now,
+            accepted=now,
+            accepted_wall=time.time(),
+            last_pending=now,
+        )
+        lifecycle.transitions.append(("queued", 0.0))
+        self._tasks[task_id] = lifecycle
+        self._histogram(endpoint, "accept").observe(now - lifecycle.submitted)
+
+    def observe(self, task_id: str, status: str) -> None:
+        """记录一次状态观察（可直接作为 TaskWatcher 的 on_status）；未经 accepted() 登记的任务忽略"""
+        lifecycle = self._tasks.get(task_id)
+        if lifecycle is None:
+            return
+        now = time.monotonic()
+        if status != "timeout":
+            lifecycle.polls += 1
+        if status != lifecycle.status:
+            lifecycle.status = status
+            lifecycle.transitions.append((status, round(now - lifecycle.accepted, 6)))
+        if status not in TERMINAL:
+            lifecycle.last_pending = now
+            return
+        del self._tasks[task_id]
+        self._complete(lifecycle, now)
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    def _histogram(self, endpoint: str, phase: str) -> LatencyHistogram:
+        phases = self.histograms.setdefault(endpoint, {})
+        if phase not in phases:
+            phases[phase] = LatencyHistogram(self.buckets)
+        return phases[phase]
+
+    def _complete(self, lifecycle: _Lifecycle, now: float) -> None:
+        counts = self.statuses.setdefault(lifecycle.endpoint, {})
+        counts[lifecycle.status] = counts.get(lifecycle.status, 0) + 1
+        if lifecycle.status != "timeout":
+            self._histogram(lifecycle.endpoint, "extraction").observe(now - lifecycle.accepted)
+            self._histogram(lifecycle.endpoint, "end_to_end").observe(now - lifecycle.submitted)
+        if self.trace_path is None:
+            return
+        if self._trace is None:
+            self._trace = open(self.trace_path, "a", encoding="utf-8")
+        record = {
+            "task_id": lifecycle.task_id,
+            "endpoint": lifecycle.endpoint,
+            "accepted_at": lifecycle.accepted_wall,
+            "accept_latency": round(lifecycle.accepted - lifecycle.submitted, 6),
+            "final_status": lifecycle.status,
+            "extraction_lag": round(now - lifecycle.accepted, 6),
+            "lag_lower_bound": round(lifecycle.last_pending - lifecycle.accepted, 6),
+            "polls": lifecycle.polls,
+            "transitions": [{"status": s, "t": t} for s, t in lifecycle.transitions],
+        }
+        self._trace.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._trace.flush()
+
+    def to_dict(self) -> dict:
+        """{endpoint: {"statuses": {...}, phase: 直方图}}，可直接 json.dump"""
+        return {
+            endpoint: {"statuses": self.statuses.get(endpoint, {}), **{p: h.to_dict() for p, h in phases.items()}}
+            for endpoint, phases in self.histograms.items()
+        }
+
+    def report(self) -> str:
+        """每个接口、每个阶段一行：count / mean / p50 / p90 / p99 / max（秒）"""
+        lines = []
+        for endpoint, phases in sorted(self.histograms.items()):
+            statuses = ", ".join(f"{s}={n}" for s, n in sorted(self.statuses.get(endpoint, {}).items()))
+            lines.append(f"[{endpoint}] {statuses or 'no completed tasks'}")
+            for phase in self.PHASES:
+                h = phases.get(phase)
+                if h is None or not h.count:
+                    continue
+                lines.append(
+                    f"  {phase:<11} n={h.count:<5} mean={h.mean:.2f}s p50<={h.quantile(0.5):g}s "
+                    f"p90<={h.quantile(0.9):g}s p99<={h.quantile(0.99):g}s max={h.max:.2f}s"
+                )
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
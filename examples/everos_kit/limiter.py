@@ -0,0 +1,205 @@
+"""
+AIMD 自适应并发控制器
+
+把 AsyncEverOS 的写入调用（memories.add / memories.group.add / memories.agent.add）包一层：
+请求健康时并发窗口加性增长（每个窗口的请求全部成功约 +1），遇到 429 / Retry-After / 超时 / 5xx
+（或延迟超过目标）时乘性下降，从而让批量任务自己找到服务端可持续的最大速率。
+
+用法：
+    client = AsyncEverOS(max_retries=0)     # 关闭 SDK 内置重试，让限流信号直接反馈给控制器
+    limiter = AdaptiveLimiter()
+    add = limiter.wrap(client.v1.memories.group.add)
+    await add(group_id=..., messages=[...])
+    print(limiter.metrics())
+"""
+
+import asyncio
+import collections
+import email.utils
+import functools
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from everos import APIStatusError, APITimeoutError, RateLimitError
+
+T = TypeVar("T")
+
+
+@dataclass
+class LimiterMetrics:
+    """控制器当前状态快照"""
+    limit: float             # 当前并发窗口
+    in_flight: int           # 在途请求数
+    succeeded: int           # 累计成功请求数
+    throttled: int           # 累计 429 次数
+    errors: int              # 累计超时 / 5xx 次数
+    decreases: int           # 累计窗口下调次数
+    throughput: float        # 最近 throughput_window 秒内的成功请求数 / 秒
+    paused_for: float        # 因 Retry-After 剩余的暂停时间（秒）
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """从异常的响应头读取 retry-after-ms / Retry-After（秒数或 HTTP 日期）"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_congestion(error: BaseException) -> bool:
+    """429、超时与 5xx 视为拥塞信号；4xx 校验错误等与负载无关，不调整窗口"""
+    if isinstance(error, (RateLimitError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+class AdaptiveLimiter:
+    """
+    Additive-increase / multiplicative-decrease concurrency limiter
+
+    Args:
+        initial: 初始并发窗口
+        min_limit / max_limit: 窗口上下限
+        increase: 每个窗口的请求全部成功后窗口增加量
+        backoff: 拥塞时窗口乘以该系数
+        latency_target: 成功请求耗时超过该值（秒）也视为拥塞；None 表示只看错误
+        throughput_window: 统计吞吐的滑动窗口（秒）
+
+    同一窗口内的多个拥塞信号只下调一次：只有在上次下调之后才发出的请求失败才会再次下调。
+    """
+
+    def __init__(
+        self,
+        initial: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        increase: float = 1,
+        backoff: float = 0.5,
+        latency_target: Optional[float] = None,
+        throughput_window: float = 10.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_target = latency_target
+        self.throughput_window = throughput_window
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._in_flight = 0
+        self._epoch = 0
+        self._paused_until = 0.0
+        self._changed = asyncio.Event()
+        self._completions: collections.deque = collections.deque()
+        self._started: Optional[float] = None
+        self._succeeded = 0
+        self._throttled = 0
+        self._errors = 0
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self._limit))
+
+    async def acquire(self) -> int:
+        """等待一个并发名额，返回本次请求所属的窗口纪元（传给 release）"""
+        if self._started is None:
+            self._started = time.monotonic()
+        while True:
+            delay = self._paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            if self._in_flight < self.limit:
+                self._in_flight += 1
+                return self._epoch
+            await self._changed.wait()
+
+    def release(self, epoch: int, latency: float, error: Optional[BaseException] = None) -> None:
+        """归还名额并根据结果调整窗口"""
+        self._in_flight -= 1
+        now = time.monotonic()
+        if error is None:
+            self._succeeded += 1
+            self._completions.append(now)
+            if self.latency_target is not None and latency > self.latency_target:
+                self._decrease(epoch)
+            else:
+                self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+        elif is_congestion(error):
+            if isinstance(error, RateLimitError):
+                self._throttled += 1
+            else:
+                self._errors += 1
+            retry_after = retry_after_seconds(error)
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            self._decrease(epoch)
+        self._notify()
+
+    def _decrease(self, epoch: int) -> None:
+        if epoch != self._epoch:
+            return
+        self._limit = max(self.min_limit, self._limit * self.backoff)
+        self._epoch += 1
+        self._decreases += 1
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def call(self, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """在控制器下执行一次请求；异常原样抛出"""
+        epoch = await self.acquire()
+        started = time.monotonic()
+        try:
+            result = await fn(*args, **kwargs)
+        except asyncio.CancelledError:
+            self._in_flight -= 1
+            self._notify()
+            raise
+        except Exception as e:
+            self.release(epoch, time.monotonic() - started, e)
+            raise
+        self.release(epoch, time.monotonic() - started)
+        return result
+
+    def wrap(self, fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        """返回受控版本的协程函数，如 limiter.wrap(client.v1.memories.agent.add)"""
+        @functools.wraps(fn)
+        async def limited(*args: Any, **kwargs: Any) -> T:
+            return await self.call(fn, *args, **kwargs)
+        return limited
+
+    def metrics(self) -> LimiterMetrics:
+        now = time.monotonic()
+        while self._completions and self._completions[0] < now - self.throughput_window:
+            self._completions.popleft()
+        span = min(self.throughput_window, now - self._started) if self._started is not None else 0.0
+        return LimiterMetrics(
+            limit=round(self._limit, 2),
+            in_flight=self._in_flight,
+            succeeded=self._succeeded,
+            throttled=self._throttled,
+            errors=self._errors,
+            decreases=self._decreases,
+            throughput=round(len(self._completions) / span, 2) if span > 0 else 0.0,
+            paused_for=max(0.0, self._paused_until - now),
+        )
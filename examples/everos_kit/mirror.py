@@ -0,0 +1,310 @@
+"""
+单个范围（user_id / group_id）记忆的本地 SQLite 镜像
+
+看板里读多写少的用户，每次 memories.get 都是一次网络往返。MemoryMirror 把一个范围的记忆同步到嵌入式
+SQLite：带 timestamp 的类型（episodic_memory / agent_case）以「水位线 - overlap_ms」为 timestamp gte
+只拉取增量并按 id upsert，没有 timestamp 的类型（profile / agent_skill）每次整体替换。
+get() 在本地执行与 memories.get 相同的 filters DSL（隐式 eq、in、gt / gte / lt / lte、AND / OR）、
+rank_by / rank_order 与分页，返回与 GetMemResponse 同形的 MirrorPage（条目为 dict），
+并带上 staleness（距上次成功同步的秒数），调用方据此决定是否回退到 API 或先 sync()。
+
+增量同步看不到服务端删除；需要反映删除时用 sync(full=True) 整体替换。每种类型的同步先写入临时表，
+拉取完成后在一个事务内合并，同步期间的本地查询看到的始终是上一次完整的同步结果。
+
+用法：
+    mirror = MemoryMirror(client.v1.memories.get, {"user_id": "u1"}, path="u1.mirror.db")
+    await mirror.sync()
+    page = mirror.get(memory_type="episodic_memory", filters={"session_id": "s1"}, page_size=20)
+    if page.staleness > 300:
+        ...                                   # 太旧：回退到 client.v1.memories.get 或先 await mirror.sync()
+"""
+
+import asyncio
+import json
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from everos_kit.pagination import MAX_PAGE_SIZE, RESULT_FIELDS, aiter_memories, item_to_dict
+from everos_kit.scan import TIMESTAMP_TYPES, TimeShardedScanner, timestamp_ms
+
+# 带 timestamp、可按水位线增量同步的类型
+INCREMENTAL_TYPES = TIMESTAMP_TYPES
+# 提升为列（带索引）的字段；其余字段通过 json_extract(body, ...) 过滤 / 排序
+COLUMNS = ("id", "user_id", "group_id", "session_id", "type", "parent_type", "parent_id")
+
+_OPERATORS = {"eq": "=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+_FIELD = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    memory_type TEXT NOT NULL,
+    id TEXT NOT NULL,
+    user_id TEXT,
+    group_id TEXT,
+    session_id TEXT,
+    type TEXT,
+    parent_type TEXT,
+    parent_id TEXT,
+    timestamp_ms INTEGER,
+    body TEXT NOT NULL,
+    PRIMARY KEY (memory_type, id)
+);
+CREATE INDEX IF NOT EXISTS memories_ts ON memories (memory_type, timestamp_ms);
+CREATE INDEX IF NOT EXISTS memories_session ON memories (memory_type, session_id, timestamp_ms);
+CREATE TABLE IF NOT EXISTS sync_state (
+    memory_type TEXT PRIMARY KEY,
+    scope TEXT NOT NULL,
+    watermark INTEGER,
+    synced_at REAL NOT NULL
+);
+CREATE TEMP TABLE IF NOT EXISTS staging AS SELECT * FROM memories WHERE 0;
+"""
+
+
+@dataclass
+class SyncResult:
+    """一种记忆类型的一次同步"""
+    memory_type: str
+    fetched: int                  # 本次拉取的条数
+    total: int                    # 同步后镜像中的条数
+    watermark: Optional[int]      # 毫秒；没有 timestamp 的类型为 None
+    full: bool                    # 是否整体替换
+    elapsed: float
+
+
+@dataclass
+class MirrorPage:
+    """mirror.get() 的结果；data 与 GetMemResponse.data 同形，可直接交给 page_items()"""
+    memory_type: str
+    items: list
+    total_count: int
+    page: int
+    page_size: int
+    staleness: float              # 距上次成功同步的秒数；从未同步为 inf
+
+    @property
+    def data(self) -> SimpleNamespace:
+        return SimpleNamespace(**{
+            RESULT_FIELDS[self.memory_type]: self.items,
+            "total_count": self.total_count,
+            "count": len(self.items),
+        })
+
+
+def _column(field: str) -> str:
+    if field == "timestamp":
+        return "timestamp_ms"
+    if field in COLUMNS:
+        return field
+    if not _FIELD.match(field):
+        raise ValueError(f"不支持的过滤字段: {field!r}")
+    return f"json_extract(body, '$.{field}')"
+
+
+def compile_filters(filters: Optional[dict]) -> tuple[str, list]:
+    """
+    Translate the memories.get filters DSL into a SQL WHERE clause
+
+    支持隐式 eq、{"eq" / "in" / "gt" / "gte" / "lt" / "lte": ...} 以及 AND / OR 列表嵌套；
+    timestamp 的比较值为毫秒。返回 (SQL, 参数)，不支持的运算符抛出 ValueError。
+    """
+    clauses: list[str] = []
+    params: list = []
+    for key, value in (filters or {}).items():
+        if key in ("AND", "OR"):
+            parts = [compile_filters(sub) for sub in value]
+            if not parts:
+                clauses.append("1" if key == "AND" else "0")
+                continue
+            clauses.append("(" + f" {key} ".join(f"({sql})" for sql, _ in parts) + ")")
+            for _, sub_params in parts:
+                params.extend(sub_params)
+            continue
+        column = _column(key)
+        conditions = value if isinstance(value, dict) else {"eq": value}
+        for op, operand in conditions.items():
+            if op == "in":
+                operands = list(operand)
+                if not operands:
+                    clauses.append("0")
+                    continue
+                clauses.append(f"{column} IN ({', '.join('?' * len(operands))})")
+                params.extend(operands)
+            elif op in _OPERATORS:
+                clauses.append(f"{column} {_OPERATORS[op]} ?")
+                params.append(operand)
+            else:
+                raise ValueError(f"不支持的过滤运算符: {op!r}")
+    return " AND ".join(clauses) or "1", params
+
+
+class MemoryMirror:
+    """
+    Local SQLite mirror of one scope's memories, kept fresh by timestamp-watermark delta syncs
+
+    Args:
+        get: client.v1.memories.get（AsyncEverOS）
+        scope: 范围 filters，如 {"user_id": "u1"} 或 {"group_id": "g1"}
+        path: SQLite 文件路径；":memory:" 表示只在进程内
+        memory_types: 同步的类型；None 时 user_id 范围同步全部四种，group_id 范围只同步 episodic_memory
+        overlap_ms: 增量同步从水位线之前多少毫秒开始重扫（timestamp 是对话时间，较晚完成的提取可能落在水位线之前）
+        concurrency: 增量扫描的时间分片数与并发请求数
+
+    同一个数据库文件只应对应一个范围；scope 与文件中记录的不一致时抛出 ValueError。
+    """
+
+    def __init__(
+        self,
+        get: Callable[..., Awaitable[Any]],
+        scope: dict,
+        path: str = ":memory:",
+        memory_types: Optional[Iterable[str]] = None,
+        overlap_ms: int = 3_600_000,
+        concurrency: int = 4,
+    ):
+        self.get_remote = get
+        self.scope = dict(scope)
+        if memory_types is None:
+            memory_types = RESULT_FIELDS if "user_id" in self.scope else ("episodic_memory",)
+        self.memory_types = tuple(memory_types)
+        self.overlap_ms = overlap_ms
+        self.concurrency = max(1, concurrency)
+        self._scope_key = json.dumps(self.scope, sort_keys=True, ensure_ascii=False)
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+        # 所有同步共用一张 staging 表，并发的 sync() 逐个执行
+        self._sync_lock = asyncio.Lock()
+        other = self._db.execute("SELECT scope FROM sync_state WHERE scope != ? LIMIT 1", (self._scope_key,)).fetchone()
+        if other is not None:
+            raise ValueError(f"{path} 已是范围 {other[0]} 的镜像")
+
+    # ── 同步 ────────────────────────────────────────────
+    async def sync(self, memory_types: Optional[Iterable[str]] = None, full: bool = False) -> list[SyncResult]:
+        """
+        拉取增量并合并进镜像
+
+        Args:
+            memory_types: 只同步这些类型；None 表示构造时的全部类型
+            full: 忽略水位线，整体替换（可反映服务端删除）
+
+        并发调用时按调用顺序逐个执行。
+        """
+        async with self._sync_lock:
+            return [await self._sync_type(memory_type, full) for memory_type in (memory_types or self.memory_types)]
+
+    async def _sync_type(self, memory_type: str, full: bool) -> SyncResult:
+        started = time.monotonic()
+        incremental = memory_type in INCREMENTAL_TYPES
+        watermark = self.watermark(memory_type) if incremental and not full else None
+        replace = not incremental or watermark is None
+        if incremental:
+            start_ms = watermark - self.overlap_ms if watermark is not None else None
+            scanner = TimeShardedScanner(self.get_remote, shards=self.concurrency, concurrency=self.concurrency)
+            items = scanner.scan(filters=self.scope, memory_type=memory_type, start_ms=start_ms)
+        else:
+            items = aiter_memories(self.get_remote, memory_type=memory_type, filters=self.scope, prefetch=1)
+
+        # 暂存写入各自在短事务中提交：拉取（await）期间连接上没有未结束的事务，不阻塞其他进程写镜像文件
+        with self._db:
+            self._db.execute("DELETE FROM staging")
+        fetched = 0
+        high = watermark
+        batch: list[tuple] = []
+        try:
+            async for item in items:
+                record = item_to_dict(item)
+                ts = timestamp_ms(record)
+                if ts is not None:
+                    high = ts if high is None else max(high, ts)
+                batch.append((
+                    memory_type, *(None if record.get(c) is None else str(record.get(c)) for c in COLUMNS),
+                    ts, json.dumps(record, ensure_ascii=False),
+                ))
+                fetched += 1
+                if len(batch) >= 500:
+                    self._stage(batch)
+                    batch = []
+            self._stage(batch)
+        except BaseException:
+            # 拉取失败：丢弃已暂存的部分结果，镜像保持上一次同步的状态
+            with self._db:
+                self._db.execute("DELETE FROM staging")
+            raise
+
+        # 拉取完成后一次性合并：同步期间的查询只看到上一次完整的结果
+        with self._db:
+            if replace:
+                self._db.execute("DELETE FROM memories WHERE memory_type = ?", (memory_type,))
+            self._db.execute("INSERT OR REPLACE INTO memories SELECT * FROM staging")
+            self._db.execute("DELETE FROM staging")
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state (memory_type, scope, watermark, synced_at) VALUES (?, ?, ?, ?)",
+                (memory_type, self._scope_key, high if incremental else None, time.time()),
+            )
+        total = self._db.execute("SELECT COUNT(*) FROM memories WHERE memory_type = ?", (memory_type,)).fetchone()[0]
+        return SyncResult(memory_type, fetched, total, high if incremental else None, replace, time.monotonic() - started)
+
+    def _stage(self, rows: list[tuple]) -> None:
+        if rows:
+            with self._db:
+                self._db.executemany(f"INSERT INTO staging VALUES ({', '.join('?' * 10)})", rows)
+
+    def watermark(self, memory_type: str) -> Optional[int]:
+        row = self._db.execute("SELECT watermark FROM sync_state WHERE memory_type = ?", (memory_type,)).fetchone()
+        return row[0] if row else None
+
+    def staleness(self, memory_type: Optional[str] = None) -> float:
+        """距上次成功同步的秒数；memory_type 为 None 时取全部类型中最旧的，从未同步为 inf"""
+        types = [memory_type] if memory_type else list(self.memory_types)
+        rows = self._db.execute(
+            f"SELECT memory_type, synced_at FROM sync_state WHERE memory_type IN ({', '.join('?' * len(types))})", types
+        ).fetchall()
+        synced = dict(rows)
+        if any(t not in synced for t in types):
+            return float("inf")
+        return max(0.0, time.time() - min(synced.values()))
+
+    # ── 本地查询 ────────────────────────────────────────
+    def get(
+        self,
+        *,
+        memory_type: str,
+        filters: Optional[dict] = None,
+        page: int = 1,
+        page_size: int = 20,
+        rank_by: str = "timestamp",
+        rank_order: str = "desc",
+    ) -> MirrorPage:
+        """
+        在镜像上执行 memories.get 风格的查询（参数与默认值同 memories.get）
+
+        filters 在镜像范围内进一步过滤，无需重复 user_id / group_id；
+        镜像没有同步 memory_type 时抛出 ValueError。
+        """
+        if memory_type not in self.memory_types:
+            raise ValueError(f"镜像未同步 {memory_type}（已同步: {', '.join(self.memory_types)}）")
+        page = max(1, page)
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        where, params = compile_filters(filters)
+        order = "DESC" if rank_order == "desc" else "ASC"
+        sql_where = f"memory_type = ? AND ({where})"
+        total = self._db.execute(f"SELECT COUNT(*) FROM memories WHERE {sql_where}", [memory_type, *params]).fetchone()[0]
+        rows = self._db.execute(
+            f"SELECT body FROM memories WHERE {sql_where} ORDER BY {_column(rank_by)} {order}, id {order} LIMIT ? OFFSET ?",
+            [memory_type, *params, page_size, (page - 1) * page_size],
+        ).fetchall()
+        return MirrorPage(
+            memory_type=memory_type,
+            items=[json.loads(body) for (body,) in rows],
+            total_count=total,
+            page=page,
+            page_size=page_size,
+            staleness=self.staleness(memory_type),
+        )
+
+    def close(self) -> None:
+        self._db.close()
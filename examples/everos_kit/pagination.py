@@ -0,0 +1,175 @@
+"""
+memories.get 的自动翻页 + 预取迭代器
+
+memories.get 通过 page / page_size（每页最多 100）分页，03_get_sync.py 只取第 1 页。
+aiter_memories()（AsyncEverOS）与 iter_memories()（EverOS）遍历一个查询的全部页：调用方处理第 N 页时
+后台已在请求第 N+1 ~ N+prefetch 页，网络延迟被处理时间掩盖；内存中最多保留 prefetch + 1 页。
+第一页返回的 total_count 决定最后一页，不会多发请求；total_count 缺失时以不满一页作为结束。
+
+分页基于偏移量：遍历期间有新写入时，按 timestamp 降序（默认）排在前面的新记忆会让后续页整体后移，
+可能出现重复条目；需要一致快照时按 timestamp 升序遍历，或在 filters 中限定 timestamp 上界；
+并行的全量扫描见 everos_kit.scan。
+
+用法：
+    async for episode in aiter_memories(client.v1.memories.get, filters={"user_id": "u1"}, memory_type="episodic_memory"):
+        ...
+    for profile in iter_memories(sync_client.v1.memories.get, filters={"user_id": "u1"}, memory_type="profile"):
+        ...
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import math
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Optional
+
+MAX_PAGE_SIZE = 100
+
+# memory_type → GetMemResponse 中的结果列表
+RESULT_FIELDS = {
+    "episodic_memory": "episodes",
+    "profile": "profiles",
+    "agent_case": "agent_cases",
+    "agent_skill": "agent_skills",
+}
+
+
+def page_items(response: Any, memory_type: str) -> list:
+    data = getattr(response, "data", None)
+    return list(getattr(data, RESULT_FIELDS.get(memory_type, "episodes"), None) or [])
+
+
+def item_to_dict(item: Any) -> dict:
+    """SDK 模型 / SimpleNamespace / dict 条目转为 JSON 兼容的新 dict（datetime 等转为字符串）"""
+    if isinstance(item, dict):
+        return dict(item)
+    to_dict = getattr(item, "to_dict", None)
+    if callable(to_dict):
+        try:
+            return to_dict(mode="json")
+        except TypeError:
+            return to_dict()
+    return dict(vars(item))
+
+
+def last_page(response: Any, page_size: int) -> Optional[int]:
+    """由第一页的 total_count 算出最后一页的页码；无法得知时返回 None"""
+    data = getattr(response, "data", None)
+    total = getattr(data, "total_count", None)
+    if total is None:
+        return None
+    return max(1, math.ceil(total / page_size))
+
+
+def _is_last(response: Any, page: int, final: Optional[int], page_size: int, memory_type: str) -> bool:
+    if final is not None:
+        return page >= final
+    return len(page_items(response, memory_type)) < page_size
+
+
+async def aiter_pages(
+    get: Callable[..., Awaitable[Any]],
+    *,
+    memory_type: str,
+    page_size: int = MAX_PAGE_SIZE,
+    prefetch: int = 1,
+    start_page: int = 1,
+    **kwargs: Any,
+) -> AsyncIterator[Any]:
+    """
+    Yield memories.get responses page by page, prefetching up to `prefetch` pages ahead
+
+    Args:
+        get: client.v1.memories.get（AsyncEverOS）
+        memory_type: 同 memories.get
+        page_size: 每页条数（1 ~ 100）
+        prefetch: 预取深度；0 表示不预取
+        start_page: 起始页码
+        kwargs: 其余 memories.get 参数（filters / rank_by / rank_order）
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+    def fetch(page: int) -> "asyncio.Task":
+        return asyncio.create_task(get(memory_type=memory_type, page=page, page_size=page_size, **kwargs))
+
+    first = await get(memory_type=memory_type, page=start_page, page_size=page_size, **kwargs)
+    final = last_page(first, page_size)
+    window: collections.deque = collections.deque()
+    next_page = start_page + 1
+    try:
+        response, page = first, start_page
+        while True:
+            # 交出当前页之前先把预取窗口补满
+            while len(window) < prefetch and (final is None or next_page <= final):
+                if final is None and _is_last(response, page, final, page_size, memory_type):
+                    break
+                window.append((next_page, fetch(next_page)))
+                next_page += 1
+            yield response
+            if _is_last(response, page, final, page_size, memory_type):
+                return
+            if window:
+                page, task = window.popleft()
+                response = await task
+            else:
+                page = page + 1
+                response = await get(memory_type=memory_type, page=page, page_size=page_size, **kwargs)
+                next_page = page + 1
+    finally:
+        for _, task in window:
+            task.cancel()
+        await asyncio.gather(*(task for _, task in window), return_exceptions=True)
+
+
+async def aiter_memories(get: Callable[..., Awaitable[Any]], *, memory_type: str, **kwargs: Any) -> AsyncIterator[Any]:
+    """逐条产出全部页的记忆；参数同 aiter_pages()"""
+    async for response in aiter_pages(get, memory_type=memory_type, **kwargs):
+        for item in page_items(response, memory_type):
+            yield item
+
+
+def iter_pages(
+    get: Callable[..., Any],
+    *,
+    memory_type: str,
+    page_size: int = MAX_PAGE_SIZE,
+    prefetch: int = 1,
+    start_page: int = 1,
+    **kwargs: Any,
+) -> Iterator[Any]:
+    """aiter_pages() 的同步版本（EverOS）：预取在后台线程中进行，参数相同"""
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    first = get(memory_type=memory_type, page=start_page, page_size=page_size, **kwargs)
+    final = last_page(first, page_size)
+    window: collections.deque = collections.deque()
+    next_page = start_page + 1
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, prefetch)) as pool:
+        try:
+            response, page = first, start_page
+            while True:
+                while len(window) < prefetch and (final is None or next_page <= final):
+                    if final is None and _is_last(response, page, final, page_size, memory_type):
+                        break
+                    window.append((next_page, pool.submit(
+                        get, memory_type=memory_type, page=next_page, page_size=page_size, **kwargs
+                    )))
+                    next_page += 1
+                yield response
+                if _is_last(response, page, final, page_size, memory_type):
+                    return
+                if window:
+                    page, future = window.popleft()
+                    response = future.result()
+                else:
+                    page = page + 1
+                    response = get(memory_type=memory_type, page=page, page_size=page_size, **kwargs)
+                    next_page = page + 1
+        finally:
+            for _, future in window:
+                future.cancel()
+
+
+def iter_memories(get: Callable[..., Any], *, memory_type: str, **kwargs: Any) -> Iterator[Any]:
+    """逐条产出全部页的记忆（同步）；参数同 iter_pages()"""
+    for response in iter_pages(get, memory_type=memory_type, **kwargs):
+        yield from page_items(response, memory_type)
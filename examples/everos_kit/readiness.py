@@ -0,0 +1,177 @@
+"""
+"写入后可检索"的等待屏障
+
+写入（add / flush）之后记忆提取是异步的，示例里常用固定的 sleep(5) / "等待 ~10s" 再搜索：
+正常情况下白白等待，负载高时又不够。wait_until_searchable() 先等写入返回的 task 完成，
+再用 memories.get 在写入消息的 timestamp 窗口上探测，查到本次写入产生的记忆即返回；
+两个阶段共用一个截止时间，探测间隔指数增长。
+
+记忆条目不带来源消息的 message_id，因此"本次写入产生"按两条规则判断：开始等待时窗口内已有的记忆
+（基线快照）不计入，除非其文本包含某条写入消息的内容。应在写入返回后立即调用，否则提取已完成的记忆
+会进入基线，只能靠内容匹配认出。
+
+用法：
+    handle = await memories.group.add(group_id="g1", messages=messages)       # TrackedMemories 的句柄或 task_id
+    ready = await wait_until_searchable(client, handle, filters={"group_id": "g1"}, messages=messages)
+    if ready:
+        await client.v1.memories.search(...)
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional, Union
+
+from everos_kit.handles import AddHandle
+from everos_kit.pagination import MAX_PAGE_SIZE, item_to_dict, page_items
+from everos_kit.retry import TRANSIENT, classify_error
+from everos_kit.tasks import TaskOutcome, TaskWatcher
+
+
+@dataclass
+class Readiness:
+    """等待结果；bool(readiness) 表示数据已可检索"""
+    ready: bool
+    reason: str                                           # ready / task_failed / cancelled / timeout
+    elapsed: float
+    tasks: list[TaskOutcome] = field(default_factory=list)
+    probes: int = 0                                       # memories.get 探测次数
+    count: int = 0                                        # 最后一次探测匹配到的记忆条数
+
+    def __bool__(self) -> bool:
+        return self.ready
+
+
+def message_window(messages: Iterable[dict], slack_ms: int = 0) -> Optional[dict]:
+    """写入消息的 timestamp 范围，转为 filters 中的 timestamp 条件；消息没有 timestamp 时返回 None"""
+    timestamps = [m["timestamp"] for m in messages if m.get("timestamp") is not None]
+    if not timestamps:
+        return None
+    return {"gte": min(timestamps) - slack_ms, "lte": max(timestamps) + slack_ms}
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _item_text(item: Any) -> str:
+    return _normalize(" ".join(v for v in item_to_dict(item).values() if isinstance(v, str)))
+
+
+def _matches(item: Any, baseline: set, contents: list[str]) -> bool:
+    """基线之后出现的记忆，或文本包含某条写入消息内容的记忆"""
+    if getattr(item, "id", None) not in baseline:
+        return True
+    if not contents:
+        return False
+    text = _item_text(item)
+    return any(content in text for content in contents)
+
+
+async def _window_items(client: Any, filters: dict, memory_type: str) -> list:
+    response = await client.v1.memories.get(
+        filters=filters, memory_type=memory_type, page=1, page_size=MAX_PAGE_SIZE, rank_by="timestamp", rank_order="desc"
+    )
+    return page_items(response, memory_type)
+
+
+async def wait_until_searchable(
+    client: Any,
+    *writes: Union[AddHandle, str],
+    filters: Optional[dict] = None,
+    messages: Iterable[dict] = (),
+    memory_type: str = "episodic_memory",
+    min_count: int = 1,
+    slack_ms: int = 0,
+    deadline: float = 60.0,
+    probe_interval: float = 0.25,
+    max_probe_interval: float = 2.0,
+    watcher: Optional[TaskWatcher] = None,
+) -> Readiness:
+    """
+    Wait until the given writes are extracted and visible to memories.get
+
+    Args:
+        client: AsyncEverOS 实例
+        writes: AddHandle 或 task_id；没有 task_id 的写入（如同步 flush）直接进入探测阶段
+        filters: 探测用的范围条件，如 {"user_id": ...} / {"group_id": ...}；None 表示只等 task
+        messages: 写入的消息，用其 timestamp 范围收窄探测（episode 的 timestamp 是事件发生时间），
+            用其 content 认出基线中已包含本次内容的记忆
+        memory_type: 探测的记忆类型
+        min_count: 窗口内至少匹配到多少条本次写入产生的记忆才算就绪（每次探测最多看 100 条）
+        slack_ms: timestamp 窗口两侧放宽的毫秒数（提取结果的时间可能取会话起点）
+        deadline: 两个阶段合计的最长等待（秒）
+        probe_interval / max_probe_interval: 探测间隔的初值与上限（秒），也用于 task 轮询
+        watcher: 共享的 TaskWatcher；None 时临时创建
+
+    Returns:
+        Readiness；task 失败时 reason="task_failed"，task 被取消（如 TaskWatcher.close()）时 reason="cancelled"，
+        超过 deadline 时 reason="timeout"
+    """
+    started = time.monotonic()
+    stop_at = started + deadline
+    outcomes: list[TaskOutcome] = []
+    messages = list(messages)
+
+    probe_filters = None
+    baseline: set = set()
+    if filters is not None:
+        probe_filters = dict(filters)
+        window = message_window(messages, slack_ms)
+        if window is not None:
+            probe_filters["timestamp"] = window
+        # 基线快照：写入前窗口内已有的记忆不算作本次写入的结果
+        try:
+            baseline = {item.id for item in await _window_items(client, probe_filters, memory_type)}
+        except Exception as e:
+            if classify_error(e) != TRANSIENT:
+                raise
+
+    futures = []
+    own_watcher = None
+    for write in writes:
+        if isinstance(write, AddHandle):
+            futures.append(write.future)
+        elif write:
+            if watcher is None:
+                watcher = own_watcher = TaskWatcher(
+                    client.v1.tasks, initial_delay=probe_interval, max_delay=max_probe_interval
+                )
+            futures.append(watcher.watch(write))
+    try:
+        if futures:
+            done, _ = await asyncio.wait(futures, timeout=max(0.0, stop_at - time.monotonic()))
+            outcomes = [f.result() for f in futures if f in done and not f.cancelled()]
+            if len(done) < len(futures):
+                return Readiness(False, "timeout", time.monotonic() - started, outcomes)
+            if any(f.cancelled() for f in futures):
+                return Readiness(False, "cancelled", time.monotonic() - started, outcomes)
+            if not all(outcome.done for outcome in outcomes):
+                return Readiness(False, "task_failed", time.monotonic() - started, outcomes)
+    finally:
+        if own_watcher is not None:
+            await own_watcher.close()
+
+    if probe_filters is None:
+        return Readiness(True, "ready", time.monotonic() - started, outcomes)
+
+    contents = [_normalize(m["content"]) for m in messages if isinstance(m.get("content"), str) and m["content"].strip()]
+    probes = 0
+    count = 0
+    delay = probe_interval
+    while True:
+        probes += 1
+        try:
+            items = await _window_items(client, probe_filters, memory_type)
+            count = sum(1 for item in items if _matches(item, baseline, contents))
+        except Exception as e:
+            # 超时 / 429 / 5xx 按未就绪处理，下次探测再试；参数错误等直接抛出
+            if classify_error(e) != TRANSIENT:
+                raise
+        if count >= min_count:
+            return Readiness(True, "ready", time.monotonic() - started, outcomes, probes, count)
+        remaining = stop_at - time.monotonic()
+        if remaining <= 0:
+            return Readiness(False, "timeout", time.monotonic() - started, outcomes, probes, count)
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(max_probe_interval, delay * 2)
@@ -0,0 +1,95 @@
+"""
+错误分类与带抖动的指数退避重试
+
+transient  超时、连接错误、408、429、5xx：可重试
+permanent  400 / 404 / 422 等参数或数据问题：重试无意义，交给调用方（如写入死信队列）
+fatal      401 / 403：凭证问题，继续处理其他数据也会失败，应中止整个任务
+
+用法：
+    policy = RetryPolicy(max_attempts=5)
+    response = await policy.call(client.v1.memories.group.add, group_id=..., messages=[...])
+
+SDK 客户端默认自带 2 次重试（max_retries=2），与 RetryPolicy 叠加时请求数与退避时间相乘
+（max_attempts=5 时每次调用最多 15 个请求）；被 RetryPolicy 包装的客户端应以 AsyncEverOS(max_retries=0) 创建。
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from everos import APIConnectionError, APIStatusError
+from everos_kit.limiter import retry_after_seconds
+
+T = TypeVar("T")
+
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+FATAL = "fatal"
+
+
+def classify_error(error: BaseException) -> str:
+    """把异常归类为 transient / permanent / fatal（APITimeoutError 是 APIConnectionError 的子类）"""
+    if isinstance(error, APIConnectionError):
+        return TRANSIENT
+    if isinstance(error, APIStatusError):
+        status = error.status_code
+        if status in (408, 429) or status >= 500:
+            return TRANSIENT
+        if status in (401, 403):
+            return FATAL
+    return PERMANENT
+
+
+def describe_error(error: BaseException) -> dict:
+    """异常的可序列化描述（写入死信记录）"""
+    return {
+        "class": classify_error(error),
+        "type": type(error).__name__,
+        "status_code": getattr(error, "status_code", None),
+        "message": str(error),
+    }
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry transient failures with full-jitter exponential backoff
+
+    第 n 次重试前等待 uniform(0, min(max_delay, base_delay * 2**n)) 秒；
+    响应带 Retry-After 时至少等待该时长。
+    """
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def backoff(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        retry_after = retry_after_seconds(error) if error is not None else None
+        return max(delay, retry_after or 0.0)
+
+    async def call(
+        self,
+        fn: Callable[..., Awaitable[T]],
+        *args: Any,
+        on_retry: Optional[Callable[[int, BaseException, float], None]] = None,
+        **kwargs: Any,
+    ) -> T:
+        """
+        调用 fn，transient 错误按策略重试；permanent / fatal 错误或重试次数用尽时抛出最后一个异常
+
+        Args:
+            on_retry: 每次重试前的回调 (第几次重试, 异常, 等待秒数)
+        """
+        attempt = 0
+        while True:
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                attempt += 1
+                if classify_error(e) != TRANSIENT or attempt >= self.max_attempts:
+                    raise
+                delay = self.backoff(attempt - 1, e)
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                await asyncio.sleep(delay)
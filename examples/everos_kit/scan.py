@@ -0,0 +1,214 @@
+"""
+按时间分片的并行扫描
+
+按 rank_by="timestamp" 顺序翻页是串行的：第 N 页返回前无法开始第 N+1 页。TimeShardedScanner 把时间范围
+切成 K 个互不重叠的窗口 [gte, lt)（filters 的 timestamp DSL，毫秒），各窗口并发翻页；窗口内记忆数超过
+split_threshold 时继续对半细分（自适应再平衡），最后按窗口顺序、窗口内按 timestamp 升序输出。
+大用户 / 大群组的全量导出因此随并发数扩展，而不是随页数线性增长。
+
+已开始但尚未输出的窗口（正在扫描的 + 已扫描完、等待前面窗口输出的）合计不超过 concurrency，内存因此有界；
+最前面的窗口特别慢时并行度会暂时下降。
+
+用法：
+    scanner = TimeShardedScanner(client.v1.memories.get, shards=8, concurrency=8)
+    async for episode in scanner.scan(filters={"user_id": "u1"}, memory_type="episodic_memory"):
+        ...
+    print(scanner.stats)
+"""
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from everos_kit.pagination import MAX_PAGE_SIZE, page_items
+
+# 带 timestamp、可按时间窗口扫描的类型（ProfileItem / AgentSkillItem 没有 timestamp）
+TIMESTAMP_TYPES = ("episodic_memory", "agent_case")
+
+
+@dataclass
+class ScanStats:
+    """扫描统计"""
+    windows: int = 0          # 完成扫描的窗口数
+    splits: int = 0           # 因过密而细分的次数
+    requests: int = 0         # memories.get 调用次数
+    items: int = 0            # 输出的记忆条数
+    elapsed: float = 0.0
+
+
+@dataclass
+class _Window:
+    gte: int
+    lt: int
+    task: Optional[asyncio.Task] = None
+    items: Optional[list] = None
+    children: list = field(default_factory=list)
+
+
+def timestamp_ms(item: Any) -> Optional[int]:
+    """记忆条目的 timestamp（datetime 或 ISO 8601 字符串）转为毫秒"""
+    value = item.get("timestamp") if isinstance(item, dict) else getattr(item, "timestamp", None)
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def _check_memory_type(memory_type: str) -> None:
+    if memory_type not in TIMESTAMP_TYPES:
+        raise ValueError(f"{memory_type} 没有 timestamp，无法按时间分片扫描（可用类型: {', '.join(TIMESTAMP_TYPES)}）；请用 aiter_memories 翻页")
+
+
+class TimeShardedScanner:
+    """
+    Scan a memories.get query by splitting its time range into concurrently paged windows
+
+    Args:
+        get: client.v1.memories.get（AsyncEverOS）
+        shards: 初始窗口数
+        concurrency: 已开始但尚未输出的窗口数上限（同时在途的请求不超过该值）
+        split_threshold: 窗口内 total_count 超过该值时细分
+        min_window_ms: 窗口短于该值时不再细分（同一毫秒内的大量记忆只能顺序翻页）
+        page_size: 每页条数（1 ~ 100）
+    """
+
+    def __init__(
+        self,
+        get: Callable[..., Awaitable[Any]],
+        shards: int = 8,
+        concurrency: int = 8,
+        split_threshold: int = 1000,
+        min_window_ms: int = 1000,
+        page_size: int = MAX_PAGE_SIZE,
+    ):
+        self.get = get
+        self.shards = max(1, shards)
+        self.concurrency = max(1, concurrency)
+        self.split_threshold = max(1, split_threshold)
+        self.min_window_ms = max(1, min_window_ms)
+        self.page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        self.stats = ScanStats()
+
+    async def _get(self, filters: dict, memory_type: str, page: int, page_size: int, rank_order: str = "asc") -> Any:
+        self.stats.requests += 1
+        return await self.get(
+            filters=filters,
+            memory_type=memory_type,
+            page=page,
+            page_size=page_size,
+            rank_by="timestamp",
+            rank_order=rank_order,
+        )
+
+    async def time_range(self, filters: dict, memory_type: str) -> Optional[tuple[int, int]]:
+        """查询最早与最晚一条记忆的 timestamp，返回 [gte, lt) 毫秒范围；没有记忆时返回 None"""
+        _check_memory_type(memory_type)
+        first, last = await asyncio.gather(
+            self._get(filters, memory_type, 1, 1, "asc"),
+            self._get(filters, memory_type, 1, 1, "desc"),
+        )
+        first_items, last_items = page_items(first, memory_type), page_items(last, memory_type)
+        if not first_items or not last_items:
+            return None
+        start, end = timestamp_ms(first_items[0]), timestamp_ms(last_items[0])
+        if start is None or end is None:
+            return None
+        return start, end + 1
+
+    async def _scan_window(self, window: _Window, filters: dict, memory_type: str) -> None:
+        scoped = {**filters, "timestamp": {"gte": window.gte, "lt": window.lt}}
+        response = await self._get(scoped, memory_type, 1, self.page_size)
+        data = getattr(response, "data", None)
+        total = getattr(data, "total_count", None)
+        span = window.lt - window.gte
+        if total is not None and total > self.split_threshold and span > self.min_window_ms:
+            parts = min(16, math.ceil(total / self.split_threshold), span // self.min_window_ms)
+            parts = max(2, parts)
+            bounds = [window.gte + span * i // parts for i in range(parts)] + [window.lt]
+            window.children = [_Window(gte=a, lt=b) for a, b in zip(bounds, bounds[1:]) if b > a]
+            self.stats.splits += 1
+            return
+        items = page_items(response, memory_type)
+        last = math.ceil(total / self.page_size) if total is not None else None
+        page = 1
+        while (page < last) if last is not None else (len(page_items(response, memory_type)) == self.page_size):
+            page += 1
+            response = await self._get(scoped, memory_type, page, self.page_size)
+            items.extend(page_items(response, memory_type))
+        window.items = items
+        self.stats.windows += 1
+
+    async def scan(
+        self,
+        *,
+        filters: dict,
+        memory_type: str = "episodic_memory",
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        按 timestamp 升序产出 [start_ms, end_ms) 内的全部记忆
+
+        Args:
+            filters: 范围条件（user_id / group_id 等）；不要包含 timestamp，由扫描器按窗口填写
+            memory_type: 同 memories.get
+            start_ms / end_ms: 时间范围（毫秒）；None 时查询最早 / 最晚一条记忆确定
+
+        Raises:
+            ValueError: memory_type 没有 timestamp（profile / agent_skill），无法按时间分片
+        """
+        _check_memory_type(memory_type)
+        started = time.monotonic()
+        self.stats = ScanStats()
+        if start_ms is None or end_ms is None:
+            bounds = await self.time_range(filters, memory_type)
+            if bounds is None:
+                return
+            start_ms = bounds[0] if start_ms is None else start_ms
+            end_ms = bounds[1] if end_ms is None else end_ms
+        span = end_ms - start_ms
+        if span <= 0:
+            return
+        shards = min(self.shards, span)
+        edges = [start_ms + span * i // shards for i in range(shards)] + [end_ms]
+        # 按时间顺序排列的待输出窗口；细分时原地替换为子窗口
+        windows = [_Window(gte=a, lt=b) for a, b in zip(edges, edges[1:]) if b > a]
+        try:
+            while windows:
+                # 已开始但尚未输出的窗口（含已扫描完、等待前面窗口的）不超过 concurrency，从而限制内存
+                started_count = sum(1 for w in windows if w.task is not None)
+                for window in windows:
+                    if started_count >= self.concurrency and window is not windows[0]:
+                        break
+                    if window.task is None:
+                        window.task = asyncio.create_task(self._scan_window(window, filters, memory_type))
+                        started_count += 1
+                running = [w.task for w in windows if w.task is not None and not w.task.done()]
+                if running:
+                    await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                expanded = []
+                for window in windows:
+                    if window.task is not None and window.task.done() and window.items is None:
+                        window.task.result()
+                        if window.children:
+                            expanded.extend(window.children)
+                            continue
+                    expanded.append(window)
+                windows = expanded
+                while windows and windows[0].items is not None:
+                    window = windows.pop(0)
+                    for item in window.items:
+                        self.stats.items += 1
+                        yield item
+        finally:
+            for window in windows:
+                if window.task is not None:
+                    window.task.cancel()
+            await asyncio.gather(*(w.task for w in windows if w.task is not None), return_exceptions=True)
+            self.stats.elapsed = time.monotonic() - started
@@ -0,0 +1,281 @@
+"""
+多路复用的异步任务状态监视器
+
+async_mode=True 的写入返回 task_id，需要轮询 tasks.retrieve() 才知道是否处理完成。
+成千上万个任务同时在途时，每个任务一个轮询协程会把查询接口打满；TaskWatcher 用一个调度协程
+统一管理全部待查任务：每个任务按带抖动的指数退避安排下次查询，全局查询速率不超过 max_polls_per_sec，
+同时在途的查询不超过 concurrency。404 表示任务已完成并过期清除（TTL 很短），视为完成。
+
+用法：
+    watcher = TaskWatcher(client.v1.tasks, max_polls_per_sec=20)
+    outcome = await watcher.watch(task_id)          # 单个任务的 awaitable
+    async for outcome in watcher.completions():     # 或按完成顺序逐个取出
+        print(outcome.task_id, outcome.status)
+    await watcher.close()
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Optional
+
+from everos import NotFoundError
+from everos_kit.limiter import retry_after_seconds
+from everos_kit.retry import TRANSIENT, classify_error
+
+SUCCESS = "success"
+FAILED = "failed"
+EXPIRED = "expired"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+# close() 放入 completions 队列，让等待中的 completions() 结束
+_CLOSED = object()
+
+
+@dataclass
+class TaskOutcome:
+    """任务的最终结果"""
+    task_id: str
+    status: str                               # success / failed / expired(404) / timeout / error
+    polls: int                                # 查询次数
+    elapsed: float                            # 从 watch() 到完成的秒数
+    data: Any = None                          # 最后一次 tasks.retrieve() 的 data
+    error: Optional[BaseException] = None     # status == "error" 时为不可重试的查询异常
+
+    @property
+    def done(self) -> bool:
+        """任务已处理成功（含 404 过期）"""
+        return self.status in (SUCCESS, EXPIRED)
+
+
+@dataclass
+class _Watch:
+    task_id: str
+    future: asyncio.Future
+    started: float
+    deadline: Optional[float]
+    polls: int = 0
+
+
+class TaskWatcher:
+    """
+    Poll many async_mode task ids through one scheduler with a global rate cap
+
+    Args:
+        tasks: client.v1.tasks（AsyncEverOS）
+        max_polls_per_sec: 全局查询速率上限
+        concurrency: 同时在途的查询数上限
+        initial_delay: watch() 后首次查询前的等待（秒）
+        max_delay: 单个任务两次查询的最大间隔（秒）
+        multiplier: 每次查询仍未完成时间隔乘以该系数
+        jitter: 间隔的随机扰动比例，实际间隔取 delay * uniform(1 - jitter, 1 + jitter)
+        timeout: 单个任务的最长等待（秒），超时以 status="timeout" 结束；None 表示不限
+        on_status: 每次观察到任务状态时回调 (task_id, status)：查询得到的 processing / success / failed，
+            以及 expired(404) / timeout / error；用于记录状态变迁时间（见 everos_kit.lifecycle）
+        completed_buffer: completions() 缓冲的结果数上限；没有消费者及时取走时丢弃最旧的结果，
+            长期运行且只用 watch() 的 future 时内存不随写入量增长（dropped 记录丢弃数）
+    """
+
+    def __init__(
+        self,
+        tasks: Any,
+        max_polls_per_sec: float = 20.0,
+        concurrency: int = 8,
+        initial_delay: float = 1.0,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.2,
+        timeout: Optional[float] = None,
+        on_status: Optional[Callable[[str, str], None]] = None,
+        completed_buffer: int = 1024,
+    ):
+        self.tasks = tasks
+        self.max_polls_per_sec = max_polls_per_sec
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.timeout = timeout
+        self.on_status = on_status
+        self.polls = 0
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._watches: dict[str, _Watch] = {}
+        self._schedule: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self.dropped = 0                          # 缓冲区满时丢弃的结果数（不含 close() 取消的任务）
+        self._completed: asyncio.Queue = asyncio.Queue(maxsize=max(1, completed_buffer))
+        self._in_flight: set[asyncio.Task] = set()
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+        self._scheduler: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """尚未完成的任务数"""
+        return len(self._watches)
+
+    def pending_ids(self) -> list[str]:
+        return list(self._watches)
+
+    def watch(self, task_id: str) -> "asyncio.Future[TaskOutcome]":
+        """登记 task_id 并立即返回，结果为 TaskOutcome 的 future；重复登记返回同一个 future"""
+        existing = self._watches.get(task_id)
+        if existing is not None:
+            return existing.future
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        watch = _Watch(
+            task_id=task_id,
+            future=loop.create_future(),
+            started=now,
+            deadline=now + self.timeout if self.timeout is not None else None,
+        )
+        self._watches[task_id] = watch
+        self._push(task_id, now + self._jittered(self.initial_delay))
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = asyncio.create_task(self._run())
+        return watch.future
+
+    async def wait(self, task_id: str) -> TaskOutcome:
+        return await self.watch(task_id)
+
+    async def completions(self) -> AsyncIterator[TaskOutcome]:
+        """
+        按完成顺序产出 TaskOutcome，直到没有待查任务或 close()；迭代期间可以继续 watch()。只应有一个消费者
+
+        开始迭代前完成的结果只保留最近 completed_buffer 个，丢弃的个数记在 self.dropped。
+        """
+        while self._watches or not self._completed.empty():
+            outcome = await self._completed.get()
+            if outcome is _CLOSED:
+                if self._watches:
+                    # close() 之后又 watch() 了新任务
+                    continue
+                return
+            yield outcome
+
+    async def close(self) -> list[str]:
+        """停止调度并取消在途查询，返回仍未完成的 task_id（其 future 被取消）"""
+        unfinished = list(self._watches)
+        for watch in self._watches.values():
+            watch.future.cancel()
+        self._watches.clear()
+        self._schedule.clear()
+        pending = list(self._in_flight)
+        if self._scheduler is not None:
+            pending.append(self._scheduler)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._scheduler = None
+        self._put(_CLOSED)
+        return unfinished
+
+    def _jittered(self, delay: float) -> float:
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _push(self, task_id: str, due: float) -> None:
+        heapq.heappush(self._schedule, (due, next(self._seq), task_id))
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while self._watches:
+            if not self._schedule:
+                # 全部任务都在查询中，等待查询结果重新排期
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            due, _, task_id = self._schedule[0]
+            now = time.monotonic()
+            ready = max(due, self._next_slot, self._paused_until)
+            if ready > now:
+                # 等到最早的任务到期；期间有更早的任务登记时提前醒来
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), ready - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._schedule)
+            watch = self._watches.get(task_id)
+            if watch is None:
+                continue
+            if watch.deadline is not None and now >= watch.deadline:
+                self._finish(watch, TIMEOUT)
+                continue
+            await self._semaphore.acquire()
+            self._next_slot = max(self._next_slot, time.monotonic()) + 1.0 / self.max_polls_per_sec
+            task = asyncio.create_task(self._poll(watch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _poll(self, watch: _Watch) -> None:
+        try:
+            watch.polls += 1
+            self.polls += 1
+            try:
+                response = await self.tasks.retrieve(watch.task_id)
+            except NotFoundError:
+                self._finish(watch, EXPIRED)
+                return
+            except Exception as e:
+                if classify_error(e) != TRANSIENT:
+                    self._finish(watch, ERROR, error=e)
+                    return
+                retry_after = retry_after_seconds(e)
+                if retry_after:
+                    # 429 Retry-After 对全部任务生效
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                self._reschedule(watch)
+                return
+            data = response.data
+            status = data.status if data else None
+            if self.on_status is not None:
+                self.on_status(watch.task_id, status or "unknown")
+            if status == SUCCESS:
+                self._finish(watch, SUCCESS, data=data)
+            elif status == FAILED:
+                self._finish(watch, FAILED, data=data)
+            else:
+                self._reschedule(watch)
+        finally:
+            self._semaphore.release()
+
+    def _reschedule(self, watch: _Watch) -> None:
+        if watch.task_id not in self._watches:
+            return
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** watch.polls)
+        due = time.monotonic() + self._jittered(delay)
+        if watch.deadline is not None:
+            due = min(due, watch.deadline)
+        self._push(watch.task_id, due)
+
+    def _finish(self, watch: _Watch, status: str, data: Any = None, error: Optional[BaseException] = None) -> None:
+        if self._watches.pop(watch.task_id, None) is None:
+            return
+        if self.on_status is not None and status in (EXPIRED, TIMEOUT, ERROR):
+            self.on_status(watch.task_id, status)
+        outcome = TaskOutcome(
+            task_id=watch.task_id,
+            status=status,
+            polls=watch.polls,
+            elapsed=time.monotonic() - watch.started,
+            data=data,
+            error=error,
+        )
+        if not watch.future.done():
+            watch.future.set_result(outcome)
+        self._put(outcome)
+        self._wakeup.set()
+
+    def _put(self, item: Any) -> None:
+        # 缓冲区满时丢弃最旧的结果并计数
+        if self._completed.full():
+            if self._completed.get_nowait() is not _CLOSED:
+                self.dropped += 1
+        self._completed.put_nowait(item)
@@ -0,0 +1,278 @@
+"""
+导出的 episodic memory 上的离线向量检索
+
+对冻结快照做批量评测时，每次 method="vector" 的 memories.search 都是一次网络往返加一次服务端 embedding。
+build_vector_index() 把导出的 episode（export_memories_async.py 的 JSONL、TimeShardedScanner 的输出等）
+用本地 embedder 编码，按批流式写入 float32 矩阵文件；LocalVectorIndex 以 numpy.memmap 打开该矩阵，
+对一批查询按块做矩阵乘法求余弦相似度，按 top_k / radius 截取，结果与 SearchEpisodeItem 同形（dict，带 score）。
+search() 的参数与返回值和 memories.search 相同，评测脚本可以在远程与本地检索之间直接切换。
+
+需要 numpy（pip install numpy）；embedder 是任意 Callable[[list[str]], 二维数组]，如 sentence-transformers
+的 model.encode。本地分数来自本地 embedder，与服务端 vector 方法的分数不可直接比较，radius 需要按本地模型重新标定。
+
+索引目录：
+    meta.json       维度、条数、编码字段
+    vectors.f32     按行归一化的 float32 矩阵（count × dim）
+    items.jsonl     与矩阵逐行对应的 episode（不含 score）
+
+用法：
+    build_vector_index("idx", read_jsonl("exports/user_id=u1/episodic_memory/*.jsonl"), model.encode)
+    index = LocalVectorIndex("idx", model.encode)
+    resp = await index.search(filters={"user_id": "u1"}, query="...", top_k=10)       # 同 memories.search
+    hits = index.query_batch(["q1", "q2", ...], top_k=10, radius=0.3)                  # 一次编码、一次矩阵乘法
+"""
+
+import glob
+import json
+import os
+from types import SimpleNamespace
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from everos_kit.pagination import item_to_dict
+from everos_kit.scan import timestamp_ms
+
+# memories.search 的 top_k 上限；top_k=-1 表示返回满足 radius 的全部结果（不超过该值）
+MAX_TOP_K = 100
+DEFAULT_TEXT_FIELDS = ("subject", "summary", "episode")
+
+_OPERATORS = {
+    "eq": lambda a, b: a == b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+}
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("everos_kit.vector_index 需要 numpy：pip install numpy") from e
+    return numpy
+
+
+def read_jsonl(pattern: str) -> Iterator[dict]:
+    """按文件名顺序逐行读取匹配 glob 的 JSONL 文件"""
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def episode_text(item: dict, fields: Iterable[str] = DEFAULT_TEXT_FIELDS) -> str:
+    return "\n".join(str(item[f]) for f in fields if item.get(f))
+
+
+def build_vector_index(
+    directory: str,
+    episodes: Iterable[Any],
+    embed: Callable[[list[str]], Any],
+    *,
+    text_fields: Iterable[str] = DEFAULT_TEXT_FIELDS,
+    batch_size: int = 256,
+) -> int:
+    """
+    Encode episodes with a local embedder and stream them into an on-disk index
+
+    Args:
+        directory: 索引目录（不存在时创建，已有索引被替换）
+        episodes: episode（dict 或 SDK 模型）的可迭代对象，按需读取
+        embed: 文本列表 → 二维数组（n × dim）
+        text_fields: 拼接后用于编码的字段；全部为空的 episode 跳过
+        batch_size: 每次调用 embed 的文本数
+
+    Returns:
+        写入的条数。内存占用只与 batch_size 有关；全部写完后才原子替换旧索引文件。
+    """
+    np = _numpy()
+    text_fields = tuple(text_fields)
+    os.makedirs(directory, exist_ok=True)
+    vectors_tmp = os.path.join(directory, "vectors.f32.tmp")
+    items_tmp = os.path.join(directory, "items.jsonl.tmp")
+    count = 0
+    dim: Optional[int] = None
+
+    with open(vectors_tmp, 'wb') as vectors, open(items_tmp, 'w', encoding='utf-8') as items:
+        def flush(batch: list[dict]) -> None:
+            nonlocal count, dim
+            if not batch:
+                return
+            matrix = np.asarray(embed([episode_text(item, text_fields) for item in batch]), dtype=np.float32)
+            if matrix.ndim != 2 or matrix.shape[0] != len(batch):
+                raise ValueError(f"embed 返回形状 {matrix.shape}，应为 ({len(batch)}, dim)")
+            if dim is None:
+                dim = matrix.shape[1]
+            elif matrix.shape[1] != dim:
+                raise ValueError(f"embed 返回维度 {matrix.shape[1]}，与之前的 {dim} 不一致")
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.where(norms == 0, 1, norms)
+            vectors.write(matrix.tobytes())
+            for item in batch:
+                items.write(json.dumps(item, ensure_ascii=False) + "\n")
+            count += len(batch)
+
+        batch: list[dict] = []
+        for episode in episodes:
+            item = item_to_dict(episode)
+            if not episode_text(item, text_fields):
+                continue
+            batch.append(item)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        flush(batch)
+
+    os.replace(vectors_tmp, os.path.join(directory, "vectors.f32"))
+    os.replace(items_tmp, os.path.join(directory, "items.jsonl"))
+    meta_tmp = os.path.join(directory, "meta.json.tmp")
+    with open(meta_tmp, 'w', encoding='utf-8') as f:
+        json.dump({"dim": dim or 0, "count": count, "text_fields": list(text_fields)}, f)
+    os.replace(meta_tmp, os.path.join(directory, "meta.json"))
+    return count
+
+
+def matches(item: dict, filters: Optional[dict]) -> bool:
+    """在单条记忆上求值 memories.search 的 filters DSL（隐式 eq、in、gt / gte / lt / lte、AND / OR；timestamp 为毫秒）"""
+    for key, value in (filters or {}).items():
+        if key == "AND":
+            if not all(matches(item, sub) for sub in value):
+                return False
+            continue
+        if key == "OR":
+            if not any(matches(item, sub) for sub in value):
+                return False
+            continue
+        actual = timestamp_ms(item) if key == "timestamp" else item.get(key)
+        conditions = value if isinstance(value, dict) else {"eq": value}
+        for op, operand in conditions.items():
+            if op == "in":
+                if actual not in operand:
+                    return False
+            elif op in _OPERATORS:
+                if not _OPERATORS[op](actual, operand):
+                    return False
+            else:
+                raise ValueError(f"不支持的过滤运算符: {op!r}")
+    return True
+
+
+class LocalVectorIndex:
+    """
+    Memory-mapped cosine top-k / radius retrieval over an index written by build_vector_index()
+
+    Args:
+        directory: 索引目录
+        embed: 查询编码器，必须与建索引时的 embedder 相同
+        block_rows: 每次矩阵乘法覆盖的索引行数；限制 (查询数 × block_rows) 的分数矩阵大小
+
+    episode 元数据常驻内存，向量矩阵按需由操作系统分页读入。
+    """
+
+    def __init__(self, directory: str, embed: Callable[[list[str]], Any], block_rows: int = 65536):
+        np = _numpy()
+        with open(os.path.join(directory, "meta.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.dim = meta["dim"]
+        self.count = meta["count"]
+        self.embed = embed
+        self.block_rows = max(1, block_rows)
+        if self.count:
+            self.vectors = np.memmap(os.path.join(directory, "vectors.f32"), dtype=np.float32, mode="r", shape=(self.count, self.dim))
+        else:
+            self.vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self.items = list(read_jsonl(os.path.join(directory, "items.jsonl")))
+        self._masks: dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _mask(self, filters: Optional[dict]) -> Optional[Any]:
+        if not filters:
+            return None
+        key = json.dumps(filters, sort_keys=True, ensure_ascii=False, default=str)
+        mask = self._masks.get(key)
+        if mask is None:
+            np = _numpy()
+            mask = np.fromiter((matches(item, filters) for item in self.items), dtype=bool, count=self.count)
+            if len(self._masks) >= 64:
+                self._masks.pop(next(iter(self._masks)))
+            self._masks[key] = mask
+        return mask
+
+    def query_vectors(self, queries: Any, *, top_k: int = -1, radius: Optional[float] = None, filters: Optional[dict] = None) -> list[list[tuple[int, float]]]:
+        """
+        对已编码的查询矩阵（m × dim）检索，返回每个查询的 [(行号, 余弦相似度)]，按相似度降序
+
+        top_k=-1 表示返回满足 radius 的全部结果（不超过 MAX_TOP_K），与 memories.search 一致。
+        """
+        np = _numpy()
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+        k = MAX_TOP_K if top_k is None or top_k < 0 else min(top_k, MAX_TOP_K)
+        m = queries.shape[0]
+        if k == 0 or not self.count:
+            return [[] for _ in range(m)]
+        mask = self._mask(filters)
+
+        best_scores = np.full((m, 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((m, 0), dtype=np.int64)
+        for start in range(0, self.count, self.block_rows):
+            block = self.vectors[start:start + self.block_rows]
+            scores = queries @ block.T                                   # (m, rows)
+            if mask is not None:
+                scores[:, ~mask[start:start + len(block)]] = -np.inf
+            if radius is not None:
+                scores[scores < radius] = -np.inf
+            take = min(k, scores.shape[1])
+            top = np.argpartition(-scores, take - 1, axis=1)[:, :take]
+            # 与之前各块的候选合并，只保留 k 个
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            best_rows = np.concatenate([best_rows, top + start], axis=1)
+            if best_scores.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        return [
+            [(int(row), float(score)) for row, score in zip(rows, scores) if score != -np.inf]
+            for rows, scores in zip(best_rows, best_scores)
+        ]
+
+    def query_batch(self, queries: list[str], *, top_k: int = -1, radius: Optional[float] = None, filters: Optional[dict] = None) -> list[list[dict]]:
+        """一次编码全部查询并批量检索，返回每个查询的 SearchEpisodeItem 同形结果"""
+        if not queries:
+            return []
+        hits = self.query_vectors(self.embed(list(queries)), top_k=top_k, radius=radius, filters=filters)
+        return [[{**self.items[row], "score": score, "atomic_facts": []} for row, score in result] for result in hits]
+
+    async def search(
+        self,
+        *,
+        query: str,
+        filters: Optional[dict] = None,
+        top_k: int = -1,
+        radius: Optional[float] = None,
+        **kwargs: Any,
+    ) -> SimpleNamespace:
+        """
+        与 client.v1.memories.search 同签名：返回 SearchMemoriesResponse 同形对象，只有 data.episodes 有结果
+
+        method / memory_types / include_original_data 等其余参数被忽略（本地始终是 vector 检索）。
+        """
+        episodes = self.query_batch([query], top_k=top_k, radius=radius, filters=filters)[0]
+        return SimpleNamespace(data=SimpleNamespace(
+            episodes=[SimpleNamespace(**episode) for episode in episodes],
+            profiles=[],
+            raw_messages=[],
+            agent_memory=SimpleNamespace(cases=[], skills=[]),
+            query=SimpleNamespace(text=query, method="vector", filters_applied=filters),
+            original_data=None,
+        ))
@@ -0,0 +1,54 @@
+"""
+内容哈希 message_id：文件开头插入一个块后重新导入，其余块都应被去重索引跳过
+
+运行: python -m pytest examples/tests
+"""
+
+import os
+import sys
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, EXAMPLES_DIR)
+sys.path.insert(0, os.path.join(EXAMPLES_DIR, "v1", "cases"))
+# batch_add_async 在导入时创建客户端，不发起请求
+os.environ.setdefault("EVEROS_API_KEY", "test")
+
+from batch_add_async import build_messages, read_file_chunks  # noqa: E402
+from everos_kit import DedupIndex  # noqa: E402
+
+CHUNK_SIZE = 100
+GROUP_ID = "group_test"
+
+
+def paragraph(text: str) -> str:
+    # 单句超过 CHUNK_SIZE，每段恰好切成一个块
+    return f"{text}：" + "内容" * 60 + "。"
+
+
+def message_ids(path: str) -> list[str]:
+    chunks = enumerate(read_file_chunks(str(path), CHUNK_SIZE), 1)
+    return [message["message_id"] for _, message in build_messages(chunks, GROUP_ID)]
+
+
+def test_insert_at_top_skips_every_other_chunk(tmp_path):
+    paragraphs = [paragraph(f"段落{i}") for i in range(5)] + [paragraph("重复段落")] * 3 + [paragraph("结尾")]
+    source = tmp_path / "corpus.txt"
+    source.write_text("\n".join(paragraphs), encoding="utf-8")
+
+    index = DedupIndex(str(tmp_path / ".everos-dedup.idx"))
+    try:
+        first = message_ids(source)
+        assert len(first) == len(paragraphs)
+        assert len(set(first)) == len(first), "重复出现的相同块应各自得到不同的 id"
+        index.add(first)
+
+        # 文件开头插入一个块，并改名
+        renamed = tmp_path / "renamed.txt"
+        renamed.write_text("\n".join([paragraph("新增段落")] + paragraphs), encoding="utf-8")
+        second = message_ids(renamed)
+
+        assert len(second) == len(paragraphs) + 1
+        assert [message_id in index for message_id in second] == [False] + [True] * len(paragraphs)
+        assert second[1:] == first
+    finally:
+        index.close()
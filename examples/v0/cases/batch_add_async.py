@@ -10,7 +10,9 @@ Only use SDK approach
 import os
 import re
 import sys
+import json
 import asyncio
+import hashlib
 from typing import Generator, Optional
 from datetime import datetime, timezone
 from evermemos import AsyncEverMemOS
@@ -50,7 +52,29 @@ def is_chapter_title(text: str) -> bool:
     return bool(re.match(pattern, text.strip()))
 
 
-def read_file_chunks(file_path: str, chunk_size: int = 1000) -> Generator[str, None, None]:
+def read_file_text(file_path: str, start_offset: int = 0) -> Optional[str]:
+    """
+    Read file content starting at a byte offset
+    
+    Args:
+        file_path: File path
+        start_offset: Byte offset to start from (must be on a UTF-8 character boundary)
+        
+    Returns:
+        Decoded text, or None if the file cannot be read
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            f.seek(start_offset)
+            return f.read().decode('utf-8')
+    except FileNotFoundError:
+        print(f"错误: 文件 '{file_path}' 不存在", file=sys.stderr)
+    except Exception as e:
+        print(f"错误: 读取文件时发生异常: {e}", file=sys.stderr)
+    return None
+
+
+def read_file_chunks(file_path: str, chunk_size: int = 1000, start_offset: int = 0) -> Generator[str, None, None]:
     """
     Read file and split by periods, output each time exceeding specified character count
     If encountering text starting with "Chapter xxx", output separately without merging with previous paragraph
@@ -58,20 +82,67 @@ def read_file_chunks(file_path: str, chunk_size: int = 1000) -> Generator[str, N
     Args:
         file_path: File path
         chunk_size: Minimum character count per chunk (default 1000)
+        start_offset: Byte offset to start reading from (default 0)
         
     Yields:
         Each text chunk (string)
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except FileNotFoundError:
-        print(f"错误: 文件 '{file_path}' 不存在", file=sys.stderr)
+    content = read_file_text(file_path, start_offset)
+    if content is None:
         return
-    except Exception as e:
-        print(f"错误: 读取文件时发生异常: {e}", file=sys.stderr)
+    yield from split_text_chunks(content, chunk_size)
+
+
+def read_file_chunks_with_offsets(
+    file_path: str, chunk_size: int = 1000, start_offset: int = 0
+) -> Generator[tuple[str, int, int], None, None]:
+    """
+    Like read_file_chunks(), but also yield each chunk's [start, end) byte range in the file
+    
+    Chunks are whitespace-normalized, so each non-whitespace character is aligned back to
+    the source text. Only whitespace and stray 。！？ are dropped between chunks, so the
+    alignment always moves forward. Re-chunking from a chunk's start offset yields the same
+    chunk sequence as the whole-file run from that chunk on, which makes resuming possible.
+    
+    Args:
+        file_path: File path
+        chunk_size: Minimum character count per chunk (default 1000)
+        start_offset: Byte offset to start reading from (default 0)
+        
+    Yields:
+        (chunk, start byte offset, end byte offset)
+    """
+    content = read_file_text(file_path, start_offset)
+    if content is None:
         return
+    anchor_char, anchor_byte = 0, start_offset
+    for chunk in split_text_chunks(content, chunk_size):
+        first = pos = anchor_char
+        for ch in chunk:
+            if ch.isspace():
+                continue
+            # Skip whitespace and dropped punctuation in the source
+            idx = content.index(ch, pos)
+            if pos == anchor_char:
+                first = idx
+            pos = idx + 1
+        start = anchor_byte + len(content[anchor_char:first].encode('utf-8'))
+        end = start + len(content[first:pos].encode('utf-8'))
+        anchor_char, anchor_byte = pos, end
+        yield chunk, start, end
+
+
+def split_text_chunks(content: str, chunk_size: int = 1000) -> Generator[str, None, None]:
+    """
+    Split text into chunks (see read_file_chunks)
     
+    Args:
+        content: Raw text
+        chunk_size: Minimum character count per chunk (default 1000)
+        
+    Yields:
+        Each text chunk (string)
+    """
     # Normalize text: compress empty lines and multiple spaces
     content = normalize_text(content)
     
@@ -196,7 +267,7 @@ async def add_memory_batch(
     group_name: Optional[str] = None,
     sender: Optional[str] = None,
     sender_name: Optional[str] = None,
-) -> bool:
+) -> Optional[dict]:
     """
     Add memory to memory library using SDK approach
     
@@ -209,7 +280,7 @@ async def add_memory_batch(
         sender_name: Sender name
         
     Returns:
-        True on success, False on failure
+        Server response (dict) on success, None on failure
     """
     try:
         # Generate message ID, including chunk number
@@ -228,10 +299,76 @@ async def add_memory_batch(
         )
         print(f"✓ 块 {chunk_count} 已成功添加到记忆库 (长度: {len(chunk)} 字符)")
         print(f"  add 参数: content_len={len(chunk)}, create_time={create_time!r}, message_id={message_id!r}, sender={sender_val!r}, sender_name={sender_name!r}, group_id={group_id!r}, group_name={group_name!r}")
-        return True
+        return response.to_dict()
     except Exception as e:
         print(f"✗ 块 {chunk_count} 添加到记忆库失败: {e}", file=sys.stderr)
-        return False
+        return None
+
+
+class CheckpointJournal:
+    """
+    Append-only on-disk journal of committed chunks
+    
+    The first line is a header (source file, chunk size, group). Every committed chunk then
+    appends one line: {"ordinal", "offset", "end_offset", "sha256", "response"}, where the
+    offsets are the chunk's byte range in the source file. Each append is flushed and fsynced;
+    a half-written last line left by a crash is ignored when the journal is loaded.
+    """
+    
+    def __init__(self, path: str, header: dict):
+        """
+        Open (or create) the journal and load the last committed record
+        
+        Args:
+            path: Journal file path
+            header: Run parameters; must match the header of an existing journal
+            
+        Raises:
+            ValueError: If the existing journal was written with different parameters
+        """
+        self.path = path
+        self.last: Optional[dict] = None
+        self.committed = 0
+        needs_newline = False
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    needs_newline = not line.endswith('\n')
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Half-written line from an interrupted run
+                        continue
+                    if record.get("type") == "header":
+                        if record["header"] != header:
+                            raise ValueError(f"断点日志 {path} 与本次参数不一致: {record['header']} != {header}")
+                        continue
+                    self.last = record
+                    self.committed += 1
+        self._file = open(path, 'a', encoding='utf-8')
+        if needs_newline:
+            self._file.write('\n')
+        if self._file.tell() == 0:
+            self._write({"type": "header", "header": header})
+    
+    @staticmethod
+    def content_hash(chunk: str) -> str:
+        """SHA-256 of the chunk text"""
+        return hashlib.sha256(chunk.encode('utf-8')).hexdigest()
+    
+    def append(self, record: dict) -> None:
+        """Durably append one committed chunk record"""
+        self._write(record)
+        self.last = record
+        self.committed += 1
+    
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def close(self) -> None:
+        self._file.close()
 
 
 async def main() -> None:
@@ -248,6 +385,7 @@ async def main() -> None:
         print("  EVERMEMOS_GROUP_NAME: 群组名称（默认: Project Discussion Group）", file=sys.stderr)
         print("  EVERMEMOS_SENDER: 发送者ID（默认: user_001）", file=sys.stderr)
         print("  EVERMEMOS_SENDER_NAME: 发送者名称（默认: User）", file=sys.stderr)
+        print("  EVERMEMOS_JOURNAL: 断点日志路径（默认: <文件路径>.journal.jsonl，off 表示不记录）", file=sys.stderr)
         sys.exit(1)
     
     file_path = sys.argv[1]
@@ -260,6 +398,20 @@ async def main() -> None:
     group_name = os.getenv("EVERMEMOS_GROUP_NAME", "Project Discussion Group")
     sender = os.getenv("EVERMEMOS_SENDER", "user_001")
     sender_name = os.getenv("EVERMEMOS_SENDER_NAME", "User")
+    journal_path = os.getenv("EVERMEMOS_JOURNAL", f"{file_path}.journal.jsonl")
+    
+    # Open the checkpoint journal; a previous run's last committed chunk is the resume point
+    journal = None
+    if journal_path != "off":
+        try:
+            journal = CheckpointJournal(
+                journal_path,
+                {"file": os.path.basename(file_path), "chunk_size": chunk_size, "group_id": group_id},
+            )
+        except ValueError as e:
+            print(f"错误: {e}（删除该日志或通过 EVERMEMOS_JOURNAL 指定新路径）", file=sys.stderr)
+            sys.exit(1)
+    resume = journal.last if journal else None
     
     print(f"读取文件: {file_path}")
     print(f"块大小: {chunk_size} 字符")
@@ -268,17 +420,31 @@ async def main() -> None:
     if max_blocks is not None:
         print(f"最多处理 {max_blocks} 个块")
     print(f"记忆库: 已配置 (方式: SDK, 群组: {group_id})")
+    if journal:
+        print(f"断点日志: {journal_path}")
+    if resume:
+        print(f"断点续传: 日志中已提交 {journal.committed} 个块，从第 {resume['ordinal'] + 1} 块（字节偏移 {resume['end_offset']}）继续")
     print("-" * 50)
     
-    chunk_count = 0
+    chunk_count = resume["ordinal"] - 1 if resume else 0
     total_chars = 0
     processed_count = 0
     success_count = 0
     failed_at_chunk = None
+    mismatch = False
     
-    for chunk in read_file_chunks(file_path, chunk_size):
+    start_offset = resume["offset"] if resume else 0
+    for chunk, offset, end_offset in read_file_chunks_with_offsets(file_path, chunk_size, start_offset):
         chunk_count += 1
         
+        # Re-chunking starts at the last committed chunk: verify it is unchanged, then skip it
+        if resume and chunk_count == resume["ordinal"]:
+            if CheckpointJournal.content_hash(chunk) != resume["sha256"]:
+                print(f"错误: 第 {chunk_count} 块内容与断点日志不一致，源文件可能已修改", file=sys.stderr)
+                mismatch = True
+                break
+            continue
+        
         # Skip previous chunks
         if chunk_count < start_from:
             continue
@@ -296,7 +462,7 @@ async def main() -> None:
         print("-" * 50)
         
         # Call SDK to add memory
-        success = await add_memory_batch(
+        response = await add_memory_batch(
             chunk=chunk,
             chunk_count=chunk_count,
             group_id=group_id,
@@ -305,14 +471,25 @@ async def main() -> None:
             sender_name=sender_name,
         )
         
-        if success:
+        if response is not None:
             success_count += 1
+            if journal:
+                journal.append({
+                    "ordinal": chunk_count,
+                    "offset": offset,
+                    "end_offset": end_offset,
+                    "sha256": CheckpointJournal.content_hash(chunk),
+                    "response": response,
+                })
         else:
             # On failure, record progress and stop
             failed_at_chunk = chunk_count
             print(f"\n❌ 处理失败，已停止。成功处理 {success_count} 个块，失败于第 {failed_at_chunk} 个块", file=sys.stderr)
             break
     
+    if journal:
+        journal.close()
+    
     # Output statistics
     print("\n" + "=" * 50)
     if start_from > 1 and chunk_count > 0:
@@ -320,13 +497,17 @@ async def main() -> None:
         print(f"已跳过前 {skipped_count} 个块")
     if max_blocks is not None and processed_count >= max_blocks:
         print(f"已达到最大处理块数限制 ({max_blocks} 个块)")
-    if failed_at_chunk:
+    if mismatch:
+        print(f"❌ 第 {resume['ordinal']} 块内容与断点日志不一致，未继续处理（确认源文件后删除断点日志重新导入）")
+    elif failed_at_chunk:
         print(f"❌ 处理失败于第 {failed_at_chunk} 个块")
         print(f"成功处理: {success_count} 个块")
     else:
         print(f"✓ 所有块已成功添加到记忆库 ({success_count} 个)")
     if chunk_count > 0:
         print(f"总计: 共 {chunk_count} 个块, 处理 {processed_count} 个块, 处理内容共 {total_chars} 个字符")
+    if mismatch or failed_at_chunk:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -11,173 +11,461 @@ Migration notes from v0:
 """
 
 import os
-import re
 import sys
+import json
+import math
+import hashlib
 import asyncio
 import time
-from typing import Generator, Optional
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Generator, Iterable, Iterator, Optional, Union
 from everos import AsyncEverOS
+from text_chunker import iter_chunks
 
-client = AsyncEverOS()
-group_mem = client.v1.memories.group
-
-
-def normalize_text(text: str) -> str:
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
-    return text
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from everos_kit import FATAL, AdaptiveLimiter, ContentIds, DedupIndex, RetryPolicy, TaskLifecycleRecorder, TaskWatcher, classify_error, describe_error
 
+# 关闭 SDK 内置重试：429 / Retry-After / 5xx 直接反馈给 AdaptiveLimiter（EVEROS_ADAPTIVE），重试统一由 RetryPolicy 负责
+client = AsyncEverOS(max_retries=0)
+group_mem = client.v1.memories.group
+tasks = client.v1.tasks
 
-def is_chapter_title(text: str) -> bool:
-    pattern = r'^第[一二三四五六七八九十百千万\d]+章'
-    return bool(re.match(pattern, text.strip()))
 
+def read_file_chunks_with_offsets(
+    file_path: str, chunk_size: int = 1000, start_offset: int = 0
+) -> Generator[tuple[str, int, int], None, None]:
+    """
+    Stream (chunk, start, end) from a file with bounded memory
 
-def read_file_chunks(file_path: str, chunk_size: int = 1000) -> Generator[str, None, None]:
+    内存占用与文件大小无关，只与块大小和最长单句有关。从某个块的 start 偏移重新切块，
+    得到的块序列与整文件切块时该块及其之后的部分一致，可用于断点续传。
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        yield from iter_chunks(file_path, chunk_size, start_offset)
     except FileNotFoundError:
         print(f"错误: 文件 '{file_path}' 不存在", file=sys.stderr)
-        return
     except Exception as e:
         print(f"错误: 读取文件时发生异常: {e}", file=sys.stderr)
-        return
 
-    content = normalize_text(content)
 
-    chapter_pattern = r'(第[一二三四五六七八九十百千万\d]+章)'
-    marked_content = re.sub(chapter_pattern, r'|||CHAPTER_TITLE|||\1', content)
-    segments = marked_content.split('|||CHAPTER_TITLE|||')
+def read_file_chunks(file_path: str, chunk_size: int = 1000, start_offset: int = 0) -> Generator[str, None, None]:
+    for chunk, _, _ in read_file_chunks_with_offsets(file_path, chunk_size, start_offset):
+        yield chunk
 
-    current_chunk = ""
 
-    for idx, segment in enumerate(segments):
-        if not segment.strip():
-            continue
+GROUP_ADD_MAX_MESSAGES = 500  # GroupAddRequest.messages: maxItems
 
-        segment_stripped = segment.strip()
 
-        if idx == 0:
-            parts = re.split(r'([。！？])', segment)
-        else:
-            if is_chapter_title(segment_stripped):
-                if current_chunk.strip():
-                    yield current_chunk.strip()
-                    current_chunk = ""
-                match = re.match(r'(第[一二三四五六七八九十百千万\d]+章)', segment_stripped)
-                if match:
-                    chapter_title = match.group(1)
-                    current_chunk = chapter_title
-                    remaining = segment_stripped[len(chapter_title):].strip()
-                    if remaining:
-                        if not current_chunk.endswith(' '):
-                            current_chunk += ' '
-                        segment = remaining
-                        parts = re.split(r'([。！？])', segment)
-                    else:
-                        continue
-                else:
-                    parts = re.split(r'([。！？])', segment)
-            else:
-                parts = re.split(r'([。！？])', segment)
+def build_messages(
+    chunks: Iterable[tuple[int, str]],
+    group_id: str,
+    sender: Optional[str] = None,
+    sender_name: Optional[str] = None,
+    ids: Optional[ContentIds] = None,
+) -> Iterator[tuple[int, dict]]:
+    """
+    Turn (chunk number, text) pairs into v1 group message items
 
-        i = 0
-        while i < len(parts):
-            part = parts[i].strip()
-            if not part:
-                i += 1
-                continue
+    timestamp 按块号顺序单调递增（同一毫秒内依次 +1），打包或并发发送时
+    消息先后顺序仍与原文一致；message_id 由 (group_id, 内容哈希, 该内容此前出现的次数) 得到，
+    与块号、文件名无关，文件中插入或删除块后重新导入时其余块仍被去重索引跳过；
+    文件中重复出现的相同块各自得到不同的 id（见 everos_kit.dedup.ContentIds）。
 
-            if part in ['。', '！', '？']:
-                if current_chunk:
-                    current_chunk += part
-                    if len(current_chunk) >= chunk_size:
-                        yield current_chunk.strip()
-                        current_chunk = ""
-                i += 1
-                continue
+    ids: 跨多次调用共享的 id 分配器（如按窗口分批构造同一文件的消息时）；None 时新建。
+    调用方跳过的块须先经 ids.next() 计数。
+    """
+    sender_id = sender or "user_001"
+    ids = ids if ids is not None else ContentIds(group_id)
+    last_timestamp = 0
+    for chunk_count, chunk in chunks:
+        timestamp = max(int(time.time() * 1000), last_timestamp + 1)
+        last_timestamp = timestamp
+        yield chunk_count, {
+            "role": "user",
+            "sender_id": sender_id,
+            "sender_name": sender_name,
+            "timestamp": timestamp,
+            "content": chunk,
+            "message_id": ids.next(chunk),
+        }
+
+
+def pack_messages(
+    messages: Iterable[tuple[int, dict]],
+    max_bytes: int = 0,
+    max_messages: int = 1,
+) -> Iterator[list[tuple[int, dict]]]:
+    """
+    Pack consecutive messages into one group.add() request under a byte / count budget
 
-            test_chunk = current_chunk + part if current_chunk else part
+    Args:
+        messages: (块号, message) 迭代器
+        max_bytes: 单次请求 messages 数组的 JSON 字节上限（0 表示不限）
+        max_messages: 单次请求的消息条数上限（1 即不打包，上限 500）
 
-            if len(part) >= chunk_size:
-                if current_chunk.strip():
-                    yield current_chunk.strip()
-                    current_chunk = ""
-                yield part
-                i += 1
-                continue
+    Yields:
+        每个请求的 [(块号, message), ...]；单条超过 max_bytes 的消息独占一个请求
+    """
+    max_messages = min(max(1, max_messages), GROUP_ADD_MAX_MESSAGES)
+    batch: list[tuple[int, dict]] = []
+    batch_bytes = 0
+    for chunk_count, message in messages:
+        size = len(json.dumps(message, ensure_ascii=False).encode("utf-8")) + 1 if max_bytes else 0
+        if batch and (len(batch) >= max_messages or batch_bytes + size > max_bytes > 0):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append((chunk_count, message))
+        batch_bytes += size
+    if batch:
+        yield batch
 
-            if len(test_chunk) >= chunk_size:
-                if i + 1 < len(parts) and parts[i + 1] in ['。', '！', '？']:
-                    test_chunk += parts[i + 1]
-                    yield test_chunk.strip()
-                    current_chunk = ""
-                    i += 2
-                else:
-                    if current_chunk.strip():
-                        yield current_chunk.strip()
-                    current_chunk = part
-                    i += 1
-            else:
-                current_chunk = test_chunk
-                if i + 1 < len(parts) and parts[i + 1] in ['。', '！', '？']:
-                    current_chunk += parts[i + 1]
-                    i += 2
-                else:
-                    i += 1
 
-    if current_chunk.strip():
-        yield current_chunk.strip()
+def batch_label(batch: list[tuple[int, dict]]) -> str:
+    first, last = batch[0][0], batch[-1][0]
+    return str(first) if first == last else f"{first}-{last}"
 
 
 async def add_memory_batch(
-    chunk: str,
-    chunk_count: int,
+    batch: list[tuple[int, dict]],
     group_id: str,
     group_name: Optional[str] = None,
-    sender: Optional[str] = None,
-    sender_name: Optional[str] = None,
-) -> bool:
+    limiter: Optional[AdaptiveLimiter] = None,
+    retry: Optional[RetryPolicy] = None,
+    dead_letter: Optional["DeadLetterQueue"] = None,
+    async_mode: Optional[bool] = None,
+) -> Optional[dict]:
     """
-    Add memory to memory library using v1 group.add()
+    Add one or more consecutive chunks to memory library with a single v1 group.add()
 
     Args:
-        chunk: Text chunk content
-        chunk_count: Chunk number
+        batch: [(块号, message), ...]，message 由 build_messages() 生成
         group_id: Group ID
         group_name: Group name (used in group_meta)
-        sender: Sender ID (sender_id in v1 message)
-        sender_name: Sender name (optional)
+        limiter: 自适应并发控制器（None 表示不限制，由调用方控制并发）
+        retry: 重试策略，超时 / 429 / 5xx 按带抖动的指数退避重试（None 表示不重试）
+        dead_letter: 死信队列；permanent 错误或重试用尽时写入死信，不中止任务（401/403 除外）
+        async_mode: True 时服务端受理后立即返回 202 + task_id（None 表示使用服务端默认值）
 
     Returns:
-        True on success, False on failure
+        Server response (dict) on success, {"dead_letter": path} when dead-lettered, None on failure
     """
+    label = batch_label(batch)
+    messages = [message for _, message in batch]
+
+    def on_retry(attempt: int, error: BaseException, delay: float) -> None:
+        print(f"↻ 块 {label} 第 {attempt} 次失败 ({type(error).__name__}: {error})，{delay:.1f}s 后重试", file=sys.stderr)
+
     try:
-        message_id = f"chunk_{chunk_count}_{int(time.time() * 1000)}"
-        timestamp = int(time.time() * 1000)
-        sender_id = sender or "user_001"
+        add = limiter.wrap(group_mem.add) if limiter else group_mem.add
+        kwargs = {
+            "group_id": group_id,
+            "group_meta": {"name": group_name or group_id},
+            "messages": messages,
+        }
+        if async_mode is not None:
+            kwargs["async_mode"] = async_mode
+        response = await retry.call(add, on_retry=on_retry, **kwargs) if retry else await add(**kwargs)
+        content_len = sum(len(m["content"]) for m in messages)
+        print(f"✓ 块 {label} 已成功添加到记忆库 ({len(messages)} 条消息, 长度: {content_len} 字符)")
+        for m in messages:
+            print(f"  add 参数: content_len={len(m['content'])}, timestamp={m['timestamp']}, message_id={m['message_id']!r}, sender_id={m['sender_id']!r}, sender_name={m['sender_name']!r}, group_id={group_id!r}")
+        return response.to_dict()
+    except Exception as e:
+        print(f"✗ 块 {label} 添加到记忆库失败: {e}", file=sys.stderr)
+        if dead_letter is not None and classify_error(e) != FATAL:
+            dead_letter.append(group_id, group_name, batch, e)
+            print(f"  已写入死信队列: {dead_letter.path}", file=sys.stderr)
+            return {"dead_letter": dead_letter.path}
+        return None
 
-        response = await group_mem.add(
-            group_id=group_id,
-            group_meta={"name": group_name or group_id},
-            messages=[
-                {
-                    "role": "user",
-                    "sender_id": sender_id,
-                    "sender_name": sender_name,
-                    "timestamp": timestamp,
-                    "content": chunk,
-                    "message_id": message_id,
-                }
-            ],
+
+class CheckpointJournal:
+    """
+    Append-only on-disk journal of committed chunks
+
+    第一行为 header（源文件、块大小、群组），之后每个已提交的块一行：
+    {"ordinal", "offset", "end_offset", "sha256", "response"}，offset 为块在源文件中的字节范围。
+    每次提交后 flush + fsync；进程崩溃时写了一半的末行在读取时被忽略。
+    """
+
+    def __init__(self, path: str, header: dict):
+        self.path = path
+        self.last: Optional[dict] = None
+        self.committed = 0
+        needs_newline = False
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    needs_newline = not line.endswith('\n')
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record.get("type") == "header":
+                        if record["header"] != header:
+                            raise ValueError(f"断点日志 {path} 与本次参数不一致: {record['header']} != {header}")
+                        continue
+                    self.last = record
+                    self.committed += 1
+        self._file = open(path, 'a', encoding='utf-8')
+        if needs_newline:
+            self._file.write('\n')
+        if self._file.tell() == 0:
+            self._write([{"type": "header", "header": header}])
+
+    @staticmethod
+    def content_hash(chunk: str) -> str:
+        return hashlib.sha256(chunk.encode('utf-8')).hexdigest()
+
+    def append(self, records: list[dict]) -> None:
+        self._write(records)
+        self.last = records[-1]
+        self.committed += len(records)
+
+    def _write(self, records: list[dict]) -> None:
+        for record in records:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class DeadLetterQueue:
+    """
+    Append-only JSONL of requests that failed permanently or exhausted their retries
+
+    每行一个请求：{"group_id", "group_name", "ordinals", "messages", "error", "failed_at"}，
+    messages 原样保留（含 message_id / timestamp），可修正后用 replay_dead_letter_async.py 重放。
+    文件在第一次写入时才创建。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._file = None
+
+    def append(self, group_id: str, group_name: Optional[str], batch: list[tuple[int, dict]], error: BaseException) -> None:
+        self.write({
+            "group_id": group_id,
+            "group_name": group_name,
+            "ordinals": [ordinal for ordinal, _ in batch],
+            "messages": [message for _, message in batch],
+            "error": describe_error(error),
+            "failed_at": datetime.now(timezone.utc).isoformat(),
+        })
+
+    def write(self, record: dict) -> None:
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.count += len(record["messages"])
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+class TaskReconciler:
+    """
+    Background reconciliation of async_mode task ids via everos_kit.TaskWatcher
+
+    track() 登记 task_id 后立即返回，不阻塞提交；全部任务由同一个 TaskWatcher 调度查询：
+    首次查询在 poll_interval 后，之后按带抖动的指数退避拉长间隔，全局不超过 max_polls_per_sec 次/秒、
+    查询并发不超过 concurrency。success 或 404（任务已完成并过期清除，与 02_add_async.py 的
+    wait_for_task() 规则一致）视为完成，failed 记入 failed。
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        poll_interval: float = 2.0,
+        max_polls_per_sec: float = 20.0,
+        recorder: Optional[TaskLifecycleRecorder] = None,
+    ):
+        self.recorder = recorder
+        self.succeeded = 0
+        self.expired = 0
+        self.failed: list[tuple[str, list[tuple[int, dict]]]] = []
+        self.watcher = TaskWatcher(
+            tasks,
+            max_polls_per_sec=max_polls_per_sec,
+            concurrency=concurrency,
+            initial_delay=poll_interval,
+            on_status=recorder.observe if recorder else None,
         )
-        print(f"✓ 块 {chunk_count} 已成功添加到记忆库 (长度: {len(chunk)} 字符)")
-        print(f"  add 参数: content_len={len(chunk)}, timestamp={timestamp}, message_id={message_id!r}, sender_id={sender_id!r}, sender_name={sender_name!r}, group_id={group_id!r}")
-        return True
-    except Exception as e:
-        print(f"✗ 块 {chunk_count} 添加到记忆库失败: {e}", file=sys.stderr)
-        return False
+        self._batches: dict[str, list[tuple[int, dict]]] = {}
+
+    def track(self, task_id: str, batch: list[tuple[int, dict]], submitted: Optional[float] = None) -> None:
+        if self.recorder:
+            self.recorder.accepted(task_id, "group", submitted)
+        self._batches[task_id] = batch
+        self.watcher.watch(task_id).add_done_callback(self._settle)
+
+    def _settle(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            return
+        outcome = future.result()
+        batch = self._batches.pop(outcome.task_id)
+        if outcome.status == "success":
+            self.succeeded += 1
+        elif outcome.status == "expired":
+            self.expired += 1
+        else:
+            reason = f"状态查询失败: {outcome.error}" if outcome.error else "处理失败"
+            print(f"✗ 任务 {outcome.task_id} (块 {batch_label(batch)}) {reason}", file=sys.stderr)
+            self.failed.append((outcome.task_id, batch))
+
+    @property
+    def pending(self) -> int:
+        return self.watcher.pending
+
+    async def drain(self, timeout: Optional[float] = None) -> list[str]:
+        """等待全部任务对账完成；超时则停止轮询，返回仍未完成的 task_id"""
+        try:
+            await asyncio.wait_for(self._drained(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return await self.watcher.close()
+
+    async def _drained(self) -> None:
+        async for _ in self.watcher.completions():
+            pass
+
+
+@dataclass
+class IngestStats:
+    """并发导入统计（按块号顺序提交）"""
+    committed: int = 0
+    dead_lettered: int = 0
+    accepted_after_stop: int = 0      # 提交停止后返回、但已被服务端受理的块（不计入有序提交）
+    requests: int = 0
+    failed_at_chunk: Optional[int] = None
+    latencies: list[float] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def chunks_per_sec(self) -> float:
+        return self.committed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def percentile(self, p: float) -> float:
+        """请求延迟的 p 分位数（秒，nearest-rank）"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(p / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+async def _aiter(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+async def ingest_batches(
+    batches: Union[Iterable[list[tuple[int, dict]]], AsyncIterator[list[tuple[int, dict]]]],
+    send: Callable[[list[tuple[int, dict]]], Awaitable[Optional[dict]]],
+    concurrency: int = 1,
+    on_commit: Optional[Callable[[list[tuple[int, dict]], dict], None]] = None,
+    on_accepted: Optional[Callable[[list[tuple[int, dict]], dict], None]] = None,
+) -> IngestStats:
+    """
+    Producer/consumer ingestion with an ordered commit window
+
+    每个 batch（一次 group.add 请求，见 pack_messages()）依次进入有界队列，
+    由 concurrency 个 worker 并发调用 send()。
+    结果严格按块号顺序提交：遇到第一个失败请求即停止派发，其后已返回的结果不计入提交，
+    失败位置记为该请求的首个块号，因此 "从第 K 块开始" 的续传语义与串行模式一致。
+    停止前已发出、之后才成功返回的请求已被服务端受理，交给 on_accepted（如记入去重索引，续传时跳过），
+    不进入有序提交。
+    send() 返回 {"dead_letter": ...} 表示该请求已写入死信队列，按已处理提交并继续。
+    在途 + 待提交的请求数不超过 concurrency * 2。
+
+    Args:
+        batches: [(块号, message), ...] 的迭代器或异步迭代器
+        send: 发送一个 batch 的协程函数，成功返回服务端响应，失败返回 None
+        concurrency: 并发 worker 数
+        on_commit: 每个 batch 按顺序提交时的回调 (batch, 服务端响应)
+        on_accepted: 提交停止后仍成功返回的 batch 的回调 (batch, 服务端响应)
+
+    Returns:
+        IngestStats
+    """
+    concurrency = max(1, concurrency)
+    loop = asyncio.get_running_loop()
+    work: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    commits: asyncio.Queue = asyncio.Queue()
+    window = asyncio.Semaphore(concurrency * 2)
+    stop = asyncio.Event()
+    stats = IngestStats()
+
+    async def produce() -> None:
+        items = batches if hasattr(batches, "__aiter__") else _aiter(batches)
+        try:
+            async for batch in items:
+                await window.acquire()
+                if stop.is_set():
+                    window.release()
+                    break
+                result = loop.create_future()
+                await commits.put((batch, result))
+                await work.put((batch, result))
+        finally:
+            # 提前停止时关闭异步迭代器（释放其预取的资源）；迭代器抛出异常时也让 worker 与提交协程退出
+            await items.aclose()
+            await commits.put(None)
+            for _ in range(concurrency):
+                await work.put(None)
+
+    async def consume() -> None:
+        while (item := await work.get()) is not None:
+            batch, result = item
+            if stop.is_set():
+                result.set_result(None)
+                continue
+            started = time.perf_counter()
+            try:
+                response = await send(batch)
+            except Exception as e:
+                print(f"✗ 块 {batch_label(batch)} 发送异常: {e}", file=sys.stderr)
+                response = None
+            stats.requests += 1
+            stats.latencies.append(time.perf_counter() - started)
+            result.set_result(response)
+
+    async def commit() -> None:
+        while (item := await commits.get()) is not None:
+            batch, result = item
+            response = await result
+            window.release()
+            if stop.is_set():
+                if response is not None:
+                    if "dead_letter" in response:
+                        stats.dead_lettered += len(batch)
+                    else:
+                        stats.accepted_after_stop += len(batch)
+                    if on_accepted is not None:
+                        on_accepted(batch, response)
+                continue
+            if response is not None:
+                if "dead_letter" in response:
+                    stats.dead_lettered += len(batch)
+                else:
+                    stats.committed += len(batch)
+                if on_commit is not None:
+                    on_commit(batch, response)
+            else:
+                stats.failed_at_chunk = batch[0][0]
+                stop.set()
+
+    started = time.perf_counter()
+    await asyncio.gather(produce(), commit(), *(consume() for _ in range(concurrency)))
+    stats.elapsed = time.perf_counter() - started
+    return stats
 
 
 async def main() -> None:
@@ -186,6 +474,10 @@ async def main() -> None:
         print("示例: python batch_add_async.py input.txt 1000", file=sys.stderr)
         print("示例: python batch_add_async.py input.txt 1000 5  # 从第5块开始", file=sys.stderr)
         print("示例: python batch_add_async.py input.txt 1000 1 10  # 从第1块开始，处理10个块", file=sys.stderr)
+        print("示例: EVEROS_CONCURRENCY=8 python batch_add_async.py input.txt 1000  # 8 路并发", file=sys.stderr)
+        print("示例: EVEROS_ADAPTIVE=1 python batch_add_async.py input.txt 1000  # 自适应并发（AIMD）", file=sys.stderr)
+        print("示例: EVEROS_PACK_BYTES=262144 python batch_add_async.py input.txt 1000  # 每次请求打包至多 256KB 的块", file=sys.stderr)
+        print("示例: EVEROS_ASYNC_MODE=1 EVEROS_CONCURRENCY=16 python batch_add_async.py input.txt 1000  # 只等受理，后台对账 task_id", file=sys.stderr)
         print("\n环境变量配置（可选，已有默认值）:", file=sys.stderr)
         print("  EVEROS_API_KEY: API密钥（必需）", file=sys.stderr)
         print("  EVER_OS_BASE_URL: API地址（可选）", file=sys.stderr)
@@ -193,6 +485,21 @@ async def main() -> None:
         print("  EVEROS_GROUP_NAME: 群组名称（默认: Project Discussion Group）", file=sys.stderr)
         print("  EVEROS_SENDER: 发送者ID（默认: user_001）", file=sys.stderr)
         print("  EVEROS_SENDER_NAME: 发送者名称（默认: User）", file=sys.stderr)
+        print("  EVEROS_CONCURRENCY: 并发请求数（默认: 1，即串行；自适应模式下为窗口上限，默认 32）", file=sys.stderr)
+        print("  EVEROS_ADAPTIVE: 1 表示按 429/超时/5xx/延迟自动调节并发（默认: 关闭）", file=sys.stderr)
+        print("  EVEROS_LATENCY_TARGET: 自适应模式下的请求耗时目标（秒），超过视为拥塞（默认: 不限）", file=sys.stderr)
+        print("  EVEROS_PACK_BYTES: 每次请求 messages 的字节上限（默认: 0，不限）", file=sys.stderr)
+        print("  EVEROS_PACK_MESSAGES: 每次请求的消息条数上限（默认: 1，设置 EVEROS_PACK_BYTES 时为 500）", file=sys.stderr)
+        print("  EVEROS_JOURNAL: 断点日志路径（默认: <文件路径>.journal.jsonl，off 表示不记录）", file=sys.stderr)
+        print("  EVEROS_MAX_ATTEMPTS: 超时 / 429 / 5xx 的最大尝试次数（默认: 5，1 表示不重试）", file=sys.stderr)
+        print("  EVEROS_DEAD_LETTER: 死信文件路径（默认: <文件路径>.deadletter.jsonl，off 表示遇到失败即停止）", file=sys.stderr)
+        print("  EVEROS_DEDUP_INDEX: 去重索引路径，跳过已受理的块（默认: 文件所在目录/.everos-dedup.idx，off 表示不使用）", file=sys.stderr)
+        print("  EVEROS_ASYNC_MODE: 1 表示以 async_mode=True 提交，记录 task_id 并在后台对账（默认: 关闭）", file=sys.stderr)
+        print("  EVEROS_TASK_POLL_INTERVAL: 对账时每个任务的首次轮询间隔（秒，之后指数退避，默认: 2）", file=sys.stderr)
+        print("  EVEROS_TASK_POLL_RATE: 对账时 tasks.retrieve 的全局速率上限（次/秒，默认: 20）", file=sys.stderr)
+        print("  EVEROS_RECONCILE_CONCURRENCY: 对账时 tasks.retrieve 的并发数（默认: 4）", file=sys.stderr)
+        print("  EVEROS_TASK_TRACE: 每个任务受理 → 完成的生命周期写入该 JSONL 文件（默认: 不写，延迟直方图总会打印）", file=sys.stderr)
+        print("  EVEROS_RECONCILE_TIMEOUT: 提交完成后等待对账的最长时间（秒，默认: 600）", file=sys.stderr)
         sys.exit(1)
 
     file_path = sys.argv[1]
@@ -204,6 +511,46 @@ async def main() -> None:
     group_name = os.getenv("EVEROS_GROUP_NAME", "Project Discussion Group")
     sender = os.getenv("EVEROS_SENDER", "user_001")
     sender_name = os.getenv("EVEROS_SENDER_NAME", "User")
+    adaptive = os.getenv("EVEROS_ADAPTIVE", "") not in ("", "0", "off")
+    concurrency = int(os.getenv("EVEROS_CONCURRENCY", "32" if adaptive else "1"))
+    latency_target = os.getenv("EVEROS_LATENCY_TARGET")
+    limiter = None
+    if adaptive:
+        limiter = AdaptiveLimiter(
+            initial=min(4, concurrency),
+            max_limit=concurrency,
+            latency_target=float(latency_target) if latency_target else None,
+        )
+    pack_bytes = int(os.getenv("EVEROS_PACK_BYTES", "0"))
+    pack_messages_max = int(os.getenv("EVEROS_PACK_MESSAGES", str(GROUP_ADD_MAX_MESSAGES if pack_bytes else 1)))
+    journal_path = os.getenv("EVEROS_JOURNAL", f"{file_path}.journal.jsonl")
+    retry = RetryPolicy(max_attempts=int(os.getenv("EVEROS_MAX_ATTEMPTS", "5")))
+    dead_letter_path = os.getenv("EVEROS_DEAD_LETTER", f"{file_path}.deadletter.jsonl")
+    dead_letter = DeadLetterQueue(dead_letter_path) if dead_letter_path != "off" else None
+    dedup_path = os.getenv("EVEROS_DEDUP_INDEX", os.path.join(os.path.dirname(os.path.abspath(file_path)), ".everos-dedup.idx"))
+    dedup = DedupIndex(dedup_path) if dedup_path != "off" else None
+    fire_and_reconcile = os.getenv("EVEROS_ASYNC_MODE", "") not in ("", "0", "off")
+    reconcile_timeout = float(os.getenv("EVEROS_RECONCILE_TIMEOUT", "600"))
+    reconciler = None
+    if fire_and_reconcile:
+        reconciler = TaskReconciler(
+            concurrency=int(os.getenv("EVEROS_RECONCILE_CONCURRENCY", "4")),
+            poll_interval=float(os.getenv("EVEROS_TASK_POLL_INTERVAL", "2")),
+            max_polls_per_sec=float(os.getenv("EVEROS_TASK_POLL_RATE", "20")),
+            recorder=TaskLifecycleRecorder(trace_path=os.getenv("EVEROS_TASK_TRACE") or None),
+        )
+
+    journal = None
+    if journal_path != "off":
+        try:
+            journal = CheckpointJournal(
+                journal_path,
+                {"file": os.path.basename(file_path), "chunk_size": chunk_size, "group_id": group_id},
+            )
+        except ValueError as e:
+            print(f"错误: {e}（删除该日志或通过 EVEROS_JOURNAL 指定新路径）", file=sys.stderr)
+            sys.exit(1)
+    resume = journal.last if journal else None
 
     print(f"读取文件: {file_path}")
     print(f"块大小: {chunk_size} 字符")
@@ -211,47 +558,148 @@ async def main() -> None:
         print(f"从第 {start_from} 块开始处理")
     if max_blocks is not None:
         print(f"最多处理 {max_blocks} 个块")
+    print(f"并发数: 自适应 (上限 {concurrency})" if limiter else f"并发数: {concurrency}")
+    if pack_bytes or pack_messages_max > 1:
+        print(f"打包: 每次请求至多 {pack_messages_max} 条消息" + (f" / {pack_bytes} 字节" if pack_bytes else ""))
     print(f"记忆库: 已配置 (方式: SDK v1 group.add, 群组: {group_id})")
+    if reconciler:
+        print("写入模式: async_mode=True，受理即提交，后台通过 tasks.retrieve() 对账 task_id")
+    if journal:
+        print(f"断点日志: {journal_path}")
+    if dedup is not None:
+        print(f"去重索引: {dedup_path} ({len(dedup)} 条已受理)")
+    print(f"失败处理: 最多尝试 {retry.max_attempts} 次，" + (f"仍失败写入死信 {dead_letter_path}" if dead_letter else "仍失败即停止"))
+    if resume:
+        print(f"断点续传: 日志中已提交 {journal.committed} 个块，从第 {resume['ordinal'] + 1} 块（字节偏移 {resume['end_offset']}）继续，之前的块只重新切块计数，不发送")
     print("-" * 50)
 
     chunk_count = 0
     total_chars = 0
     processed_count = 0
-    success_count = 0
-    failed_at_chunk = None
-
-    for chunk in read_file_chunks(file_path, chunk_size):
-        chunk_count += 1
-
-        if chunk_count < start_from:
-            continue
-
-        if max_blocks is not None and processed_count >= max_blocks:
-            break
+    deduped_count = 0
+    mismatch = False
+    spans: dict[int, tuple[int, int]] = {}
+    ids = ContentIds(group_id)
+
+    def select_chunks() -> Iterator[tuple[int, str]]:
+        nonlocal chunk_count, total_chars, processed_count, mismatch
+        # 从文件开头切块：已提交 / 起始块号之前的块只计入 ids（message_id 中的出现次数），不发送
+        for chunk, offset, end_offset in read_file_chunks_with_offsets(file_path, chunk_size):
+            chunk_count += 1
+
+            if resume and chunk_count <= resume["ordinal"]:
+                if chunk_count == resume["ordinal"] and (
+                    offset != resume["offset"] or CheckpointJournal.content_hash(chunk) != resume["sha256"]
+                ):
+                    # 最后一个已提交块的位置或内容与日志不一致
+                    print(f"错误: 第 {chunk_count} 块内容与断点日志不一致，源文件可能已修改", file=sys.stderr)
+                    mismatch = True
+                    return
+                ids.next(chunk)
+                continue
 
-        processed_count += 1
-        chunk_length = len(chunk)
-        total_chars += chunk_length
+            if chunk_count < start_from:
+                ids.next(chunk)
+                continue
 
-        print(f"\n[块 {chunk_count}] (长度: {chunk_length} 字符)")
-        print(f"内容预览: {chunk[:100]}..." if len(chunk) > 100 else f"内容: {chunk}")
+            if max_blocks is not None and processed_count >= max_blocks:
+                break
+
+            processed_count += 1
+            total_chars += len(chunk)
+            spans[chunk_count] = (offset, end_offset)
+            yield chunk_count, chunk
+
+    def skip_accepted(messages: Iterable[tuple[int, dict]]) -> Iterator[tuple[int, dict]]:
+        """跳过去重索引中已受理的块，不发起任何请求"""
+        nonlocal deduped_count
+        for ordinal, message in messages:
+            if dedup is not None and message["message_id"] in dedup:
+                deduped_count += 1
+                spans.pop(ordinal, None)
+                continue
+            yield ordinal, message
+
+    def commit_to_journal(batch: list[tuple[int, dict]], response: dict) -> None:
+        if dedup is not None and "dead_letter" not in response:
+            dedup.add(message["message_id"] for _, message in batch)
+        records = []
+        for ordinal, message in batch:
+            offset, end_offset = spans.pop(ordinal)
+            records.append({
+                "ordinal": ordinal,
+                "offset": offset,
+                "end_offset": end_offset,
+                "sha256": CheckpointJournal.content_hash(message["content"]),
+                "response": response,
+            })
+        if journal:
+            journal.append(records)
+
+    def record_accepted(batch: list[tuple[int, dict]], response: dict) -> None:
+        # 失败块之后已被受理的块：断点日志只记录有序前缀，这些块只记入去重索引，续传时不再发送
+        if dedup is not None and "dead_letter" not in response:
+            dedup.add(message["message_id"] for _, message in batch)
+        for ordinal, _ in batch:
+            spans.pop(ordinal, None)
+
+    async def send(batch: list[tuple[int, dict]]) -> Optional[dict]:
+        for ordinal, message in batch:
+            chunk = message["content"]
+            print(f"\n[块 {ordinal}] (长度: {len(chunk)} 字符)")
+            print(f"内容预览: {chunk[:100]}..." if len(chunk) > 100 else f"内容: {chunk}")
         print("-" * 50)
-
-        success = await add_memory_batch(
-            chunk=chunk,
-            chunk_count=chunk_count,
+        submitted = time.monotonic()
+        response = await add_memory_batch(
+            batch,
             group_id=group_id,
             group_name=group_name,
-            sender=sender,
-            sender_name=sender_name,
+            limiter=limiter,
+            retry=retry,
+            dead_letter=dead_letter,
+            async_mode=True if reconciler else None,
         )
+        task_id = ((response or {}).get("data") or {}).get("task_id")
+        if reconciler and task_id:
+            reconciler.track(task_id, batch, submitted)
+        return response
 
-        if success:
-            success_count += 1
-        else:
-            failed_at_chunk = chunk_count
-            print(f"\n❌ 处理失败，已停止。成功处理 {success_count} 个块，失败于第 {failed_at_chunk} 个块", file=sys.stderr)
-            break
+    messages = skip_accepted(build_messages(select_chunks(), group_id, sender=sender, sender_name=sender_name, ids=ids))
+    batches = pack_messages(messages, max_bytes=pack_bytes, max_messages=pack_messages_max)
+    try:
+        stats = await ingest_batches(
+            batches, send, concurrency=concurrency, on_commit=commit_to_journal, on_accepted=record_accepted
+        )
+        unfinished: list[str] = []
+        if reconciler:
+            print(f"\n提交完成，等待 {reconciler.pending} 个任务对账（最长 {reconcile_timeout:.0f}s）...")
+            unfinished = await reconciler.drain(reconcile_timeout)
+            for task_id, batch in reconciler.failed:
+                if dedup is not None:
+                    dedup.discard(message["message_id"] for _, message in batch)
+                if dead_letter:
+                    dead_letter.write({
+                        "group_id": group_id,
+                        "group_name": group_name,
+                        "ordinals": [ordinal for ordinal, _ in batch],
+                        "messages": [message for _, message in batch],
+                        "error": {"class": "task_failed", "type": "TaskFailed", "status_code": None, "message": f"task {task_id} status=failed"},
+                        "task_id": task_id,
+                        "failed_at": datetime.now(timezone.utc).isoformat(),
+                    })
+    finally:
+        if journal:
+            journal.close()
+        if dead_letter:
+            dead_letter.close()
+        if dedup is not None:
+            dedup.close()
+        if reconciler and reconciler.recorder:
+            reconciler.recorder.close()
+    success_count = stats.committed
+    failed_at_chunk = stats.failed_at_chunk
+    if failed_at_chunk:
+        print(f"\n❌ 处理失败，已停止。成功处理 {success_count} 个块，失败于第 {failed_at_chunk} 个块", file=sys.stderr)
 
     print("\n" + "=" * 50)
     if start_from > 1 and chunk_count > 0:
@@ -259,13 +707,56 @@ async def main() -> None:
         print(f"已跳过前 {skipped_count} 个块")
     if max_blocks is not None and processed_count >= max_blocks:
         print(f"已达到最大处理块数限制 ({max_blocks} 个块)")
-    if failed_at_chunk:
+    if mismatch:
+        print(f"❌ 第 {resume['ordinal']} 块内容与断点日志不一致，未继续处理（确认源文件后删除断点日志 {journal_path} 重新导入）")
+    elif failed_at_chunk:
         print(f"❌ 处理失败于第 {failed_at_chunk} 个块")
         print(f"成功处理: {success_count} 个块")
+        if stats.accepted_after_stop:
+            print(
+                f"另有 {stats.accepted_after_stop} 个之后的块已被受理"
+                + ("，已记入去重索引，重跑时跳过" if dedup is not None else "（未使用去重索引，重跑时会重新发送）")
+            )
+    elif stats.dead_lettered:
+        print(f"⚠ {success_count} 个块已添加到记忆库，{stats.dead_lettered} 个块写入死信 {dead_letter_path}")
+        print(f"  重放: python replay_dead_letter_async.py {dead_letter_path}")
+    elif reconciler:
+        print(f"✓ 所有块已被服务端受理 ({success_count} 个)，处理结果见下方对账")
     else:
         print(f"✓ 所有块已成功添加到记忆库 ({success_count} 个)")
     if chunk_count > 0:
         print(f"总计: 共 {chunk_count} 个块, 处理 {processed_count} 个块, 处理内容共 {total_chars} 个字符")
+    if deduped_count:
+        print(f"去重: 跳过 {deduped_count} 个已受理的块（未发送请求）")
+    if stats.latencies:
+        print(
+            f"吞吐: {stats.chunks_per_sec:.2f} 块/秒 ({stats.requests} 次请求, 耗时 {stats.elapsed:.1f}s, 并发 {concurrency}), "
+            f"请求延迟 p50={stats.percentile(50) * 1000:.0f}ms p99={stats.percentile(99) * 1000:.0f}ms"
+        )
+    if reconciler:
+        print(
+            f"异步任务对账: 成功 {reconciler.succeeded}, 已完成并过期(404) {reconciler.expired}, "
+            f"失败 {len(reconciler.failed)}, 未完成 {len(unfinished)}"
+        )
+        for task_id, batch in reconciler.failed:
+            print(f"  ✗ {task_id} (块 {batch_label(batch)})" + (f" → 已写入死信 {dead_letter_path}" if dead_letter else ""))
+        for task_id in unfinished[:20]:
+            print(f"  … {task_id} 在 {reconcile_timeout:.0f}s 内未完成")
+        if len(unfinished) > 20:
+            print(f"  … 等共 {len(unfinished)} 个任务未完成")
+        if reconciler.recorder and reconciler.recorder.histograms:
+            print("任务生命周期延迟（accept=提交→受理, extraction=受理→观察到完成）:")
+            print(reconciler.recorder.report())
+            if reconciler.recorder.trace_path:
+                print(f"  trace: {reconciler.recorder.trace_path}")
+    if limiter:
+        m = limiter.metrics()
+        print(
+            f"自适应并发: 当前窗口 {m.limit} (下调 {m.decreases} 次, 429 {m.throttled} 次, 超时/5xx {m.errors} 次), "
+            f"最近吞吐 {m.throughput:.2f} 请求/秒"
+        )
+    if mismatch or failed_at_chunk:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
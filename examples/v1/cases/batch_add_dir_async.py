@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# everos should've been installed (pip install everos -U)
+"""
+Batch add a directory / glob of files to EverOS (v1)
+
+在 batch_add_async.py 的基础上一次导入多个文件：
+  - 切块在 ProcessPoolExecutor 中进行（正则切块是 CPU 密集型，受 GIL 限制）：worker 每次切出一个窗口
+    （EVEROS_CHUNK_WINDOW 个块）并返回下一块的偏移，上传当前窗口时预取下一个窗口，内存占用与文件大小无关
+  - 所有文件的块共用一个 AsyncEverOS 客户端与一个全局并发上限（上传 fleet）
+  - 每个文件按映射规则写入各自的 group_id，并各自记录断点日志 <文件路径>.journal.jsonl
+  - message_id 由 (group_id, 内容哈希, 该内容在文件中此前出现的次数) 得到，去重索引（默认 <目录>/.everos-dedup.idx）中已受理的块直接跳过
+  - 超时 / 429 / 5xx 自动重试，永久失败写入该文件的死信 <文件路径>.deadletter.jsonl 后继续
+"""
+
+import os
+import sys
+import glob
+import json
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Iterator, Optional
+
+from batch_add_async import (
+    GROUP_ADD_MAX_MESSAGES,
+    CheckpointJournal,
+    DeadLetterQueue,
+    add_memory_batch,
+    build_messages,
+    ingest_batches,
+    pack_messages,
+)
+from everos_kit import AdaptiveLimiter, ContentIds, DedupIndex, RetryPolicy
+from text_chunker import chunk_window
+
+DEFAULT_FILE_GLOB = "**/*.txt"
+
+
+def expand_inputs(target: str, file_glob: str = DEFAULT_FILE_GLOB) -> list[str]:
+    """目录按 file_glob 递归匹配，否则把 target 当作 glob；返回排序后的文件列表"""
+    if os.path.isdir(target):
+        paths = glob.glob(os.path.join(target, file_glob), recursive=True)
+    else:
+        paths = glob.glob(target, recursive=True)
+    return sorted(p for p in paths if os.path.isfile(p) and not p.endswith(".journal.jsonl"))
+
+
+class GroupMapper:
+    """
+    File → (group_id, group_name) mapping rule
+
+    优先查映射文件（JSON：{相对路径或文件名: group_id 或 {"group_id", "group_name"}}），
+    否则按模板生成。模板可用字段：{stem} {name} {parent} {relpath}（relpath 中的路径分隔符替换为 "__"）。
+    """
+
+    def __init__(self, root: str, id_template: str = "{stem}", name_template: str = "{stem}", map_path: Optional[str] = None):
+        self.root = root
+        self.id_template = id_template
+        self.name_template = name_template
+        self.mapping: dict = {}
+        if map_path:
+            with open(map_path, 'r', encoding='utf-8') as f:
+                self.mapping = json.load(f)
+
+    def __call__(self, file_path: str) -> tuple[str, str]:
+        relpath = os.path.relpath(file_path, self.root)
+        fields = {
+            "stem": os.path.splitext(os.path.basename(file_path))[0],
+            "name": os.path.basename(file_path),
+            "parent": os.path.basename(os.path.dirname(os.path.abspath(file_path))),
+            "relpath": os.path.splitext(relpath)[0].replace(os.sep, "__"),
+        }
+        entry = self.mapping.get(relpath, self.mapping.get(fields["name"]))
+        if isinstance(entry, dict):
+            group_id = entry["group_id"]
+            return group_id, entry.get("group_name", group_id)
+        if entry:
+            return entry, self.name_template.format(**fields)
+        return self.id_template.format(**fields), self.name_template.format(**fields)
+
+
+async def main() -> None:
+    if len(sys.argv) < 2:
+        print("用法: python batch_add_dir_async.py <目录或glob> [块大小]", file=sys.stderr)
+        print("示例: python batch_add_dir_async.py books/ 1000", file=sys.stderr)
+        print("示例: python batch_add_dir_async.py 'exports/**/*.txt' 1000", file=sys.stderr)
+        print("示例: EVEROS_GROUP_ID_TEMPLATE='book_{stem}' EVEROS_CONCURRENCY=16 python batch_add_dir_async.py books/", file=sys.stderr)
+        print("\n环境变量配置（可选，已有默认值）:", file=sys.stderr)
+        print("  EVEROS_API_KEY: API密钥（必需）", file=sys.stderr)
+        print("  EVER_OS_BASE_URL: API地址（可选）", file=sys.stderr)
+        print(f"  EVEROS_FILE_GLOB: 目录下匹配的文件（默认: {DEFAULT_FILE_GLOB}）", file=sys.stderr)
+        print("  EVEROS_GROUP_ID_TEMPLATE: group_id 模板，可用 {stem} {name} {parent} {relpath}（默认: {stem}）", file=sys.stderr)
+        print("  EVEROS_GROUP_NAME_TEMPLATE: 群组名称模板（默认: {stem}）", file=sys.stderr)
+        print("  EVEROS_GROUP_MAP: 映射文件 JSON（相对路径或文件名 → group_id），优先于模板", file=sys.stderr)
+        print("  EVEROS_SENDER: 发送者ID（默认: user_001）", file=sys.stderr)
+        print("  EVEROS_SENDER_NAME: 发送者名称（默认: User）", file=sys.stderr)
+        print("  EVEROS_CHUNK_WORKERS: 切块进程数（默认: CPU 核数）", file=sys.stderr)
+        print("  EVEROS_CHUNK_WINDOW: worker 每次切出并返回的块数（默认: 1024）", file=sys.stderr)
+        print("  EVEROS_CONCURRENCY: 全部文件共享的并发请求数（默认: 8；自适应模式下为窗口上限，默认 32）", file=sys.stderr)
+        print("  EVEROS_ADAPTIVE: 1 表示按 429/超时/5xx/延迟自动调节共享并发（默认: 关闭）", file=sys.stderr)
+        print("  EVEROS_LATENCY_TARGET: 自适应模式下的请求耗时目标（秒）（默认: 不限）", file=sys.stderr)
+        print("  EVEROS_PACK_BYTES: 每次请求 messages 的字节上限（默认: 0，不限）", file=sys.stderr)
+        print("  EVEROS_PACK_MESSAGES: 每次请求的消息条数上限（默认: 1，设置 EVEROS_PACK_BYTES 时为 500）", file=sys.stderr)
+        print("  EVEROS_JOURNAL: off 表示不记录断点日志（默认每个文件写 <文件路径>.journal.jsonl）", file=sys.stderr)
+        print("  EVEROS_DEDUP_INDEX: 去重索引路径（默认: <目录>/.everos-dedup.idx，off 表示不使用）", file=sys.stderr)
+        print("  EVEROS_MAX_ATTEMPTS: 超时 / 429 / 5xx 的最大尝试次数（默认: 5）", file=sys.stderr)
+        print("  EVEROS_DEAD_LETTER: off 表示失败即停止该文件（默认每个文件写 <文件路径>.deadletter.jsonl）", file=sys.stderr)
+        sys.exit(1)
+
+    target = sys.argv[1]
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    file_glob = os.getenv("EVEROS_FILE_GLOB", DEFAULT_FILE_GLOB)
+    sender = os.getenv("EVEROS_SENDER", "user_001")
+    sender_name = os.getenv("EVEROS_SENDER_NAME", "User")
+    workers = int(os.getenv("EVEROS_CHUNK_WORKERS", str(os.cpu_count() or 1)))
+    window_chunks = max(1, int(os.getenv("EVEROS_CHUNK_WINDOW", "1024")))
+    adaptive = os.getenv("EVEROS_ADAPTIVE", "") not in ("", "0", "off")
+    concurrency = int(os.getenv("EVEROS_CONCURRENCY", "32" if adaptive else "8"))
+    latency_target = os.getenv("EVEROS_LATENCY_TARGET")
+    pack_bytes = int(os.getenv("EVEROS_PACK_BYTES", "0"))
+    pack_messages_max = int(os.getenv("EVEROS_PACK_MESSAGES", str(GROUP_ADD_MAX_MESSAGES if pack_bytes else 1)))
+    use_journal = os.getenv("EVEROS_JOURNAL", "") != "off"
+    retry = RetryPolicy(max_attempts=int(os.getenv("EVEROS_MAX_ATTEMPTS", "5")))
+    use_dead_letter = os.getenv("EVEROS_DEAD_LETTER", "") != "off"
+
+    files = expand_inputs(target, file_glob)
+    if not files:
+        print(f"错误: '{target}' 下没有匹配的文件", file=sys.stderr)
+        sys.exit(1)
+    root = target
+    while any(c in root for c in "*?["):
+        root = os.path.dirname(root)
+    dedup_path = os.getenv("EVEROS_DEDUP_INDEX", os.path.join(root or ".", ".everos-dedup.idx"))
+    dedup = DedupIndex(dedup_path) if dedup_path != "off" else None
+    mapper = GroupMapper(
+        root or ".",
+        id_template=os.getenv("EVEROS_GROUP_ID_TEMPLATE", "{stem}"),
+        name_template=os.getenv("EVEROS_GROUP_NAME_TEMPLATE", "{stem}"),
+        map_path=os.getenv("EVEROS_GROUP_MAP"),
+    )
+
+    print(f"输入: {target} ({len(files)} 个文件)")
+    print(f"块大小: {chunk_size} 字符")
+    print(f"切块进程数: {workers}, 共享并发数: " + (f"自适应 (上限 {concurrency})" if adaptive else str(concurrency)))
+    if pack_bytes or pack_messages_max > 1:
+        print(f"打包: 每次请求至多 {pack_messages_max} 条消息" + (f" / {pack_bytes} 字节" if pack_bytes else ""))
+    if dedup is not None:
+        print(f"去重索引: {dedup_path} ({len(dedup)} 条已受理)")
+    print("-" * 50)
+
+    loop = asyncio.get_running_loop()
+    # 上传 fleet：全部文件共享的并发上限，自适应模式下由 AIMD 控制器动态调整
+    fleet = AdaptiveLimiter(
+        initial=min(4, concurrency) if adaptive else concurrency,
+        min_limit=1 if adaptive else concurrency,
+        max_limit=concurrency,
+        latency_target=float(latency_target) if adaptive and latency_target else None,
+    )
+    # 同时在切块 / 上传中的文件数：让切块进程始终领先上传一批；每个文件在内存中至多两个窗口
+    files_in_flight = asyncio.Semaphore(max(1, workers) * 2)
+    committed_total = 0
+    deduped_total = 0
+    dead_lettered: list[str] = []
+    failed: list[str] = []
+    start = time.perf_counter()
+
+    async def send_via_fleet(
+        batch: list[tuple[int, dict]], group_id: str, group_name: str, dead_letter: Optional[DeadLetterQueue]
+    ) -> Optional[dict]:
+        return await add_memory_batch(
+            batch, group_id=group_id, group_name=group_name, limiter=fleet, retry=retry, dead_letter=dead_letter
+        )
+
+    async def ingest_file(pool: ProcessPoolExecutor, file_path: str) -> None:
+        nonlocal committed_total
+        group_id, group_name = mapper(file_path)
+        journal = None
+        if use_journal:
+            journal = CheckpointJournal(
+                f"{file_path}.journal.jsonl",
+                {"file": os.path.basename(file_path), "chunk_size": chunk_size, "group_id": group_id},
+            )
+        resume = journal.last if journal else None
+        dead_letter = DeadLetterQueue(f"{file_path}.deadletter.jsonl") if use_dead_letter else None
+        spans: dict[int, tuple[int, int]] = {}
+        mismatch = False
+        chunk_count = 0
+        ids = ContentIds(group_id)
+
+        try:
+            async def windows() -> AsyncIterator[list[tuple[str, int, int]]]:
+                # 上传当前窗口时 worker 已在切下一个窗口
+                pending = loop.run_in_executor(pool, chunk_window, file_path, chunk_size, 0, window_chunks)
+                try:
+                    while pending is not None:
+                        chunks, next_offset = await pending
+                        pending = None
+                        if next_offset is not None:
+                            pending = loop.run_in_executor(pool, chunk_window, file_path, chunk_size, next_offset, window_chunks)
+                        yield chunks
+                finally:
+                    if pending is not None:
+                        pending.cancel()
+
+            def select_chunks(chunks: list[tuple[str, int, int]]) -> Iterator[tuple[int, str]]:
+                nonlocal mismatch, chunk_count
+                for chunk, offset, end_offset in chunks:
+                    chunk_count += 1
+                    if resume and chunk_count <= resume["ordinal"]:
+                        # 已提交的块只计入 ids（message_id 中的出现次数）；最后一个已提交块校验位置与内容未变
+                        if chunk_count == resume["ordinal"] and (
+                            offset != resume["offset"] or CheckpointJournal.content_hash(chunk) != resume["sha256"]
+                        ):
+                            mismatch = True
+                            return
+                        ids.next(chunk)
+                        continue
+                    spans[chunk_count] = (offset, end_offset)
+                    yield chunk_count, chunk
+
+            def skip_accepted(messages: Iterator[tuple[int, dict]]) -> Iterator[tuple[int, dict]]:
+                nonlocal deduped_total
+                for ordinal, message in messages:
+                    if dedup is not None and message["message_id"] in dedup:
+                        deduped_total += 1
+                        spans.pop(ordinal, None)
+                        continue
+                    yield ordinal, message
+
+            def commit_to_journal(batch: list[tuple[int, dict]], response: dict) -> None:
+                if dedup is not None and "dead_letter" not in response:
+                    dedup.add(message["message_id"] for _, message in batch)
+                records = []
+                for ordinal, message in batch:
+                    offset, end_offset = spans.pop(ordinal)
+                    records.append({
+                        "ordinal": ordinal,
+                        "offset": offset,
+                        "end_offset": end_offset,
+                        "sha256": CheckpointJournal.content_hash(message["content"]),
+                        "response": response,
+                    })
+                if journal:
+                    journal.append(records)
+
+            def record_accepted(batch: list[tuple[int, dict]], response: dict) -> None:
+                # 失败块之后已被受理的块只记入去重索引，断点日志仍只记录有序前缀
+                if dedup is not None and "dead_letter" not in response:
+                    dedup.add(message["message_id"] for _, message in batch)
+                for ordinal, _ in batch:
+                    spans.pop(ordinal, None)
+
+            async def batches() -> AsyncIterator[list[tuple[int, dict]]]:
+                # 按窗口打包：窗口末尾不足一个请求的消息单独发送
+                async for chunks in windows():
+                    messages = skip_accepted(build_messages(
+                        select_chunks(chunks), group_id, sender=sender, sender_name=sender_name, ids=ids
+                    ))
+                    for batch in pack_messages(messages, max_bytes=pack_bytes, max_messages=pack_messages_max):
+                        yield batch
+                    if mismatch:
+                        return
+
+            stats = await ingest_batches(
+                batches(),
+                lambda batch: send_via_fleet(batch, group_id, group_name, dead_letter),
+                concurrency=concurrency,
+                on_commit=commit_to_journal,
+                on_accepted=record_accepted,
+            )
+        finally:
+            if journal:
+                journal.close()
+            if dead_letter:
+                dead_letter.close()
+
+        committed_total += stats.committed
+        if mismatch:
+            failed.append(file_path)
+            print(f"❌ {file_path}: 第 {resume['ordinal']} 块内容与断点日志不一致，源文件可能已修改", file=sys.stderr)
+        elif stats.failed_at_chunk:
+            failed.append(file_path)
+            accepted = f"，之后另有 {stats.accepted_after_stop} 个块已受理" if stats.accepted_after_stop else ""
+            print(f"❌ {file_path} → {group_id}: 提交 {stats.committed} 个块，失败于第 {stats.failed_at_chunk} 块{accepted}", file=sys.stderr)
+        elif stats.dead_lettered:
+            dead_lettered.append(dead_letter.path)
+            print(f"⚠ {file_path} → {group_id}: 提交 {stats.committed} 个块，{stats.dead_lettered} 个块写入死信")
+        else:
+            print(f"✓ {file_path} → {group_id}: 提交 {stats.committed} 个块")
+
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+
+        async def run(file_path: str) -> None:
+            async with files_in_flight:
+                try:
+                    await ingest_file(pool, file_path)
+                except Exception as e:
+                    failed.append(file_path)
+                    print(f"❌ {file_path}: {e}", file=sys.stderr)
+
+        try:
+            await asyncio.gather(*(run(p) for p in files))
+        finally:
+            if dedup is not None:
+                dedup.close()
+
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 50)
+    if failed:
+        print(f"❌ {len(failed)} 个文件未完成（重跑即可从断点日志续传）:")
+        for p in failed:
+            print(f"  {p}")
+    elif not dead_lettered:
+        print(f"✓ 全部 {len(files)} 个文件已成功添加到记忆库")
+    if dead_lettered:
+        print(f"⚠ {len(dead_lettered)} 个文件有写入死信的块，可用 replay_dead_letter_async.py 重放:")
+        for p in dead_lettered:
+            print(f"  {p}")
+    if adaptive:
+        m = fleet.metrics()
+        print(
+            f"自适应并发: 当前窗口 {m.limit} (下调 {m.decreases} 次, 429 {m.throttled} 次, 超时/5xx {m.errors} 次), "
+            f"最近吞吐 {m.throughput:.2f} 请求/秒"
+        )
+    if deduped_total:
+        print(f"去重: 跳过 {deduped_total} 个已受理的块（未发送请求）")
+    print(f"总计: 提交 {committed_total} 个块, 耗时 {elapsed:.1f}s, 吞吐 {committed_total / elapsed if elapsed > 0 else 0:.2f} 块/秒")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: legacy vs streaming chunker (v1)
+
+legacy    整文件读入 + re.sub 标记章节 + 每段 re.split 的原始实现（逐字保留于此，仅作对照）
+streaming text_chunker.iter_chunks：分块读取、单遍预编译正则切分、list 缓冲拼块
+
+两者输出逐字节一致时才报告结果；不调用 API，无需 EVEROS_API_KEY。
+
+Usage:
+    python bench_chunker.py [file] [chunk_size] [repeat]
+"""
+
+import os
+import re
+import sys
+import time
+from typing import Callable, Generator
+
+from text_chunker import iter_chunks
+
+DEFAULT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../../data/guichuideng-jingjuegucheng.txt')
+
+
+def legacy_normalize_text(text: str) -> str:
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    return text
+
+
+def legacy_is_chapter_title(text: str) -> bool:
+    pattern = r'^第[一二三四五六七八九十百千万\d]+章'
+    return bool(re.match(pattern, text.strip()))
+
+
+def legacy_read_file_chunks(file_path: str, chunk_size: int = 1000) -> Generator[str, None, None]:
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except FileNotFoundError:
+        print(f"错误: 文件 '{file_path}' 不存在", file=sys.stderr)
+        return
+    except Exception as e:
+        print(f"错误: 读取文件时发生异常: {e}", file=sys.stderr)
+        return
+
+    content = legacy_normalize_text(content)
+
+    chapter_pattern = r'(第[一二三四五六七八九十百千万\d]+章)'
+    marked_content = re.sub(chapter_pattern, r'|||CHAPTER_TITLE|||\1', content)
+    segments = marked_content.split('|||CHAPTER_TITLE|||')
+
+    current_chunk = ""
+
+    for idx, segment in enumerate(segments):
+        if not segment.strip():
+            continue
+
+        segment_stripped = segment.strip()
+
+        if idx == 0:
+            parts = re.split(r'([。！？])', segment)
+        else:
+            if legacy_is_chapter_title(segment_stripped):
+                if current_chunk.strip():
+                    yield current_chunk.strip()
+                    current_chunk = ""
+                match = re.match(r'(第[一二三四五六七八九十百千万\d]+章)', segment_stripped)
+                if match:
+                    chapter_title = match.group(1)
+                    current_chunk = chapter_title
+                    remaining = segment_stripped[len(chapter_title):].strip()
+                    if remaining:
+                        if not current_chunk.endswith(' '):
+                            current_chunk += ' '
+                        segment = remaining
+                        parts = re.split(r'([。！？])', segment)
+                    else:
+                        continue
+                else:
+                    parts = re.split(r'([。！？])', segment)
+            else:
+                parts = re.split(r'([。！？])', segment)
+
+        i = 0
+        while i < len(parts):
+            part = parts[i].strip()
+            if not part:
+                i += 1
+                continue
+
+            if part in ['。', '！', '？']:
+                if current_chunk:
+                    current_chunk += part
+                    if len(current_chunk) >= chunk_size:
+                        yield current_chunk.strip()
+                        current_chunk = ""
+                i += 1
+                continue
+
+            test_chunk = current_chunk + part if current_chunk else part
+
+            if len(part) >= chunk_size:
+                if current_chunk.strip():
+                    yield current_chunk.strip()
+                    current_chunk = ""
+                yield part
+                i += 1
+                continue
+
+            if len(test_chunk) >= chunk_size:
+                if i + 1 < len(parts) and parts[i + 1] in ['。', '！', '？']:
+                    test_chunk += parts[i + 1]
+                    yield test_chunk.strip()
+                    current_chunk = ""
+                    i += 2
+                else:
+                    if current_chunk.strip():
+                        yield current_chunk.strip()
+                    current_chunk = part
+                    i += 1
+            else:
+                current_chunk = test_chunk
+                if i + 1 < len(parts) and parts[i + 1] in ['。', '！', '？']:
+                    current_chunk += parts[i + 1]
+                    i += 2
+                else:
+                    i += 1
+
+    if current_chunk.strip():
+        yield current_chunk.strip()
+
+
+def streaming_read_file_chunks(file_path: str, chunk_size: int = 1000) -> Generator[str, None, None]:
+    for chunk, _, _ in iter_chunks(file_path, chunk_size):
+        yield chunk
+
+
+def bench(fn: Callable[[str, int], Generator[str, None, None]], file_path: str, chunk_size: int, repeat: int) -> tuple[float, list[str]]:
+    best = float('inf')
+    chunks: list[str] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        chunks = list(fn(file_path, chunk_size))
+        best = min(best, time.perf_counter() - t0)
+    return best, chunks
+
+
+def main() -> None:
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FILE
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    size_mb = os.path.getsize(file_path) / (1 << 20)
+    print(f"文件: {file_path} ({size_mb:.2f} MB), 块大小: {chunk_size}, 重复 {repeat} 次取最优\n")
+
+    legacy_time, legacy_chunks = bench(legacy_read_file_chunks, file_path, chunk_size, repeat)
+    streaming_time, streaming_chunks = bench(streaming_read_file_chunks, file_path, chunk_size, repeat)
+
+    if legacy_chunks != streaming_chunks:
+        for n, (a, b) in enumerate(zip(legacy_chunks, streaming_chunks), 1):
+            if a != b:
+                print(f"✗ 输出不一致: 第 {n} 块不同", file=sys.stderr)
+                break
+        else:
+            print(f"✗ 输出不一致: 块数 {len(legacy_chunks)} vs {len(streaming_chunks)}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"✓ 输出一致: {len(legacy_chunks)} 块")
+    print(f"  legacy    {legacy_time * 1000:8.1f} ms  {size_mb / legacy_time:7.2f} MB/s")
+    print(f"  streaming {streaming_time * 1000:8.1f} ms  {size_mb / streaming_time:7.2f} MB/s")
+    print(f"  加速比: {legacy_time / streaming_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: full model construction vs lazy views for memories.search / get responses (v1)
+
+default  SDK 默认路径：json 解析后 SearchMemoriesResponse / GetMemoriesResponse.construct(**data)，逐条构造全部嵌套模型
+lazy     everos_kit.lazy_response：只做 json 解析，访问到的字段才取值 / 构造
+
+读取 24_lazy_responses.py --record 保存的原始响应体；不给文件时合成一个大响应（每条 episode 带 atomic_facts，
+search 另带 raw_messages）。分别统计三种访问方式的 CPU 时间（time.process_time，重复取最优）与内存分配
+（tracemalloc：峰值、响应对象存活时仍占用的字节数与块数）：
+  ids     读全部 episode 的 id / score（及 timestamp）
+  first   只读第 1 条 episode 的 timestamp
+  full    对全部 episode 构造完整模型（惰性路径的最坏情况）
+
+两条路径读到的 id / score / timestamp 逐条同值同类型、惰性视图 .model() 与默认路径的模型相等时才报告结果；模型类取自已安装 SDK 方法的返回类型注解，不调用 API。
+
+Usage:
+    python bench_lazy_response.py [search|get] [response.json] [repeat] [episodes]
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from everos import EverOS
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from everos_kit.lazy import LazyList, LazyObject, lazy_response, response_model
+
+
+def synthesize(endpoint: str, episodes: int) -> bytes:
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    items = []
+    for i in range(episodes):
+        ts = (base + timedelta(minutes=i)).isoformat()
+        item = {
+            "id": f"ep_{i:06d}", "user_id": "user_010", "group_id": "group_001", "session_id": f"s_{i // 20}",
+            "timestamp": ts, "participants": ["user_010", "assistant"], "sender_ids": ["user_010"],
+            "summary": f"summary {i} " * 8, "subject": f"subject {i}", "episode": f"episode text {i} " * 40,
+            "type": "conversation", "parent_type": "memcell", "parent_id": f"mc_{i}",
+        }
+        if endpoint == "search":
+            del item["sender_ids"]
+            item["score"] = round(1.0 - i / (episodes + 1), 6)
+            item["atomic_facts"] = [
+                {
+                    "id": f"af_{i}_{j}", "user_id": "user_010", "atomic_fact": f"fact {j} of {i} " * 6,
+                    "timestamp": ts, "participants": ["user_010"], "parent_type": "episode",
+                    "parent_id": f"ep_{i:06d}", "score": 0.5, "parent_episode_id": f"ep_{i:06d}",
+                }
+                for j in range(3)
+            ]
+        items.append(item)
+    if endpoint == "get":
+        data = {"episodes": items, "profiles": [], "agent_cases": [], "agent_skills": [],
+                "total_count": episodes, "count": episodes}
+    else:
+        raw_messages = [
+            {
+                "id": f"rm_{i}", "request_id": f"req_{i}", "message_id": f"msg_{i}", "group_id": "group_001",
+                "sender_id": "user_010", "sender_name": "User", "timestamp": item["timestamp"],
+                "created_at": item["timestamp"], "updated_at": item["timestamp"],
+                "content_items": [{"type": "text", "text": f"message body {i} " * 30}],
+            }
+            for i, item in enumerate(items)
+        ]
+        data = {"episodes": items, "profiles": [], "raw_messages": raw_messages,
+                "query": {"text": "recent activities", "method": "hybrid", "filters_applied": {"user_id": "user_010"}}}
+    return json.dumps({"data": data}).encode()
+
+
+def default_path(model_cls: type) -> Callable[[bytes], Any]:
+    return lambda content: model_cls.construct(**json.loads(content))
+
+
+def lazy_path(model_cls: type) -> Callable[[bytes], Any]:
+    return lambda content: lazy_response(content, model_cls)
+
+
+def read_ids(resp: Any) -> list:
+    return [(e.id, getattr(e, "score", None), e.timestamp) for e in resp.data.episodes]
+
+
+def read_first(resp: Any) -> Any:
+    return resp.data.episodes[0].timestamp
+
+
+def read_full(resp: Any) -> list:
+    return [e.model() if isinstance(e, LazyObject) else e for e in resp.data.episodes]
+
+
+def diverge(default: Any, lazy: Any) -> Optional[str]:
+    """两条路径不一致时返回说明"""
+    if not isinstance(lazy.data, LazyObject) or not isinstance(lazy.data.episodes, LazyList):
+        return f"惰性视图未按模型解析: data={type(lazy.data).__name__}，字段类型取不到"
+    expected, actual = read_ids(default), read_ids(lazy)
+    if len(expected) != len(actual):
+        return f"条数 {len(expected)} vs {len(actual)}"
+    for n, (a, b) in enumerate(zip(expected, actual), 1):
+        if a != b or [type(v) for v in a] != [type(v) for v in b]:
+            return f"第 {n} 条 {a!r} vs {b!r}"
+    if lazy.model() != default:
+        return "完整模型不相等"
+    return None
+
+
+def cpu(parse: Callable[[bytes], Any], read: Callable[[Any], Any], content: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.process_time()
+        read(parse(content))
+        best = min(best, time.process_time() - t0)
+    return best
+
+
+def allocations(parse: Callable[[bytes], Any], read: Callable[[Any], Any], content: bytes) -> tuple[int, int, int]:
+    """(峰值字节, 响应存活时占用的字节, 响应存活时占用的块数)"""
+    tracemalloc.start()
+    try:
+        resp = parse(content)
+        read(resp)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    stats = snapshot.statistics("filename")
+    del resp
+    return peak, sum(s.size for s in stats), sum(s.count for s in stats)
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    endpoint = args[0] if args else "search"
+    if endpoint not in ("search", "get"):
+        print(f"错误: 接口只能是 search 或 get，收到 {endpoint!r}", file=sys.stderr)
+        sys.exit(2)
+    path = args[1] if len(args) > 1 and args[1] != "-" else None
+    repeat = int(args[2]) if len(args) > 2 else 5
+    episodes = int(args[3]) if len(args) > 3 else 100
+
+    model_cls = response_model(getattr(EverOS(api_key="bench").v1.memories, endpoint))
+    if model_cls is None:
+        print(f"错误: 无法从已安装的 SDK 解析 memories.{endpoint} 的返回类型", file=sys.stderr)
+        sys.exit(1)
+
+    if path:
+        with open(path, "rb") as f:
+            content = f.read()
+        source = path
+    else:
+        content = synthesize(endpoint, episodes)
+        source = f"合成 {episodes} 条 episode"
+    print(f"{model_cls.__name__}: {source} ({len(content) / 1024:.0f} KB), 重复 {repeat} 次取最优\n")
+
+    default, lazy = default_path(model_cls), lazy_path(model_cls)
+    reference = default(content)
+    error = diverge(reference, lazy(content))
+    if error:
+        print(f"✗ 结果不一致: {error}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✓ id / score / timestamp 同值同类型、完整模型相等: {len(reference.data.episodes)} 条\n")
+
+    print(f"  {'访问':<6} {'路径':<8} {'CPU':>9} {'峰值':>10} {'存活':>10} {'存活块数':>9}")
+    for label, read in (("ids", read_ids), ("first", read_first), ("full", read_full)):
+        times = {}
+        for name, parse in (("default", default), ("lazy", lazy)):
+            times[name] = cpu(parse, read, content, repeat)
+            peak, retained, blocks = allocations(parse, read, content)
+            print(f"  {label:<6} {name:<8} {times[name] * 1000:7.2f}ms {peak / 1024:8.0f}KB {retained / 1024:8.0f}KB {blocks:9d}")
+        print(f"  {'':<6} 加速比: {times['default'] / max(times['lazy'], 1e-9):.2f}x\n")
+
+
+if __name__ == "__main__":
+    main()
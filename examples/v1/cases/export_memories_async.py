@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# everos should've been installed (pip install everos -U)
+"""
+Incrementally export memories of users / groups to JSONL and columnar files (v1)
+
+按范围（user_id / group_id）导出 episodic_memory / profile / agent_case / agent_skill：
+  - 带 timestamp 的类型（episodic_memory / agent_case）按时间分片并行扫描（everos_kit.TimeShardedScanner），
+    每个范围 × 类型在 <输出目录>/_watermarks.json 中记录已导出的最大 timestamp（水位线），
+    之后的运行只拉取水位线之后的新记忆，写入新的 part-<运行时间> 文件
+  - 没有 timestamp 的类型（profile / agent_skill）每次全量导出为 snapshot-<运行时间> 文件
+  - 逐条流式写盘：JSONL 每条一行；Parquet / Arrow IPC 每 EVEROS_EXPORT_BATCH 条写一个 record batch，
+    内存占用与导出总量无关（列式格式需要 pyarrow：pip install pyarrow）
+  - 文件先写 .tmp，完成后原子改名并推进水位线；中途失败时水位线不变，重跑会重新导出该范围
+
+episode 的 timestamp 是对话发生时间而不是写入时间：补录的历史对话或较晚完成的提取可能落在水位线之前。
+每次从「水位线 - EVEROS_EXPORT_OVERLAP_MS」开始重扫，并按水位线附近已导出的 id 去重。
+
+输出目录结构：
+    <输出目录>/_watermarks.json
+    <输出目录>/user_id=u1/episodic_memory/part-20260101T000000000000Z.jsonl
+    <输出目录>/user_id=u1/profile/snapshot-20260101T000000000000Z.parquet
+"""
+
+import os
+import sys
+import json
+import asyncio
+import functools
+import heapq
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+from everos import AsyncEverOS
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from everos_kit import RetryPolicy, TimeShardedScanner, aiter_memories, describe_error
+from everos_kit.pagination import item_to_dict
+from everos_kit.scan import TIMESTAMP_TYPES, timestamp_ms
+
+# 关闭 SDK 内置重试：重试由 RetryPolicy（EVEROS_MAX_ATTEMPTS）负责，避免两层重试相乘
+client = AsyncEverOS(max_retries=0)
+
+MEMORY_TYPES = ("episodic_memory", "profile", "agent_case", "agent_skill")
+# 按水位线增量导出的类型；其余类型没有 timestamp，每次全量快照
+INCREMENTAL_TYPES = TIMESTAMP_TYPES
+# profile / agent_case / agent_skill 只支持按 user_id 查询（group_id 返回 400）
+GROUP_TYPES = ("episodic_memory",)
+FORMATS = ("jsonl", "parquet", "arrow")
+WATERMARK_FILE = "_watermarks.json"
+
+# 列式文件的列：(列名, 类型)；类型为 string / int64 / float64 / list（字符串列表）/ json（对象序列化为字符串）
+# 字段取自 openapi-0330.json 的 EpisodeItem / ProfileItem / AgentCaseItem / AgentSkillItem；JSONL 保留全部字段
+COLUMNS = {
+    "episodic_memory": [
+        ("id", "string"), ("user_id", "string"), ("group_id", "string"), ("session_id", "string"),
+        ("timestamp", "string"), ("timestamp_ms", "int64"), ("participants", "list"), ("sender_ids", "list"),
+        ("summary", "string"), ("subject", "string"), ("episode", "string"), ("type", "string"),
+        ("parent_type", "string"), ("parent_id", "string"),
+    ],
+    "profile": [
+        ("id", "string"), ("user_id", "string"), ("group_id", "string"), ("profile_data", "json"),
+        ("scenario", "string"), ("memcell_count", "int64"),
+    ],
+    "agent_case": [
+        ("id", "string"), ("user_id", "string"), ("group_id", "string"), ("session_id", "string"),
+        ("task_intent", "string"), ("approach", "string"), ("quality_score", "float64"),
+        ("timestamp", "string"), ("timestamp_ms", "int64"), ("parent_type", "string"), ("parent_id", "string"),
+    ],
+    "agent_skill": [
+        ("id", "string"), ("user_id", "string"), ("group_id", "string"), ("cluster_id", "string"),
+        ("name", "string"), ("description", "string"), ("content", "string"), ("confidence", "float64"),
+        ("maturity_score", "float64"), ("source_case_ids", "list"),
+    ],
+}
+
+
+def parse_scope(arg: str) -> tuple[str, str]:
+    """user:<id> / group:<id>；不带前缀时视为 user_id"""
+    kind, sep, value = arg.partition(":")
+    if sep and kind in ("user", "group"):
+        return f"{kind}_id", value
+    return "user_id", arg
+
+
+class WatermarkStore:
+    """
+    Per-scope export watermarks persisted as JSON
+
+    {"user_id=u1": {"episodic_memory": {"watermark": 毫秒, "recent_ids": [...]}}}
+    recent_ids 为 timestamp ≥ 水位线 - overlap 的已导出 id，用于重扫重叠区间时去重。
+    每次 advance() 都先写临时文件再原子替换。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+        except FileNotFoundError:
+            self.state = {}
+
+    def get(self, scope: str, memory_type: str) -> tuple[Optional[int], set]:
+        entry = self.state.get(scope, {}).get(memory_type) or {}
+        return entry.get("watermark"), set(entry.get("recent_ids") or ())
+
+    def advance(self, scope: str, memory_type: str, watermark: Optional[int], recent_ids: set) -> None:
+        self.state.setdefault(scope, {})[memory_type] = {
+            "watermark": watermark,
+            "recent_ids": sorted(recent_ids),
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+        }
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+
+class ColumnarWriter:
+    """
+    Stream rows into a Parquet or Arrow IPC file in fixed-size record batches
+
+    Args:
+        path: 输出文件路径
+        memory_type: 决定列（COLUMNS）
+        fmt: parquet / arrow
+        batch_rows: 每个 record batch 的行数
+    """
+
+    def __init__(self, path: str, memory_type: str, fmt: str, batch_rows: int = 1000):
+        import pyarrow as pa
+
+        self._pa = pa
+        types = {
+            "string": pa.string(), "int64": pa.int64(), "float64": pa.float64(),
+            "list": pa.list_(pa.string()), "json": pa.string(),
+        }
+        self.columns = COLUMNS[memory_type]
+        self.schema = pa.schema([(name, types[kind]) for name, kind in self.columns])
+        self.batch_rows = max(1, batch_rows)
+        self._rows: list[dict] = []
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self._writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, record: dict) -> None:
+        row = {}
+        for name, kind in self.columns:
+            value = record.get(name)
+            if value is None:
+                row[name] = None
+            elif kind == "json":
+                row[name] = json.dumps(value, ensure_ascii=False)
+            elif kind == "list":
+                row[name] = [str(v) for v in value]
+            elif kind == "string":
+                row[name] = str(value)
+            else:
+                row[name] = value
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._rows:
+            self._writer.write_batch(self._pa.RecordBatch.from_pylist(self._rows, schema=self.schema))
+            self._rows = []
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+
+
+class PartWriter:
+    """一个范围 × 类型本次运行的输出：JSONL 与列式文件同时写入 .tmp，commit() 时原子改名"""
+
+    def __init__(self, directory: str, stem: str, memory_type: str, formats: list[str], batch_rows: int):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.paths = {fmt: os.path.join(directory, f"{stem}.{fmt}") for fmt in formats}
+        self.count = 0
+        self._closed = False
+        self._jsonl = None
+        self._columnar = []
+        for fmt, path in self.paths.items():
+            if fmt == "jsonl":
+                self._jsonl = open(f"{path}.tmp", 'w', encoding='utf-8')
+            else:
+                self._columnar.append(ColumnarWriter(f"{path}.tmp", memory_type, fmt, batch_rows))
+
+    def write(self, record: dict) -> None:
+        if self._jsonl is not None:
+            self._jsonl.write(json.dumps(record, ensure_ascii=False) + "\n")
+        for writer in self._columnar:
+            writer.write(record)
+        self.count += 1
+
+    def _close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._jsonl is not None:
+            self._jsonl.close()
+        for writer in self._columnar:
+            writer.close()
+
+    def commit(self) -> list[str]:
+        """关闭文件并改名；一条都没有写入时删除临时文件，返回最终文件路径"""
+        self._close()
+        if not self.count:
+            self.abort()
+            return []
+        for path in self.paths.values():
+            os.replace(f"{path}.tmp", path)
+        return list(self.paths.values())
+
+    def abort(self) -> None:
+        self._close()
+        for path in self.paths.values():
+            try:
+                os.remove(f"{path}.tmp")
+            except FileNotFoundError:
+                pass
+        try:
+            os.rmdir(self.directory)      # 只删除空目录
+        except OSError:
+            pass
+
+
+async def export_scope(
+    scope_key: str,
+    scope_value: str,
+    memory_type: str,
+    *,
+    out_dir: str,
+    run_id: str,
+    formats: list[str],
+    watermarks: WatermarkStore,
+    get: Any,
+    concurrency: int,
+    overlap_ms: int,
+    batch_rows: int,
+) -> int:
+    """导出一个范围 × 类型，返回写入条数"""
+    scope = f"{scope_key}={scope_value}"
+    filters = {scope_key: scope_value}
+    directory = os.path.join(out_dir, scope, memory_type)
+    incremental = memory_type in INCREMENTAL_TYPES
+
+    if incremental:
+        watermark, seen = watermarks.get(scope, memory_type)
+        start_ms = watermark - overlap_ms if watermark is not None else None
+        scanner = TimeShardedScanner(get, shards=concurrency, concurrency=concurrency)
+        items = scanner.scan(filters=filters, memory_type=memory_type, start_ms=start_ms)
+        writer = PartWriter(directory, f"part-{run_id}", memory_type, formats, batch_rows)
+    else:
+        watermark, seen = None, set()
+        items = aiter_memories(get, memory_type=memory_type, filters=filters, prefetch=2)
+        writer = PartWriter(directory, f"snapshot-{run_id}", memory_type, formats, batch_rows)
+
+    high = watermark
+    # 新重叠区间 [high - overlap, high] 内的 (timestamp, id) 小顶堆；分片扫描乱序到达，high 推进时弹出落到区间外的条目，
+    # 内存占用只与重叠区间内的条数有关
+    recent: list[tuple[int, str]] = []
+    try:
+        async for item in items:
+            record = item_to_dict(item)
+            ts = timestamp_ms(record) if incremental else None
+            if ts is not None:
+                record["timestamp_ms"] = ts
+                high = ts if high is None else max(high, ts)
+                if record.get("id") is not None and ts >= high - overlap_ms:
+                    heapq.heappush(recent, (ts, record["id"]))
+                while recent and recent[0][0] < high - overlap_ms:
+                    heapq.heappop(recent)
+            if incremental and record.get("id") in seen:
+                continue
+            writer.write(record)
+    except BaseException:
+        writer.abort()
+        raise
+    files = writer.commit()
+
+    if incremental:
+        # 下次从 high - overlap 开始重扫；本次扫描覆盖了上次的重叠区间，记下新重叠区间内的全部 id 即可
+        watermarks.advance(scope, memory_type, high, {i for _, i in recent})
+    for path in files:
+        print(f"  {path}")
+    return writer.count
+
+
+async def main() -> None:
+    if len(sys.argv) < 3:
+        print("用法: python export_memories_async.py <输出目录> <范围> [范围 ...]", file=sys.stderr)
+        print("  范围: user:<user_id> / group:<group_id>（不带前缀时视为 user_id）", file=sys.stderr)
+        print("示例: python export_memories_async.py exports user:u1 user:u2 group:book_1", file=sys.stderr)
+        print("\n环境变量配置（可选，已有默认值）:", file=sys.stderr)
+        print("  EVEROS_API_KEY: API密钥（必需）", file=sys.stderr)
+        print("  EVER_OS_BASE_URL: API地址（可选）", file=sys.stderr)
+        print(f"  EVEROS_EXPORT_TYPES: 导出的记忆类型，逗号分隔（默认: {','.join(MEMORY_TYPES)}）", file=sys.stderr)
+        print("  EVEROS_EXPORT_FORMATS: jsonl / parquet / arrow，逗号分隔（默认: jsonl；列式格式需要 pyarrow）", file=sys.stderr)
+        print("  EVEROS_EXPORT_OVERLAP_MS: 每次从水位线之前多少毫秒开始重扫（默认: 3600000）", file=sys.stderr)
+        print("  EVEROS_EXPORT_FULL: 1 表示忽略水位线全量导出（默认: 关闭）", file=sys.stderr)
+        print("  EVEROS_EXPORT_BATCH: 列式文件每个 record batch 的行数（默认: 1000）", file=sys.stderr)
+        print("  EVEROS_CONCURRENCY: 每个范围的时间分片数与并发请求数（默认: 8）", file=sys.stderr)
+        print("  EVEROS_MAX_ATTEMPTS: 超时 / 429 / 5xx 的最大尝试次数（默认: 5）", file=sys.stderr)
+        sys.exit(1)
+
+    out_dir = sys.argv[1]
+    scopes = [parse_scope(arg) for arg in sys.argv[2:]]
+    memory_types = [t.strip() for t in os.getenv("EVEROS_EXPORT_TYPES", ",".join(MEMORY_TYPES)).split(",") if t.strip()]
+    formats = [f.strip() for f in os.getenv("EVEROS_EXPORT_FORMATS", "jsonl").split(",") if f.strip()]
+    for name, values, allowed in (("EVEROS_EXPORT_TYPES", memory_types, MEMORY_TYPES), ("EVEROS_EXPORT_FORMATS", formats, FORMATS)):
+        unknown = [v for v in values if v not in allowed]
+        if unknown:
+            print(f"错误: {name} 不支持 {', '.join(unknown)}（可选: {', '.join(allowed)}）", file=sys.stderr)
+            sys.exit(1)
+    if any(fmt != "jsonl" for fmt in formats):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("错误: Parquet / Arrow 输出需要 pyarrow（pip install pyarrow），或设置 EVEROS_EXPORT_FORMATS=jsonl", file=sys.stderr)
+            sys.exit(1)
+    overlap_ms = int(os.getenv("EVEROS_EXPORT_OVERLAP_MS", "3600000"))
+    concurrency = int(os.getenv("EVEROS_CONCURRENCY", "8"))
+    batch_rows = int(os.getenv("EVEROS_EXPORT_BATCH", "1000"))
+    retry = RetryPolicy(max_attempts=int(os.getenv("EVEROS_MAX_ATTEMPTS", "5")))
+    get = functools.partial(retry.call, client.v1.memories.get)
+
+    os.makedirs(out_dir, exist_ok=True)
+    watermarks = WatermarkStore(os.path.join(out_dir, WATERMARK_FILE))
+    if os.getenv("EVEROS_EXPORT_FULL") == "1":
+        watermarks.state = {}
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+    print(f"输出目录: {out_dir}")
+    print(f"范围: {len(scopes)} 个, 类型: {', '.join(memory_types)}, 格式: {', '.join(formats)}")
+    print("-" * 50)
+
+    started = time.monotonic()
+    total = 0
+    failures = []
+    for scope_key, scope_value in scopes:
+        for memory_type in memory_types:
+            if scope_key == "group_id" and memory_type not in GROUP_TYPES:
+                continue
+            print(f"[{scope_key}={scope_value}] {memory_type}")
+            try:
+                count = await export_scope(
+                    scope_key, scope_value, memory_type,
+                    out_dir=out_dir, run_id=run_id, formats=formats, watermarks=watermarks, get=get,
+                    concurrency=concurrency, overlap_ms=overlap_ms, batch_rows=batch_rows,
+                )
+            except Exception as e:
+                # 该范围 × 类型的水位线不变，下次运行重新导出
+                failures.append((scope_key, scope_value, memory_type, describe_error(e)))
+                print(f"  ✗ {describe_error(e)}")
+                continue
+            total += count
+            print(f"  ✓ {count} 条")
+
+    elapsed = time.monotonic() - started
+    print("\n" + "=" * 50)
+    print(f"导出完成: {total} 条, 耗时 {elapsed:.1f} 秒")
+    if failures:
+        print(f"失败: {len(failures)} 个范围 × 类型（水位线未推进，重跑即可重试）")
+        for scope_key, scope_value, memory_type, error in failures:
+            print(f"  {scope_key}={scope_value} {memory_type}: {error}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
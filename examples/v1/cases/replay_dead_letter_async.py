@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# everos should've been installed (pip install everos -U)
+"""
+Replay a dead-letter file written by batch_add_async.py / batch_add_dir_async.py (v1)
+
+按原顺序逐条重发死信记录中的 messages（保留原 message_id / timestamp，可先手工修正内容后再重放）。
+成功的记录从文件中移除；仍失败的记录连同最新错误写回原文件（先写临时文件再原子替换），可反复重放。
+遇到 401 / 403 立即停止，未处理的记录原样保留。请在导入任务结束后再运行。
+"""
+
+import os
+import sys
+import json
+import asyncio
+
+from batch_add_async import DeadLetterQueue, add_memory_batch
+from everos_kit import RetryPolicy
+
+
+async def main() -> None:
+    if len(sys.argv) < 2:
+        print("用法: python replay_dead_letter_async.py <死信文件> [最大条数]", file=sys.stderr)
+        print("示例: python replay_dead_letter_async.py input.txt.deadletter.jsonl", file=sys.stderr)
+        print("\n环境变量配置（可选，已有默认值）:", file=sys.stderr)
+        print("  EVEROS_API_KEY: API密钥（必需）", file=sys.stderr)
+        print("  EVER_OS_BASE_URL: API地址（可选）", file=sys.stderr)
+        print("  EVEROS_MAX_ATTEMPTS: 超时 / 429 / 5xx 的最大尝试次数（默认: 5）", file=sys.stderr)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    max_records = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    retry = RetryPolicy(max_attempts=int(os.getenv("EVEROS_MAX_ATTEMPTS", "5")))
+
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"警告: 第 {line_no} 行不是合法 JSON，已跳过", file=sys.stderr)
+    except FileNotFoundError:
+        print(f"错误: 文件 '{path}' 不存在", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"死信文件: {path} ({len(records)} 条记录)")
+    print("-" * 50)
+
+    remaining = DeadLetterQueue(f"{path}.tmp")
+    replayed = 0
+    stopped = False
+    try:
+        for index, record in enumerate(records):
+            if stopped or (max_records is not None and index >= max_records):
+                remaining.write(record)
+                continue
+            batch = list(zip(record["ordinals"], record["messages"]))
+            response = await add_memory_batch(
+                batch,
+                group_id=record["group_id"],
+                group_name=record.get("group_name"),
+                retry=retry,
+                dead_letter=remaining,
+            )
+            if response is None:
+                # 401 / 403：凭证问题，保留本条及之后的记录
+                remaining.write(record)
+                stopped = True
+            elif "dead_letter" not in response:
+                replayed += len(batch)
+    finally:
+        remaining.close()
+
+    if remaining.count:
+        os.replace(remaining.path, path)
+    else:
+        os.remove(path)
+
+    print("\n" + "=" * 50)
+    if stopped:
+        print("❌ 凭证错误，已停止重放")
+    print(f"重放成功: {replayed} 个块")
+    if remaining.count:
+        print(f"仍在死信中: {remaining.count} 个块（已写回 {path}）")
+    else:
+        print(f"✓ 死信已清空，已删除 {path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,180 @@
+"""
+Streaming text chunker for batch_add_async.py
+
+按 。！？ 截断，累计达到 chunk_size 字符即输出一块；"第xxx章" 开始新块且与其后内容之间
+保留一个空格；单句超过 chunk_size 时单独成块；连续空白（含换行）压缩为一个空格。
+
+实现为单遍线性扫描：按块读取文件并增量解码，每个窗口只用一个预编译正则切分出
+"句子 + 分隔符（句末标点 / 章节标题）"，当前块用 list 缓冲并单独维护长度，避免反复
+拼接字符串。内存占用与文件大小无关，只与块大小和最长单句有关。
+"""
+
+import codecs
+import re
+from typing import Generator, Optional
+
+READ_BLOCK_SIZE = 1 << 20  # 每次从文件读取的字节数
+
+CHAPTER_CHARS = '一二三四五六七八九十百千万\\d'
+# 每次匹配一个 (句子, 分隔符)：句子为不含分隔符的最长片段，分隔符为句末标点、章节标题或窗口末尾
+SENTENCE_PATTERN = re.compile(
+    rf'([^。！？第]*(?:第(?![{CHAPTER_CHARS}]+章)[^。！？第]*)*)([。！？]|第[{CHAPTER_CHARS}]+章|\Z)'
+)
+
+
+def iter_chunks(
+    file_path: str,
+    chunk_size: int = 1000,
+    start_offset: int = 0,
+    block_size: int = READ_BLOCK_SIZE,
+) -> Generator[tuple[str, int, int], None, None]:
+    """
+    Stream (chunk, start, end) from a UTF-8 file
+
+    start / end 为块首个 / 末个非空白字符在文件中的字节范围 [start, end)。
+    从某个块的 start 偏移重新切块，得到的块序列与整文件切块时该块及其之后的部分一致。
+
+    Args:
+        file_path: File path
+        chunk_size: Minimum character count per chunk (default 1000)
+        start_offset: Byte offset to start reading from (must be on a UTF-8 character boundary)
+        block_size: Bytes read per block
+
+    Raises:
+        OSError / UnicodeDecodeError: 读取或解码失败
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buf: list[str] = []  # 当前块的片段，buf_len 为其总字符数
+    buf_len = 0
+    buf_start = 0        # 当前块起点（字节）
+    buf_end = -1         # 当前块终点（窗口内字符位置；-1 表示已换算为 pending_end 字节）
+    pending_end = 0
+    title_open = False
+
+    # 字节偏移只在块边界处换算：anchor_char 为窗口内最近一次换算的位置，anchor_byte 为其字节偏移
+    window = ''
+    anchor_char = 0
+    anchor_byte = start_offset
+
+    def to_byte(char_pos: int) -> int:
+        nonlocal anchor_char, anchor_byte
+        anchor_byte += len(window[anchor_char:char_pos].encode('utf-8'))
+        anchor_char = char_pos
+        return anchor_byte
+
+    def flush() -> tuple[str, int, int]:
+        end = to_byte(buf_end) if buf_end >= 0 else pending_end
+        return ''.join(buf).strip(), buf_start, end
+
+    with open(file_path, 'rb') as f:
+        f.seek(start_offset)
+        carry = ''
+        eof = False
+        while not eof:
+            block = f.read(block_size)
+            eof = not block
+            window = carry + decoder.decode(block, final=eof)
+            anchor_char = 0
+            sentences = SENTENCE_PATTERN.findall(window)
+            if len(sentences) > 1 and not sentences[-2][1]:
+                sentences.pop()  # 末尾 \Z 之后多出的空匹配
+            # 最后一句没有分隔符，可能被块边界截断，留到下一块
+            carry = '' if eof else sentences.pop()[0]
+            pos = 0
+
+            for raw, mark in sentences:
+                core = raw.strip()
+                if core:
+                    start = pos + len(raw) - len(raw.lstrip())
+                    end = start + len(core)
+                    # 不含 ' ' 以外的空白（isprintable）且无连续空格时无需压缩
+                    text = core if core.isprintable() and '  ' not in core else ' '.join(core.split())
+                pos += len(raw)
+                is_punct = len(mark) == 1
+                mark_end = pos + len(mark)
+
+                if title_open and (core or is_punct):
+                    # 标题后还有正文：标题与正文之间补一个空格
+                    buf.append(' ')
+                    buf_len += 1
+                    title_open = False
+
+                standalone = is_punct
+                if core:
+                    text_len = len(text)
+                    if text_len >= chunk_size:
+                        # 单句超长：先输出已累积内容，再单独成块；其后的标点按孤立标点处理
+                        if buf:
+                            yield flush()
+                            buf, buf_len = [], 0
+                        yield text, to_byte(start), to_byte(end)
+                    elif buf_len + text_len >= chunk_size:
+                        if is_punct:
+                            if not buf:
+                                buf_start = to_byte(start)
+                            buf.append(text)
+                            buf.append(mark)
+                            buf_end = mark_end
+                            yield flush()
+                            buf, buf_len = [], 0
+                            standalone = False
+                        else:
+                            if buf:
+                                yield flush()
+                            buf, buf_len = [text], text_len
+                            buf_start, buf_end = to_byte(start), end
+                    else:
+                        if not buf:
+                            buf_start = to_byte(start)
+                        buf.append(text)
+                        buf_len += text_len
+                        buf_end = end
+                        if is_punct:
+                            buf.append(mark)
+                            buf_len += 1
+                            buf_end = mark_end
+                            standalone = False
+
+                if standalone and buf:
+                    buf.append(mark)
+                    buf_len += 1
+                    buf_end = mark_end
+                    if buf_len >= chunk_size:
+                        yield flush()
+                        buf, buf_len = [], 0
+
+                if len(mark) > 1:
+                    # 章节标题：开始新块
+                    if buf:
+                        yield flush()
+                    buf, buf_len = [mark], len(mark)
+                    buf_start, buf_end = to_byte(pos), mark_end
+                    title_open = True
+
+                pos = mark_end
+
+            # 窗口结束：把未输出块的终点换算为字节，并把锚点移到 carry 的起点
+            if buf and buf_end >= 0:
+                pending_end = to_byte(buf_end)
+                buf_end = -1
+            to_byte(len(window) - len(carry))
+
+    if buf:
+        yield flush()
+
+
+def chunk_window(
+    file_path: str, chunk_size: int = 1000, start_offset: int = 0, max_chunks: int = 1024
+) -> tuple[list[tuple[str, int, int]], Optional[int]]:
+    """
+    Chunk at most max_chunks chunks from start_offset (ProcessPoolExecutor worker entry point, must stay picklable)
+
+    返回 (块列表, 下一块的起始字节偏移)；已到文件末尾时偏移为 None。从该偏移继续调用得到的块序列
+    与整文件切块一致，调用方按窗口逐段取回，内存占用与文件大小无关。
+    """
+    chunks: list[tuple[str, int, int]] = []
+    for chunk in iter_chunks(file_path, chunk_size, start_offset):
+        if len(chunks) >= max_chunks:
+            return chunks, chunk[1]
+        chunks.append(chunk)
+    return chunks, None
@@ -4,9 +4,14 @@
 #   - Group conversations → client.v1.memories.group.add()
 #   - response.result.memories → response.data.episodes
 import asyncio
+import os
+import sys
 import time
 from everos import AsyncEverOS
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from everos_kit import wait_until_searchable  # noqa: E402
+
 client = AsyncEverOS()
 group_mem = client.v1.memories.group
 
@@ -34,7 +39,7 @@ async def main() -> None:
 
     # ── Step 2: Wait for Indexing ─────────────────────────────────────────────
 
-    await group_mem.add(
+    switch_topic = await group_mem.add(
         group_id="demo_conversation_001",
         group_meta={"name": "Demo Conversation"},
         messages=[
@@ -48,8 +53,17 @@ async def main() -> None:
         ],
     )
 
+    # 不用固定 sleep：等 task 完成，再用 memories.get 探测到本次对话的 episode 即继续
     print("Waiting for memory extraction...")
-    await asyncio.sleep(5)
+    task_ids = [r.data.task_id for r in (response, switch_topic) if r.data and r.data.task_id]
+    ready = await wait_until_searchable(
+        client,
+        *task_ids,
+        filters={"group_id": "demo_conversation_001"},
+        messages=[{"timestamp": now_ms}, {"timestamp": now_ms + 5000}],
+        deadline=60,
+    )
+    print(f"Ready: {ready.ready} ({ready.reason}, {ready.elapsed:.1f}s, {ready.probes} probes)")
 
     # ── Step 3: Search Your Memory ────────────────────────────────────────────
 